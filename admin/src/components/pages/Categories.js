@@ -157,6 +157,7 @@ export default function Categories(props) {
 			// Send the update request
 			body.update('primary', 'skill/category', {
 				_id: key,
+				_updated: results.find(o => o._id === key)._updated,
 				record
 			}).then(data => {
 
@@ -164,6 +164,7 @@ export default function Experience(props) {
 			// Send the update request
 			body.update('primary', 'experience', {
 				_id: key,
+				_updated: results.find(o => o._id === key)._updated,
 				record
 			}).then(data => {
 
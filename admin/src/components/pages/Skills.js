@@ -171,6 +171,7 @@ export default function Skills(props) {
 			// Send the update request
 			body.update('primary', 'skill', {
 				_id: key,
+				_updated: results.find(o => o._id === key)._updated,
 				record
 			}).then(data => {
 
@@ -148,6 +148,7 @@ export default function Static(props) {
 			// Send the update request
 			body.update('primary', 'static', {
 				_id: key,
+				_updated: results.find(o => o._id === key)._updated,
 				record
 			}).then(data => {
 
@@ -0,0 +1,197 @@
+# coding=utf8
+""" Compression Benchmark
+
+Compares the bytes sent and the CPU cost of sending list responses as is,
+gzipped, brotli'd, and from the compressed response cache
+
+	python -m bench.compression [--rows 50] [--repeat 20]
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from argparse import ArgumentParser
+import gzip
+from hashlib import blake2b
+import json
+from random import Random
+from time import process_time
+from uuid import UUID
+
+# Pip imports
+try:
+	import brotli
+except ImportError:
+	brotli = None
+
+# Words used to generate text
+WORDS = (
+	'api architecture backend build cache client cloud code data database '
+	'deploy design developer django engineer frontend javascript lead '
+	'management mysql node performance platform python react redis rest '
+	'scale server service system team test the and of to with for in on '
+	'a an built led designed migrated improved reduced latency throughput'
+).split()
+
+def text(rand: Random, length: int) -> str:
+	"""Text
+
+	Generates a string of random words up to the given length
+
+	Arguments:
+		rand (Random): The random generator
+		length (int): The maximum length of the text
+
+	Returns:
+		str
+	"""
+	lWords = []
+	iLen = 0
+	while iLen < length:
+		s = rand.choice(WORDS)
+		lWords.append(s)
+		iLen += len(s) + 1
+	return ' '.join(lWords)[:length]
+
+def experiences(rand: Random, rows: int) -> str:
+	"""Experiences
+
+	Generates an experiences_read response body
+
+	Arguments:
+		rand (Random): The random generator
+		rows (int): The number of records
+
+	Returns:
+		str
+	"""
+	return json.dumps({ 'data': [ {
+		'_id': str(UUID(int = rand.getrandbits(128))),
+		'_created': 1706000000 + i,
+		'_updated': 1706000000 + i,
+		'company': text(rand, 32),
+		'url': 'example.com',
+		'location': 'Montreal, QC',
+		'title': text(rand, 40),
+		'from': '20%02d-01-01' % (i % 24),
+		'to': None,
+		'description': text(rand, 2000)
+	} for i in range(rows) ] })
+
+def statics(rand: Random, rows: int) -> str:
+	"""Statics
+
+	Generates a statics_read response body
+
+	Arguments:
+		rand (Random): The random generator
+		rows (int): The number of records
+
+	Returns:
+		str
+	"""
+	return json.dumps({ 'data': [ {
+		'_id': str(UUID(int = rand.getrandbits(128))),
+		'_created': 1706000000 + i,
+		'_updated': 1706000000 + i,
+		'key': 'page_%d' % i,
+		'content': ''.join([
+			'<p>%s</p>\n' % text(rand, 400) for _ in range(80)
+		])
+	} for i in range(rows) ] })
+
+def measure(name: str, body: bytes, function: callable, repeat: int) -> dict:
+	"""Measure
+
+	Runs the function on the body repeatedly and returns the size of the
+	result and the average CPU time
+
+	Arguments:
+		name (str): The name of the method
+		body (bytes): The uncompressed response
+		function (callable): Returns the bytes to send
+		repeat (int): The number of times to run it
+
+	Returns:
+		dict
+	"""
+	fStart = process_time()
+	for _ in range(repeat):
+		bOut = function(body)
+	fCPU = (process_time() - fStart) / repeat
+	return {
+		'method': name,
+		'bytes': len(bOut),
+		'ratio': round(len(bOut) / len(body), 3),
+		'cpu_ms': round(fCPU * 1000, 3)
+	}
+
+def main():
+	"""Main
+
+	Runs the benchmark and prints the results
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Response compression benchmark')
+	oArgs.add_argument('--rows', type = int, default = 50)
+	oArgs.add_argument('--repeat', type = int, default = 20)
+	oArgs.add_argument('--gzip-level', type = int, default = 6)
+	oArgs.add_argument('--brotli-quality', type = int, default = 5)
+	oArgs.add_argument('--json', action = 'store_true')
+	dArgs = oArgs.parse_args()
+
+	# The methods to compare
+	lMethods = [
+		('identity', lambda b: b),
+		('gzip', lambda b: gzip.compress(b, dArgs.gzip_level))
+	]
+	if brotli:
+		lMethods.append((
+			'br',
+			lambda b: brotli.compress(
+				b, mode = brotli.MODE_TEXT, quality = dArgs.brotli_quality
+			)
+		))
+
+	# The cached method, a hash of the body then a lookup
+	dCache = {}
+	def cached(b: bytes) -> bytes:
+		k = blake2b(b, digest_size = 16).digest()
+		if k not in dCache:
+			dCache[k] = gzip.compress(b, dArgs.gzip_level)
+		return dCache[k]
+	lMethods.append(('gzip (cached)', cached))
+
+	# Go through each payload
+	oRand = Random(0)
+	lResults = []
+	for sName, sBody in [
+		('experiences', experiences(oRand, dArgs.rows)),
+		('statics', statics(oRand, dArgs.rows))
+	]:
+		bBody = sBody.encode('utf-8')
+		for sMethod, fMethod in lMethods:
+			dRes = measure(sMethod, bBody, fMethod, dArgs.repeat)
+			dRes['payload'] = sName
+			lResults.append(dRes)
+
+	# Output the results
+	if dArgs.json:
+		print(json.dumps(lResults, indent = 4))
+	else:
+		print('%-12s %-14s %12s %7s %10s' % (
+			'payload', 'method', 'bytes', 'ratio', 'cpu ms'
+		))
+		for d in lResults:
+			print('%-12s %-14s %12d %7.3f %10.3f' % (
+				d['payload'], d['method'], d['bytes'], d['ratio'], d['cpu_ms']
+			))
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
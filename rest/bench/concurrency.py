@@ -0,0 +1,289 @@
+# coding=utf8
+""" Concurrency Benchmark
+
+Compares the throughput of concurrent requests against the synchronous
+server and the ASGI server, at 1, 4, and 16 workers. The service used sleeps
+for a fixed time in each request, standing in for a slow MySQL or Redis call
+
+	python -m bench.concurrency [--workers 1 4 16] [--latency 20]
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from body import Response
+
+# Python imports
+from argparse import ArgumentParser
+import asyncio
+from http.client import HTTPConnection
+import json
+import multiprocessing
+import os
+import signal
+import socket
+from threading import Thread
+from time import perf_counter, sleep
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+# Pip imports
+import uvicorn
+
+# Project imports
+from nodes.primary_async import Application
+from shared.asynchronous import Async
+
+class Standin(object):
+	"""Standin
+
+	Service with a single request method that takes a fixed time
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, latency: float):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			latency (float): The seconds each request takes
+
+		Returns:
+			Standin
+		"""
+		self._latency = latency
+
+	def items_read(self, req: any) -> Response:
+		"""Items (read)
+
+		Waits, then returns a small list of records
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		sleep(self._latency)
+		return Response([
+			{ '_id': i, 'name': 'item %d' % i } for i in range(10)
+		])
+
+class _Quiet(WSGIRequestHandler):
+	"""Quiet
+
+	Request handler that doesn't log every request
+
+	Extends:
+		WSGIRequestHandler
+	"""
+
+	def log_message(self, *args):
+		pass
+
+def _listen() -> socket.socket:
+	"""Listen
+
+	Returns a socket listening on a free local port
+
+	Returns:
+		socket.socket
+	"""
+	oSock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+	oSock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+	oSock.bind(( '127.0.0.1', 0 ))
+	oSock.listen(1024)
+	return oSock
+
+def _sync(sock: socket.socket, latency: float):
+	"""Sync
+
+	Runs a synchronous WSGI worker, one request at a time, on the socket
+
+	Arguments:
+		sock (socket.socket): The listening socket
+		latency (float): The seconds each request takes
+	"""
+	oService = Standin(latency)
+	def app(environ, start_response):
+		bBody = oService.items_read(None).to_json().encode('utf-8')
+		start_response('200 OK', [
+			( 'Content-Type', 'application/json; charset=utf-8' ),
+			( 'Content-Length', str(len(bBody)) )
+		])
+		return [ bBody ]
+	oServer = WSGIServer(
+		sock.getsockname(), _Quiet, bind_and_activate = False
+	)
+	oServer.socket.close()
+	oServer.socket = sock
+	oServer.server_name, oServer.server_port = sock.getsockname()
+	oServer.setup_environ()
+	oServer.set_app(app)
+	oServer.serve_forever()
+
+def _async(sock: socket.socket, latency: float):
+	"""Async
+
+	Runs an ASGI worker on the socket
+
+	Arguments:
+		sock (socket.socket): The listening socket
+		latency (float): The seconds each request takes
+	"""
+	oServer = uvicorn.Server(uvicorn.Config(
+		Application(Async(Standin(latency))),
+		lifespan = 'off',
+		log_level = 'warning'
+	))
+	asyncio.run(oServer.serve(sockets = [ sock ]))
+
+def load(port: int, concurrency: int, requests: int) -> dict:
+	"""Load
+
+	Sends the requests from the given number of concurrent clients and
+	returns the throughput and latency
+
+	Arguments:
+		port (int): The port of the server
+		concurrency (int): The number of concurrent clients
+		requests (int): The total number of requests
+
+	Returns:
+		dict
+	"""
+
+	lLatencies = []
+	lErrors = []
+
+	def client(count: int):
+		for _ in range(count):
+			fStart = perf_counter()
+			try:
+				oConn = HTTPConnection('127.0.0.1', port, timeout = 60)
+				oConn.request('GET', '/items')
+				oRes = oConn.getresponse()
+				oRes.read()
+				oConn.close()
+				if oRes.status != 200:
+					lErrors.append(oRes.status)
+			except OSError as e:
+				lErrors.append(str(e))
+			lLatencies.append(perf_counter() - fStart)
+
+	# Start the clients and wait for them to finish
+	lThreads = [
+		Thread(target = client, args = (
+			requests // concurrency + (i < requests % concurrency and 1 or 0),
+		)) for i in range(concurrency)
+	]
+	fStart = perf_counter()
+	for o in lThreads:
+		o.start()
+	for o in lThreads:
+		o.join()
+	fElapsed = perf_counter() - fStart
+
+	# Return the results
+	lLatencies.sort()
+	return {
+		'requests': len(lLatencies),
+		'errors': len(lErrors),
+		'rps': round(len(lLatencies) / fElapsed, 1),
+		'p50_ms': round(lLatencies[len(lLatencies) // 2] * 1000, 1),
+		'p99_ms': round(lLatencies[int(len(lLatencies) * 0.99)] * 1000, 1)
+	}
+
+def run(mode: str, workers: int, args: any) -> dict:
+	"""Run
+
+	Starts the workers of one mode, loads them, and stops them
+
+	Arguments:
+		mode (str): 'sync' or 'async'
+		workers (int): The number of worker processes
+		args (Namespace): The command line arguments
+
+	Returns:
+		dict
+	"""
+
+	# Start the workers sharing one socket
+	oSock = _listen()
+	oContext = multiprocessing.get_context('fork')
+	lProcs = [
+		oContext.Process(
+			target = mode == 'sync' and _sync or _async,
+			args = ( oSock, args.latency / 1000 ),
+			daemon = True
+		) for _ in range(workers)
+	]
+	for o in lProcs:
+		o.start()
+
+	# Give them time to start, then warm them up
+	sleep(0.5)
+	iPort = oSock.getsockname()[1]
+	load(iPort, workers, workers * 2)
+
+	# Run the benchmark
+	try:
+		dRet = load(iPort, args.concurrency, args.requests)
+
+	# Stop the workers
+	finally:
+		for o in lProcs:
+			os.kill(o.pid, signal.SIGTERM)
+			o.join(5)
+		oSock.close()
+
+	# Return the results
+	dRet['mode'] = mode
+	dRet['workers'] = workers
+	return dRet
+
+def main():
+	"""Main
+
+	Runs the benchmark and prints the results
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Sync vs ASGI concurrency benchmark')
+	oArgs.add_argument(
+		'--workers', type = int, nargs = '+', default = [ 1, 4, 16 ]
+	)
+	oArgs.add_argument('--concurrency', type = int, default = 64)
+	oArgs.add_argument('--requests', type = int, default = 2000)
+	oArgs.add_argument('--latency', type = float, default = 20)
+	oArgs.add_argument('--json', action = 'store_true')
+	dArgs = oArgs.parse_args()
+
+	# Run each mode at each number of workers
+	lResults = []
+	for iWorkers in dArgs.workers:
+		for sMode in [ 'sync', 'async' ]:
+			lResults.append(run(sMode, iWorkers, dArgs))
+
+	# Output the results
+	if dArgs.json:
+		print(json.dumps(lResults, indent = 4))
+	else:
+		print('%-6s %8s %9s %7s %9s %9s' % (
+			'mode', 'workers', 'req/s', 'errors', 'p50 ms', 'p99 ms'
+		))
+		for d in lResults:
+			print('%-6s %8d %9.1f %7d %9.1f %9.1f' % (
+				d['mode'], d['workers'], d['rps'], d['errors'],
+				d['p50_ms'], d['p99_ms']
+			))
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
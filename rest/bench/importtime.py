@@ -0,0 +1,191 @@
+# coding=utf8
+""" Import Time Benchmark
+
+Measures the time to import the modules every worker, restart, and install
+script starts with, using python's own -X importtime, and checks it against
+a budget. The total is mostly made up of the libraries, so the time spent in
+the project's own modules has a budget of its own, it's the part that grows
+when something expensive is done at import. Exits with 1 if either budget is
+exceeded
+
+	python -m bench.importtime [--modules services.primary] [--total 300]
+		[--project 10] [--repeat 5]
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from argparse import ArgumentParser
+import compileall
+import json
+from pathlib import Path
+import re
+import subprocess
+import sys
+
+# Constants
+ROOT = Path(__file__).parent.parent.resolve()
+
+# Regexes
+_reLine = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+def _packages() -> set:
+	"""Packages
+
+	Returns the names of the project's own packages
+
+	Returns:
+		set
+	"""
+	return set([
+		o.name for o in ROOT.iterdir() \
+		if o.is_dir() and (o / '__init__.py').exists()
+	])
+
+def measure(module: str) -> dict:
+	"""Measure
+
+	Imports the module in a new interpreter and returns the self and
+	cumulative time of every module imported, in microseconds
+
+	Arguments:
+		module (str): The name of the module to import
+
+	Returns:
+		dict
+	"""
+
+	# Import it in a process of its own so nothing is already imported
+	oProc = subprocess.run(
+		[ sys.executable, '-X', 'importtime', '-c', 'import %s' % module ],
+		cwd = ROOT,
+		capture_output = True,
+		text = True
+	)
+	if oProc.returncode:
+		raise RuntimeError('import %s failed:\n%s' % (module, oProc.stderr))
+
+	# Go through each line, keeping only the first time a module is seen
+	dRet = {}
+	for sLine in oProc.stderr.splitlines():
+		oMatch = _reLine.match(sLine)
+		if oMatch and oMatch.group(4) not in dRet:
+			dRet[oMatch.group(4)] = (
+				int(oMatch.group(1)), int(oMatch.group(2))
+			)
+	return dRet
+
+def run(module: str, repeat: int, top: int) -> dict:
+	"""Run
+
+	Measures the import of a module the given number of times, keeping the
+	best time of each module imported, as the slower ones are just noise
+
+	Arguments:
+		module (str): The name of the module to import
+		repeat (int): The number of times to measure it
+		top (int): The number of slowest modules to return
+
+	Returns:
+		dict
+	"""
+
+	# Measure each time, keeping the best
+	dBest = {}
+	for _ in range(repeat):
+		for sName, tTimes in measure(module).items():
+			if sName not in dBest:
+				dBest[sName] = tTimes
+			else:
+				dBest[sName] = (
+					min(dBest[sName][0], tTimes[0]),
+					min(dBest[sName][1], tTimes[1])
+				)
+
+	# Add up the time spent in the project's own modules
+	oPackages = _packages()
+	lProject = [
+		( s, t[0] ) for s, t in dBest.items() \
+		if s.split('.')[0] in oPackages
+	]
+
+	# Return the totals and the slowest modules
+	return {
+		'module': module,
+		'total_ms': round(dBest[module][1] / 1000, 2),
+		'project_ms': round(sum([ t[1] for t in lProject ]) / 1000, 2),
+		'slowest': [
+			{ 'module': s, 'self_ms': round(t[0] / 1000, 2) } \
+			for s, t in sorted(
+				dBest.items(), key = lambda t: t[1][0], reverse = True
+			)[:top]
+		],
+		'slowest_project': [
+			{ 'module': s, 'self_ms': round(i / 1000, 2) } \
+			for s, i in sorted(
+				lProject, key = lambda t: t[1], reverse = True
+			)[:top]
+		]
+	}
+
+def main():
+	"""Main
+
+	Runs the benchmark, prints the results, and exits with 1 if any budget
+	was exceeded
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Import time benchmark')
+	oArgs.add_argument('--modules', nargs = '+',
+		default = [ 'services.primary', 'install.records' ])
+	oArgs.add_argument('--total', type = float, default = 300.0,
+		help = 'the budget of each module, in ms')
+	oArgs.add_argument('--project', type = float, default = 10.0,
+		help = 'the budget of the project\'s own modules, in ms')
+	oArgs.add_argument('--repeat', type = int, default = 5)
+	oArgs.add_argument('--top', type = int, default = 10)
+	oArgs.add_argument('--json', action = 'store_true')
+	dArgs = oArgs.parse_args()
+
+	# Make sure the bytecode is up to date, as it would be after the first
+	#	start, so that compiling isn't measured
+	compileall.compile_dir(ROOT, quiet = 1)
+
+	# Run each module, and check it against the budgets
+	lResults = []
+	for sModule in dArgs.modules:
+		dRes = run(sModule, dArgs.repeat, dArgs.top)
+		dRes['over'] = [ s for s, f in [
+			( 'total', dArgs.total ), ( 'project', dArgs.project )
+		] if dRes['%s_ms' % s] > f ]
+		lResults.append(dRes)
+
+	# Output the results
+	if dArgs.json:
+		print(json.dumps(lResults, indent = 4))
+	else:
+		for d in lResults:
+			print('%s: %.2fms total (budget %.2fms), %.2fms project ' \
+				'(budget %.2fms) %s' % (
+					d['module'], d['total_ms'], dArgs.total, d['project_ms'],
+					dArgs.project, d['over'] and 'OVER BUDGET' or ''
+			))
+			for sKey in [ 'slowest', 'slowest_project' ]:
+				print('\t%s' % sKey.replace('_', ' '))
+				for dMod in d[sKey]:
+					print('\t\t%-40s %8.2fms' % (
+						dMod['module'], dMod['self_ms']
+					))
+
+	# Exit with an error if anything is over budget
+	if any([ d['over'] for d in lResults ]):
+		sys.exit(1)
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
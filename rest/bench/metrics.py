@@ -0,0 +1,153 @@
+# coding=utf8
+""" Metrics Benchmark
+
+Measures the time the metrics add to each request, by calling a stand-in
+service with and without them, and the time it takes to render them
+
+	python -m bench.metrics [--requests 200000] [--lookups 3]
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from argparse import ArgumentParser
+import json
+from time import perf_counter
+
+# Project imports
+from shared import metrics
+
+class Response(object):
+	"""Response
+
+	Stand-in for the body Response, only what the metrics look at
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, data: any = None, error: dict = None):
+		self.data = data
+		self.error = error
+
+class Standin(object):
+	"""Standin
+
+	Service whose requests do nothing but count the lookups a cached read
+	would make
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, lookups: int):
+		self._lookups = lookups
+		self._labels = (
+			( 'tier', 'standin' ), ( 'level', 'local' ), ( 'result', 'hit' )
+		)
+
+	def item_read(self, req: dict) -> Response:
+		"""Item read
+
+		Counts the lookups when the metrics are on, and returns a record
+		"""
+		if req['count']:
+			for _ in range(self._lookups):
+				metrics.count('cache_lookups_total', self._labels)
+		return Response({ '_id': req['_id'] })
+
+	def items_read(self, req: dict) -> Response:
+		"""Items read
+
+		Returns an error, so both outcomes are measured
+		"""
+		return Response(error = { 'code': 1104, 'msg': 'not found' })
+
+def measure(name: str, method: callable, req: dict, requests: int) -> dict:
+	"""Measure
+
+	Calls the method the given number of times and returns the time each
+	call took on average
+
+	Arguments:
+		name (str): The name of the run
+		method (callable): The method to call
+		req (dict): The request to pass it
+		requests (int): The number of calls
+
+	Returns:
+		dict
+	"""
+	fStart = perf_counter()
+	for _ in range(requests):
+		method(req)
+	fTotal = perf_counter() - fStart
+	return {
+		'name': name,
+		'requests': requests,
+		'ns_per_request': fTotal / requests * 1e9
+	}
+
+def main():
+	"""Main
+
+	Runs the benchmark and prints the results
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Metrics overhead benchmark')
+	oArgs.add_argument('--requests', type = int, default = 200000)
+	oArgs.add_argument('--lookups', type = int, default = 3)
+	oArgs.add_argument('--json', action = 'store_true')
+	dArgs = oArgs.parse_args()
+
+	# Measure the service as is, then instrumented
+	oService = Standin(dArgs.lookups)
+	lResults = [
+		measure('bare', oService.item_read,
+			{ '_id': 'x', 'count': False }, dArgs.requests),
+		measure('bare error', oService.items_read,
+			{ '_id': 'x', 'count': False }, dArgs.requests)
+	]
+	metrics.instrument(oService)
+	lResults.extend([
+		measure('instrumented', oService.item_read,
+			{ '_id': 'x', 'count': True }, dArgs.requests),
+		measure('instrumented error', oService.items_read,
+			{ '_id': 'x', 'count': False }, dArgs.requests)
+	])
+
+	# Measure rendering everything collected
+	fStart = perf_counter()
+	sText = metrics.render()
+	dRender = {
+		'bytes': len(sText),
+		'ms': (perf_counter() - fStart) * 1000
+	}
+
+	# Output the results
+	if dArgs.json:
+		print(json.dumps({
+			'requests': lResults, 'render': dRender
+		}, indent = 4))
+	else:
+		print('%-20s %12s %14s' % ('run', 'requests', 'ns / request'))
+		for d in lResults:
+			print('%-20s %12d %14.0f' % (
+				d['name'], d['requests'], d['ns_per_request']
+			))
+		print('overhead, %d lookups: %.0f ns / request' % (
+			dArgs.lookups,
+			lResults[2]['ns_per_request'] - lResults[0]['ns_per_request']
+		))
+		print('render: %d bytes in %.3f ms' % (
+			dRender['bytes'], dRender['ms']
+		))
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
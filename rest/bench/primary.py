@@ -0,0 +1,662 @@
+# coding=utf8
+""" Primary Benchmark
+
+Measures the throughput and latency of every Primary method against the
+local stand-ins for MySQL and Redis, at data sets of increasing size, so that
+any change can be proven on one machine without a network. Each size runs in
+its own process, so nothing cached by one affects the next
+
+	python -m bench.primary run [--sizes 100 1000 10000 100000] \
+		[--requests 100] [--seconds 2] [--save baseline.json]
+	python -m bench.primary compare baseline.json current.json \
+		[--threshold 10]
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from jobject import jobject
+
+# Python imports
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from itertools import count
+import json
+import multiprocessing
+import os
+import platform
+from random import Random
+import sys
+from time import perf_counter, time
+import traceback
+from uuid import UUID
+
+# Project imports
+from bench.compression import text
+from shared import compiler
+
+# Constants
+BULK = 10
+LOCATIONS = [ 'Montreal, QC', 'Toronto, ON', 'Remote', 'New York, NY' ]
+
+def _child(size: int, args: dict, conn: any) -> None:
+	"""Child
+
+	Runs a size in the new process and sends the results back, then stops
+	the compile pool and leaves without waiting on anything else that was
+	started
+
+	Arguments:
+		size (int): The number of records of each type
+		args (dict): The arguments of the run
+		conn (Connection): The pipe to send the results through
+	"""
+	iCode = 1
+	try:
+		conn.send(size_run(size, args))
+		iCode = 0
+	except Exception:
+		traceback.print_exc()
+	finally:
+		conn.close()
+		try:
+			compiler.shutdown()
+		except Exception:
+			traceback.print_exc()
+		sys.stdout.flush()
+		sys.stderr.flush()
+		os._exit(iCode)
+
+def _uuid(rand: Random) -> str:
+	"""UUID
+
+	Generates a random UUID from the random generator, so that data sets are
+	the same on every run
+
+	Arguments:
+		rand (Random): The random generator
+
+	Returns:
+		str
+	"""
+	return str(UUID(int = rand.getrandbits(128), version = 4))
+
+def category(rand: Random, i: int) -> dict:
+	"""Category
+
+	Generates the fields of a skill category
+
+	Arguments:
+		rand (Random): The random generator
+		i (int): The position of the record
+
+	Returns:
+		dict
+	"""
+	return { '_order': i % 256, 'name': '%s %d' % (text(rand, 16), i) }
+
+def experience(rand: Random, i: int) -> dict:
+	"""Experience
+
+	Generates the fields of an experience
+
+	Arguments:
+		rand (Random): The random generator
+		i (int): The position of the record
+
+	Returns:
+		dict
+	"""
+	iYear = 2000 + i % 24
+	return {
+		'company': text(rand, 32),
+		'url': 'example.com',
+		'location': rand.choice(LOCATIONS),
+		'title': text(rand, 40),
+		'from': '%d-%02d-01' % (iYear, rand.randint(1, 12)),
+		'to': '%d-%02d-01' % (iYear + 1, rand.randint(1, 12)),
+		'description': text(rand, 400)
+	}
+
+def key(i: int) -> str:
+	"""Key
+
+	Generates a unique static key from a number, as the keys are limited to
+	lowercase letters
+
+	Arguments:
+		i (int): The number
+
+	Returns:
+		str
+	"""
+	lLetters = []
+	while True:
+		i, r = divmod(i, 26)
+		lLetters.append(chr(97 + r))
+		if not i:
+			break
+	return 'pg_' + ''.join(reversed(lLetters))
+
+def skill(rand: Random, i: int, categories: list) -> dict:
+	"""Skill
+
+	Generates the fields of a skill
+
+	Arguments:
+		rand (Random): The random generator
+		i (int): The position of the record
+		categories (str[]): The IDs of the categories
+
+	Returns:
+		dict
+	"""
+	return {
+		'_order': i % 256,
+		'category': rand.choice(categories),
+		'name': '%s %d' % (text(rand, 16), i),
+		'level': rand.randint(1, 5),
+		'years': rand.randint(0, 20)
+	}
+
+def static(rand: Random, i: int) -> dict:
+	"""Static
+
+	Generates the fields of a static page
+
+	Arguments:
+		rand (Random): The random generator
+		i (int): The position of the record
+
+	Returns:
+		dict
+	"""
+	return {
+		'key': key(i),
+		'content': '<h1>%s</h1>\n<p>%s</p>\n<p>%s</p>' % (
+			text(rand, 40), text(rand, 600), text(rand, 600)
+		)
+	}
+
+def seed(rand: Random, size: int, records: dict) -> dict:
+	"""Seed
+
+	Fills every Storage with generated records, returns their IDs by
+	records module name
+
+	Arguments:
+		rand (Random): The random generator
+		size (int): The number of records of each type, the categories are
+			limited to 1 for every 20, up to 256
+		records (dict): The records modules by name
+
+	Returns:
+		dict
+	"""
+
+	iNow = int(time())
+	def complete(fields: dict) -> dict:
+		return { '_id': _uuid(rand), '_created': iNow, '_updated': iNow,
+			**fields }
+
+	# Generate the records, the skills need the categories
+	lCategories = [
+		complete(category(rand, i)) for i in range(max(1, min(256, size // 20)))
+	]
+	lCategoryIDs = [ d['_id'] for d in lCategories ]
+	dData = {
+		'experience': [ complete(experience(rand, i)) for i in range(size) ],
+		'skill': [
+			complete(skill(rand, i, lCategoryIDs)) for i in range(size)
+		],
+		'skill_category': lCategories,
+		'static': [ complete(static(rand, i)) for i in range(size) ]
+	}
+
+	# Store them, and let the caches know
+	for sName, lRecords in dData.items():
+		records[sName].Cache.storage.seed(lRecords)
+		records[sName].Cache.flush()
+
+	# Return the IDs
+	return { k: [ d['_id'] for d in l ] for k, l in dData.items() }
+
+def scenarios(rand: Random, size: int, records: dict, ids: dict) -> list:
+	"""Scenarios
+
+	Returns every request to measure, as the name of the scenario, the name
+	of the Primary method, the function generating the data of each call,
+	and an optional setup function called with the number of calls
+
+	Arguments:
+		rand (Random): The random generator
+		size (int): The number of records seeded
+		records (dict): The records modules by name
+		ids (dict): The IDs of the seeded records by module name
+
+	Returns:
+		list
+	"""
+
+	# The functions generating new records, names and static keys must be
+	#	unique so they continue on from the seeded ones
+	lCategories = ids['skill_category']
+	oNext = count(size)
+	dMake = {
+		'experience': lambda i: experience(rand, next(oNext)),
+		'skill': lambda i: skill(rand, next(oNext), lCategories),
+		'skill_category': lambda i: category(rand, next(oNext)),
+		'static': lambda i: static(rand, next(oNext))
+	}
+
+	# The field changed by updates
+	dUpdate = {
+		'experience': lambda: { 'title': text(rand, 40) },
+		'skill': lambda: { 'years': rand.randint(0, 20) },
+		'skill_category': lambda: {
+			'name': '%s %d' % (text(rand, 16), next(oNext))
+		},
+		'static': lambda: { 'content': '<p>%s</p>' % text(rand, 600) }
+	}
+
+	# Records added only to be deleted, by scenario
+	dDoomed = {}
+	def doomed(scenario: str, name: str, total: int) -> None:
+		oStorage = records[name].Cache.storage
+		lIDs = [ oStorage.add(dMake[name](i)) for i in range(total) ]
+		records[name].Cache.changed(lIDs)
+		dDoomed[scenario] = lIDs
+
+	# Init the list with the stats and the reads that aren't by record
+	lRet = [
+		( 'cache_stats_read', 'cache_stats_read', lambda i: {}, None ),
+		( 'pool_stats_read', 'pool_stats_read', lambda i: {}, None ),
+		( 'skills_grouped_read', 'skills_grouped_read', lambda i: {}, None ),
+		( 'static_read (key)', 'static_read',
+			lambda i: { 'key': key(rand.randrange(size)) }, None ),
+		( 'experiences_read (filter)', 'experiences_read', lambda i: {
+			'filter': { 'location': rand.choice(LOCATIONS) }, 'limit': 20
+		}, None )
+	]
+
+	# Add the requests of each records module
+	for sName, sPlural in [
+		( 'experience', 'experiences' ),
+		( 'skill', 'skills' ),
+		( 'skill_category', 'skill_categories' ),
+		( 'static', 'statics' )
+	]:
+		lIDs = ids[sName]
+
+		# Reads
+		lRet.extend([
+			( '%s_read' % sName, '%s_read' % sName,
+				lambda i, l = lIDs: { '_id': rand.choice(l) }, None ),
+			( '%s_read' % sPlural, '%s_read' % sPlural,
+				lambda i: {}, None ),
+			( '%s_read (page)' % sPlural, '%s_read' % sPlural,
+				lambda i: { 'limit': 20 }, None )
+		])
+
+		# Single writes
+		sDelete = '%s_delete' % sName
+		lRet.extend([
+			( '%s_create' % sName, '%s_create' % sName,
+				lambda i, n = sName: { 'record': dMake[n](i) }, None ),
+			( '%s_update' % sName, '%s_update' % sName,
+				lambda i, n = sName, l = lIDs: {
+					'_id': rand.choice(l), 'record': dUpdate[n]()
+				}, None ),
+			( sDelete, sDelete,
+				lambda i, s = sDelete: { '_id': dDoomed[s][i] },
+				lambda c, s = sDelete, n = sName: doomed(s, n, c) )
+		])
+
+		# Bulk writes
+		sDelete = '%s_delete' % sPlural
+		lRet.extend([
+			( '%s_create' % sPlural, '%s_create' % sPlural,
+				lambda i, n = sName: { 'records': [
+					dMake[n](i * BULK + j) for j in range(BULK)
+				] }, None ),
+			( '%s_update' % sPlural, '%s_update' % sPlural,
+				lambda i, n = sName, l = lIDs: { 'records': [
+					{ '_id': s, **dUpdate[n]() } \
+					for s in rand.sample(l, min(BULK, len(l)))
+				] }, None ),
+			( sDelete, sDelete,
+				lambda i, s = sDelete: {
+					'_ids': dDoomed[s][i * BULK:(i + 1) * BULK]
+				},
+				lambda c, s = sDelete, n = sName: doomed(s, n, c * BULK) )
+		])
+
+	# Add the reorders
+	for sName, sMethod in [
+		( 'skill', 'skills_reorder_update' ),
+		( 'skill_category', 'skill_categories_reorder_update' )
+	]:
+		lRet.append(( sMethod, sMethod,
+			lambda i, l = ids[sName]: {
+				'_ids': rand.sample(l, min(256, len(l)))
+			}, None ))
+
+	# Return the scenarios
+	return lRet
+
+def measure(
+	primary: any,
+	method: str,
+	make: callable,
+	requests: int,
+	seconds: float
+) -> dict:
+	"""Measure
+
+	Calls the method until the number of requests or the time is reached,
+	and returns the throughput and latency. The first call is measured on its
+	own as it's usually the one filling the caches
+
+	Arguments:
+		primary (Primary): The service instance
+		method (str): The name of the method
+		make (callable): Generates the data of each call
+		requests (int): The maximum number of calls
+		seconds (float): The maximum time to spend
+
+	Returns:
+		dict
+	"""
+
+	fMethod = getattr(primary, method)
+	lTimes = []
+	dErrors = {}
+	fEnd = perf_counter() + seconds
+	for i in range(requests):
+
+		# Generate the request
+		oReq = jobject({
+			'data': jobject(make(i)),
+			'session': None,
+			'environment': {}
+		})
+
+		# Call the method
+		fStart = perf_counter()
+		oRes = fMethod(oReq)
+		fTook = perf_counter() - fStart
+		lTimes.append(fTook)
+
+		# Note any errors
+		mError = getattr(oRes, 'error', None)
+		if mError:
+			sCode = str(isinstance(mError, dict) and mError.get('code') or mError)
+			dErrors[sCode] = dErrors.get(sCode, 0) + 1
+
+		# If we're out of time
+		if perf_counter() > fEnd:
+			break
+
+	# Calculate the stats without the first call
+	lSorted = sorted(lTimes[1:] or lTimes)
+	def percentile(p: float) -> float:
+		return lSorted[min(len(lSorted) - 1, int(len(lSorted) * p))] * 1000
+
+	return {
+		'requests': len(lTimes),
+		'rps': len(lSorted) / (sum(lSorted) or 1e-9),
+		'first_ms': lTimes[0] * 1000,
+		'mean_ms': sum(lSorted) / len(lSorted) * 1000,
+		'p50_ms': percentile(0.5),
+		'p95_ms': percentile(0.95),
+		'p99_ms': percentile(0.99),
+		'errors': dErrors
+	}
+
+def size_run(size: int, args: dict) -> dict:
+	"""Size Run
+
+	Seeds the stand-ins, measures every scenario, and returns the results.
+	Must be run in a process of its own, as it replaces the Storage and Redis
+	used by the records
+
+	Arguments:
+		size (int): The number of records of each type
+		args (dict): The arguments of the run
+
+	Returns:
+		dict
+	"""
+
+	# Install the stand-ins, then load everything that uses them
+	from bench import standins
+	standins.install(args['database'])
+	import records.experience
+	import records.skill
+	import records.skill_category
+	import records.static
+	from services.primary import Primary
+
+	# Seed the records
+	oRand = Random(args['seed'])
+	dRecords = {
+		'experience': records.experience,
+		'skill': records.skill,
+		'skill_category': records.skill_category,
+		'static': records.static
+	}
+	fStart = perf_counter()
+	dIDs = seed(oRand, size, dRecords)
+	fSeed = perf_counter() - fStart
+
+	# Create the service
+	oPrimary = Primary()
+
+	# Run each scenario
+	lResults = []
+	for sName, sMethod, fMake, fSetup in \
+		scenarios(oRand, size, dRecords, dIDs):
+		if args['only'] and not any([ s in sName for s in args['only'] ]):
+			continue
+		if fSetup:
+			fSetup(args['requests'])
+		dRes = measure(
+			oPrimary, sMethod, fMake, args['requests'], args['seconds']
+		)
+		dRes.update({ 'size': size, 'scenario': sName, 'method': sMethod })
+		lResults.append(dRes)
+		if not args['json']:
+			print('%8d %-36s %7d %10.1f %9.3f %9.3f %9.3f %s' % (
+				size, sName, dRes['requests'], dRes['rps'], dRes['p50_ms'],
+				dRes['p99_ms'], dRes['first_ms'],
+				dRes['errors'] and json.dumps(dRes['errors']) or ''
+			), file = sys.stderr)
+
+	# Return the results
+	return { 'seed_s': fSeed, 'results': lResults }
+
+def run(args: any) -> dict:
+	"""Run
+
+	Runs the benchmark at each size and returns the baseline
+
+	Arguments:
+		args (Namespace): The parsed arguments
+
+	Returns:
+		dict
+	"""
+
+	dArgs = {
+		'database': args.database,
+		'json': args.json,
+		'only': args.only,
+		'requests': args.requests,
+		'seconds': args.seconds,
+		'seed': args.seed
+	}
+
+	# Print the header
+	if not args.json:
+		print('%8s %-36s %7s %10s %9s %9s %9s %s' % (
+			'size', 'scenario', 'calls', 'req/s', 'p50 ms', 'p99 ms',
+			'first ms', 'errors'
+		), file = sys.stderr)
+
+	# Run each size in a new process
+	oContext = multiprocessing.get_context('fork')
+	lResults = []
+	dSeed = {}
+	for iSize in args.sizes:
+		oParent, oChild = oContext.Pipe(False)
+		oProcess = oContext.Process(
+			target = _child, args = ( iSize, dArgs, oChild )
+		)
+		oProcess.start()
+		oChild.close()
+		try:
+			dRes = oParent.recv()
+		except EOFError:
+			print('size %d failed' % iSize, file = sys.stderr)
+			continue
+		finally:
+			oProcess.join()
+		dSeed[str(iSize)] = dRes['seed_s']
+		lResults.extend(dRes['results'])
+
+	# Return the baseline
+	return {
+		'created': datetime.now(timezone.utc).isoformat(),
+		'machine': {
+			'platform': platform.platform(),
+			'processor': platform.processor() or platform.machine(),
+			'python': platform.python_version()
+		},
+		'requests': args.requests,
+		'seconds': args.seconds,
+		'seed': args.seed,
+		'seed_s': dSeed,
+		'results': lResults
+	}
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+	"""Compare
+
+	Returns the scenarios whose median latency grew, or whose throughput
+	fell, by more than the threshold percent, along with those that now
+	return errors
+
+	Arguments:
+		baseline (dict): The baseline results
+		current (dict): The current results
+		threshold (float): The percent allowed before it's a regression
+
+	Returns:
+		dict[]
+	"""
+
+	# Index the baseline
+	dBase = {
+		( d['size'], d['scenario'] ): d for d in baseline['results']
+	}
+
+	# Go through each current result
+	lRet = []
+	for d in current['results']:
+		dOld = dBase.get(( d['size'], d['scenario'] ))
+		if not dOld:
+			continue
+
+		# Calculate the changes
+		fP50 = dOld['p50_ms'] and \
+			(d['p50_ms'] - dOld['p50_ms']) / dOld['p50_ms'] * 100 or 0.0
+		fRPS = dOld['rps'] and \
+			(d['rps'] - dOld['rps']) / dOld['rps'] * 100 or 0.0
+
+		# Store the comparison
+		lRet.append({
+			'size': d['size'],
+			'scenario': d['scenario'],
+			'p50_ms': [ dOld['p50_ms'], d['p50_ms'] ],
+			'p50_change': fP50,
+			'rps': [ dOld['rps'], d['rps'] ],
+			'rps_change': fRPS,
+			'regression': fP50 > threshold or fRPS < -threshold or \
+				bool(d['errors'] and not dOld['errors'])
+		})
+
+	# Return the comparisons
+	return lRet
+
+def main():
+	"""Main
+
+	Runs or compares benchmarks, compare exits with 1 if anything regressed
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Primary service benchmark')
+	oSub = oArgs.add_subparsers(dest = 'command', required = True)
+	oRun = oSub.add_parser('run', help = 'run the benchmark')
+	oRun.add_argument(
+		'--sizes', type = int, nargs = '+', default = [ 100, 1000, 10000 ]
+	)
+	oRun.add_argument('--requests', type = int, default = 100)
+	oRun.add_argument('--seconds', type = float, default = 2.0)
+	oRun.add_argument('--seed', type = int, default = 0)
+	oRun.add_argument('--database', default = ':memory:',
+		help = 'the SQLite file, in memory by default')
+	oRun.add_argument('--only', nargs = '+', default = None,
+		help = 'only run scenarios containing one of these')
+	oRun.add_argument('--save', default = None,
+		help = 'the file to store the results in as a baseline')
+	oRun.add_argument('--json', action = 'store_true')
+	oCompare = oSub.add_parser('compare', help = 'compare two baselines')
+	oCompare.add_argument('baseline')
+	oCompare.add_argument('current')
+	oCompare.add_argument('--threshold', type = float, default = 10.0)
+	oCompare.add_argument('--json', action = 'store_true')
+	dArgs = oArgs.parse_args()
+
+	# If we're running
+	if dArgs.command == 'run':
+		dBaseline = run(dArgs)
+		if dArgs.save:
+			with open(dArgs.save, 'w') as oF:
+				json.dump(dBaseline, oF, indent = 4)
+		if dArgs.json:
+			print(json.dumps(dBaseline, indent = 4))
+		return
+
+	# Else, we're comparing
+	with open(dArgs.baseline) as oF:
+		dBaseline = json.load(oF)
+	with open(dArgs.current) as oF:
+		dCurrent = json.load(oF)
+	lCompared = compare(dBaseline, dCurrent, dArgs.threshold)
+
+	# Output the results
+	if dArgs.json:
+		print(json.dumps(lCompared, indent = 4))
+	else:
+		print('%8s %-36s %19s %8s %21s %8s' % (
+			'size', 'scenario', 'p50 ms', 'change', 'req/s', 'change'
+		))
+		for d in lCompared:
+			print('%8d %-36s %9.3f %9.3f %+7.1f%% %10.1f %10.1f %+7.1f%% %s' % (
+				d['size'], d['scenario'], d['p50_ms'][0], d['p50_ms'][1],
+				d['p50_change'], d['rps'][0], d['rps'][1], d['rps_change'],
+				d['regression'] and 'REGRESSION' or ''
+			))
+
+	# Exit with an error if anything regressed
+	if any([ d['regression'] for d in lCompared ]):
+		sys.exit(1)
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
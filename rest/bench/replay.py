@@ -0,0 +1,643 @@
+# coding=utf8
+""" Replay
+
+Load generator replaying the requests the www and admin apps make against a
+running Primary REST server. Arrivals are open loop, scheduled at the target
+rate whether or not earlier requests have finished, and latency is measured
+from the moment each request was scheduled, so a stalled server shows up in
+the percentiles instead of quietly slowing the generator down
+
+	python -m bench.replay [--url http://localhost:9010] [--rps 200] \
+		[--seconds 30] [--connections 64] \
+		[--mix experiences=30 skills_grouped=30 static=30 ...]
+
+The admin scenarios are bursts, a record is created, updated, and deleted,
+with the list re-read after each change just as the admin pages do
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+
+# Python imports
+from argparse import ArgumentParser
+import gzip
+from http.client import HTTPConnection, HTTPSConnection
+import json
+from queue import Queue
+from random import Random
+from threading import Lock, Thread
+from time import perf_counter, sleep, time
+from urllib.parse import quote, urlsplit
+
+# Project imports
+from bench.compression import text
+from bench.primary import category, experience, skill, static
+
+# Constants
+PERCENTILES = [ 50, 90, 99, 99.9 ]
+
+# The records the admin bursts work on, by scenario, as the noun of a single
+#	record, the noun of the list, and the fields changed by an update
+ADMIN = {
+	'admin_experience': ( 'experience', 'experiences',
+		lambda rand, i: { 'title': text(rand, 40) } ),
+	'admin_skill': ( 'skill', 'skills',
+		lambda rand, i: { 'years': rand.randint(0, 20) } ),
+	'admin_skill_category': ( 'skill/category', 'skill/categories',
+		lambda rand, i: { 'name': '%s %d' % (text(rand, 16), i) } ),
+	'admin_static': ( 'static', 'statics',
+		lambda rand, i: { 'content': '<p>%s</p>' % text(rand, 600) } )
+}
+
+# The default mix, the relative weight of each scenario
+MIX = {
+	'experiences': 30,
+	'skills_grouped': 30,
+	'static': 30,
+	'admin_list': 6,
+	'admin_experience': 1,
+	'admin_skill': 1,
+	'admin_skill_category': 1,
+	'admin_static': 1
+}
+
+def _error(status: int, data: any) -> str | None:
+	"""Error
+
+	Returns the error of a response, if there is one, as the HTTP status or
+	the body error code
+
+	Arguments:
+		status (int): The HTTP status
+		data (any): The decoded body
+
+	Returns:
+		str | None
+	"""
+
+	# If the request itself failed
+	if status not in [ 200, 304 ]:
+		return 'http_%d' % status
+
+	# If the service returned an error
+	if isinstance(data, dict):
+		if data.get('error'):
+			mError = data['error']
+			return str(isinstance(mError, dict) and mError.get('code') or mError)
+
+		# Lists return a response for each noun
+		if isinstance(data.get('data'), dict):
+			for m in data['data'].values():
+				if isinstance(m, dict) and m.get('error'):
+					return _error(200, m)
+
+	# No error
+	return None
+
+def _percentile(values: list, p: float) -> float:
+	"""Percentile
+
+	Returns the percentile of a sorted list of seconds, in milliseconds
+
+	Arguments:
+		values (float[]): The sorted seconds
+		p (float): The percentile, 0 to 100
+
+	Returns:
+		float
+	"""
+	if not values:
+		return 0.0
+	return values[min(len(values) - 1, int(len(values) * p / 100))] * 1000
+
+def _url() -> str:
+	"""URL
+
+	Returns the URL of the Primary service from the config, the same way the
+	REST servers are registered
+
+	Returns:
+		str
+	"""
+	dDefault = config.body.rest.default({
+		'domain': 'localhost',
+		'port': 9000,
+		'protocol': 'http'
+	})
+	dPrimary = config.body.rest.services.primary({ 'port': 0 })
+	return '%s://%s:%d' % (
+		dDefault['protocol'],
+		dDefault['domain'],
+		dDefault['port'] + dPrimary['port']
+	)
+
+class Client(object):
+	"""Client
+
+	A single keep-alive connection to the server, sending requests the way
+	the body javascript library does
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, url: str, timeout: float):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			url (str): The base URL of the service
+			timeout (float): The seconds to wait on a response
+
+		Returns:
+			Client
+		"""
+		oURL = urlsplit(url)
+		self._class = oURL.scheme == 'https' and \
+			HTTPSConnection or HTTPConnection
+		self._netloc = oURL.netloc
+		self._prefix = oURL.path.rstrip('/')
+		self._timeout = timeout
+		self._conn = None
+
+	def request(self, method: str, noun: str, data: any) -> tuple:
+		"""Request
+
+		Sends a request and returns the HTTP status and the decoded body.
+		Reads send the data in the query string, everything else in the body
+
+		Arguments:
+			method (str): The HTTP method
+			noun (str): The noun of the request
+			data (any): The data to send
+
+		Returns:
+			tuple
+		"""
+
+		# Build the request
+		sPath = '%s/%s' % (self._prefix, noun)
+		dHeaders = { 'Accept-Encoding': 'gzip' }
+		bBody = None
+		if method == 'GET':
+			if data is not None:
+				sPath += '?d=%s' % quote(json.dumps(data))
+		else:
+			bBody = json.dumps(data).encode('utf-8')
+			dHeaders['Content-Type'] = 'application/json; charset=utf-8'
+
+		# Send it, reconnecting if the server closed the connection
+		if self._conn is None:
+			self._conn = self._class(self._netloc, timeout = self._timeout)
+		try:
+			self._conn.request(method, sPath, bBody, dHeaders)
+			oRes = self._conn.getresponse()
+			bData = oRes.read()
+		except Exception:
+			self._conn.close()
+			self._conn = None
+			raise
+
+		# Decode the body
+		if oRes.getheader('Content-Encoding') == 'gzip':
+			bData = gzip.decompress(bData)
+		try:
+			mData = bData and json.loads(bData) or None
+		except ValueError:
+			mData = None
+
+		# Return the status and the data
+		return oRes.status, mData
+
+class Replay(object):
+	"""Replay
+
+	Schedules the scenarios at the target rate, runs them on a fixed number
+	of connections, and keeps the latency of every request by endpoint
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		url: str,
+		mix: dict,
+		connections: int,
+		timeout: float,
+		seed: int
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			url (str): The base URL of the service
+			mix (dict): The weight of each scenario
+			connections (int): The number of connections, and so the most
+				requests in progress at once
+			timeout (float): The seconds to wait on a response
+			seed (int): The seed of the random generator
+
+		Returns:
+			Replay
+		"""
+
+		# Store the arguments
+		self._url = url
+		self._connections = connections
+		self._timeout = timeout
+		self._rand = Random(seed)
+
+		# The scenarios and their cumulative weights
+		self._mix = dict(mix)
+		self._weigh()
+
+		# Data fetched from the server the requests need
+		self._keys = []
+		self._categories = []
+
+		# The number used to keep created names and keys unique, started
+		#	from the time so runs don't collide with records left behind
+		self._next = int(time()) % 100000 * 1000
+		self._lock = Lock()
+
+		# The results by endpoint, and the arrivals waiting on a connection
+		self._results = {}
+		self._queue = Queue()
+		self._backlog = 0
+
+	def _make(self, name: str) -> dict:
+		"""Make
+
+		Generates a new record for an admin burst
+
+		Arguments:
+			name (str): The name of the scenario
+
+		Returns:
+			dict
+		"""
+		i = self._number()
+		if name == 'admin_experience':
+			return experience(self._rand, i)
+		elif name == 'admin_skill':
+			return skill(self._rand, i, self._categories)
+		elif name == 'admin_skill_category':
+			return category(self._rand, i)
+		else:
+			return static(self._rand, i)
+
+	def _number(self) -> int:
+		"""Number
+
+		Returns the next unique number
+
+		Returns:
+			int
+		"""
+		with self._lock:
+			self._next += 1
+			return self._next
+
+	def _record(self, endpoint: str, took: float, error: str | None):
+		"""Record
+
+		Stores the result of a request
+
+		Arguments:
+			endpoint (str): The HTTP method and noun
+			took (float): The seconds from when the request was scheduled
+			error (str): The error, if there was one
+		"""
+		with self._lock:
+			try:
+				dRes = self._results[endpoint]
+			except KeyError:
+				dRes = self._results[endpoint] = { 'times': [], 'errors': {} }
+			dRes['times'].append(took)
+			if error:
+				dRes['errors'][error] = dRes['errors'].get(error, 0) + 1
+
+	def _scenario(self, client: Client, name: str, due: float):
+		"""Scenario
+
+		Runs one arrival of a scenario. The first request is measured from
+		when it was due, any that follow it in a burst from when they were
+		sent, as those wait on the one before them just as the admin does
+
+		Arguments:
+			client (Client): The connection to use
+			name (str): The name of the scenario
+			due (float): The time the arrival was scheduled for
+		"""
+
+		# The www requests
+		if name == 'experiences':
+			self._send(client, due, 'GET', 'experiences')
+		elif name == 'skills_grouped':
+			self._send(client, due, 'GET', 'skills/grouped')
+		elif name == 'static':
+			self._send(client, due, 'GET', 'static', {
+				'key': self._rand.choice(self._keys)
+			})
+
+		# The admin skills page
+		elif name == 'admin_list':
+			self._send(client, due, 'GET', '__list', [
+				'skills', 'skill/categories'
+			])
+
+		# An admin burst
+		else:
+			sNoun, sList, fUpdate = ADMIN[name]
+
+			# Create the record, then re-read the list
+			sID = self._send(client, due, 'POST', sNoun, {
+				'record': self._make(name)
+			})
+			self._send(client, perf_counter(), 'GET', sList)
+			if not sID:
+				return
+
+			# Update it, then re-read the list
+			self._send(client, perf_counter(), 'PUT', sNoun, {
+				'_id': sID, 'record': fUpdate(self._rand, self._number())
+			})
+			self._send(client, perf_counter(), 'GET', sList)
+
+			# Delete it, then re-read the list
+			self._send(client, perf_counter(), 'DELETE', sNoun, {
+				'_id': sID
+			})
+			self._send(client, perf_counter(), 'GET', sList)
+
+	def _send(self,
+		client: Client,
+		start: float,
+		method: str,
+		noun: str,
+		data: any = None
+	) -> any:
+		"""Send
+
+		Sends one request, records it from the given start, and returns the
+		data of the response, or None if it failed
+
+		Arguments:
+			client (Client): The connection to use
+			start (float): The time the request was due
+			method (str): The HTTP method
+			noun (str): The noun of the request
+			data (any): Optional, the data to send
+
+		Returns:
+			any
+		"""
+		sEndpoint = '%s /%s' % (method, noun)
+		try:
+			iStatus, mData = client.request(method, noun, data)
+			sError = _error(iStatus, mData)
+		except Exception as e:
+			mData = None
+			sError = e.__class__.__name__
+		self._record(sEndpoint, perf_counter() - start, sError)
+		return not sError and isinstance(mData, dict) and \
+			mData.get('data') or None
+
+	def _weigh(self):
+		"""Weigh
+
+		Builds the list of scenarios with a weight, and their cumulative
+		weights, from the mix
+		"""
+		self._scenarios = [ k for k, v in self._mix.items() if v > 0 ]
+		self._weights = []
+		iTotal = 0
+		for k in self._scenarios:
+			iTotal += self._mix[k]
+			self._weights.append(iTotal)
+
+	def _worker(self):
+		"""Worker
+
+		Runs on its own thread with its own connection, taking arrivals off
+		the queue until it gets None
+		"""
+		oClient = Client(self._url, self._timeout)
+		while True:
+			tArrival = self._queue.get()
+			if tArrival is None:
+				return
+			with self._lock:
+				self._backlog -= 1
+			self._scenario(oClient, tArrival[1], tArrival[0])
+
+	def prepare(self) -> list:
+		"""Prepare
+
+		Fetches the static keys and skill categories the requests need, and
+		removes any scenario that can't run without them. Returns the names
+		of the scenarios removed
+
+		Returns:
+			str[]
+		"""
+
+		lRemoved = []
+		oClient = Client(self._url, self._timeout)
+
+		# Get the static keys
+		lStatics = self._send(oClient, perf_counter(), 'GET', 'statics')
+		self._keys = [ d['key'] for d in (lStatics or []) if 'key' in d ]
+		if not self._keys and 'static' in self._scenarios:
+			lRemoved.append('static')
+
+		# Get the categories
+		lCategories = self._send(
+			oClient, perf_counter(), 'GET', 'skill/categories'
+		)
+		self._categories = [ d['_id'] for d in (lCategories or []) ]
+		if not self._categories and 'admin_skill' in self._scenarios:
+			lRemoved.append('admin_skill')
+
+		# Remove the scenarios and return them
+		for sName in lRemoved:
+			self._mix[sName] = 0
+		self._weigh()
+		return lRemoved
+
+	def run(self, rps: float, seconds: float, poisson: bool = True) -> dict:
+		"""Run
+
+		Schedules arrivals at the given rate for the given time, waits for
+		them all to finish, and returns the results
+
+		Arguments:
+			rps (float): The target requests (arrivals) per second
+			seconds (float): How long to schedule arrivals for
+			poisson (bool): Exponential gaps between arrivals if True, else
+				a fixed gap
+
+		Returns:
+			dict
+		"""
+
+		# Forget any earlier results, and start the connections
+		self._results = {}
+		lThreads = [
+			Thread(target = self._worker, daemon = True) \
+			for _ in range(self._connections)
+		]
+		for o in lThreads:
+			o.start()
+
+		# Schedule the arrivals, each due at a fixed point in time no matter
+		#	how the server is keeping up
+		fStart = perf_counter()
+		fEnd = fStart + seconds
+		fDue = fStart
+		iArrivals = 0
+		iMaxBacklog = 0
+		iLate = 0
+		while True:
+			fDue += poisson and self._rand.expovariate(rps) or 1.0 / rps
+			if fDue >= fEnd:
+				break
+			fWait = fDue - perf_counter()
+			if fWait > 0:
+				sleep(fWait)
+			elif fWait < -0.01:
+				iLate += 1
+
+			# Pick the scenario and queue it
+			iPick = self._rand.randrange(self._weights[-1])
+			for i, iWeight in enumerate(self._weights):
+				if iPick < iWeight:
+					break
+			with self._lock:
+				self._backlog += 1
+				iMaxBacklog = max(iMaxBacklog, self._backlog)
+			self._queue.put(( fDue, self._scenarios[i] ))
+			iArrivals += 1
+
+		# Stop the connections once the queue is done
+		for _ in lThreads:
+			self._queue.put(None)
+		for o in lThreads:
+			o.join()
+		fElapsed = perf_counter() - fStart
+
+		# Calculate the results by endpoint
+		dEndpoints = {}
+		iRequests = 0
+		for sEndpoint, dRes in sorted(self._results.items()):
+			lTimes = sorted(dRes['times'])
+			iErrors = sum(dRes['errors'].values())
+			iRequests += len(lTimes)
+			dEndpoints[sEndpoint] = {
+				'requests': len(lTimes),
+				'errors': dRes['errors'],
+				'error_rate': round(iErrors * 100.0 / len(lTimes), 2),
+				'mean_ms': round(sum(lTimes) / len(lTimes) * 1000, 3),
+				'max_ms': round(lTimes[-1] * 1000, 3),
+				**{ 'p%s_ms' % str(p).replace('.', '_'): \
+					round(_percentile(lTimes, p), 3) for p in PERCENTILES }
+			}
+
+		# Return the totals and the endpoints
+		return {
+			'target_rps': rps,
+			'arrivals': iArrivals,
+			'arrival_rps': round(iArrivals / seconds, 1),
+			'requests': iRequests,
+			'request_rps': round(iRequests / fElapsed, 1),
+			'seconds': round(fElapsed, 3),
+			'late_arrivals': iLate,
+			'max_backlog': iMaxBacklog,
+			'endpoints': dEndpoints
+		}
+
+def main():
+	"""Main
+
+	Parses the arguments, replays the traffic, and prints the results
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Replay www and admin traffic')
+	oArgs.add_argument('--url', default = None,
+		help = 'the URL of the service, defaults to the one in the config')
+	oArgs.add_argument('--rps', type = float, default = 200.0,
+		help = 'the arrivals per second, admin bursts are several requests')
+	oArgs.add_argument('--seconds', type = float, default = 30.0)
+	oArgs.add_argument('--warmup', type = float, default = 2.0,
+		help = 'seconds run first at the same rate and not reported')
+	oArgs.add_argument('--connections', type = int, default = 64)
+	oArgs.add_argument('--timeout', type = float, default = 30.0)
+	oArgs.add_argument('--uniform', action = 'store_true',
+		help = 'evenly spaced arrivals instead of random ones')
+	oArgs.add_argument('--mix', nargs = '+', default = [],
+		metavar = 'SCENARIO=WEIGHT', help = 'change the weight of scenarios, '
+		'one of %s' % ', '.join(MIX))
+	oArgs.add_argument('--seed', type = int, default = 0)
+	oArgs.add_argument('--json', action = 'store_true')
+	dArgs = oArgs.parse_args()
+
+	# Build the mix
+	dMix = dict(MIX)
+	for s in dArgs.mix:
+		sName, _, sWeight = s.partition('=')
+		if sName not in MIX or not sWeight.isdigit():
+			oArgs.error('invalid mix "%s"' % s)
+		dMix[sName] = int(sWeight)
+	if not any(dMix.values()):
+		oArgs.error('every scenario has a weight of 0')
+
+	# Create the replay and get what it needs from the server
+	sURL = dArgs.url or _url()
+	oReplay = Replay(
+		sURL, dMix, dArgs.connections, dArgs.timeout, dArgs.seed
+	)
+	lRemoved = oReplay.prepare()
+	if lRemoved:
+		print('skipping %s, nothing on the server to use' % \
+			', '.join(lRemoved))
+
+	# Warm up, then run
+	if dArgs.warmup > 0:
+		oReplay.run(dArgs.rps, dArgs.warmup, not dArgs.uniform)
+	dRes = oReplay.run(dArgs.rps, dArgs.seconds, not dArgs.uniform)
+	dRes['url'] = sURL
+	dRes['mix'] = dMix
+
+	# Output the results
+	if dArgs.json:
+		print(json.dumps(dRes, indent = 4))
+		return
+
+	print('%s, %.1f arrivals/s target, %.1f arrivals/s, %.1f requests/s, '
+		'max backlog %d, %d late' % (
+			sURL, dRes['target_rps'], dRes['arrival_rps'],
+			dRes['request_rps'], dRes['max_backlog'], dRes['late_arrivals']
+	))
+	print('%-26s %8s %7s %9s %9s %9s %9s %9s %s' % (
+		'endpoint', 'requests', 'errors', 'p50 ms', 'p90 ms', 'p99 ms',
+		'p99.9 ms', 'max ms', 'codes'
+	))
+	for sEndpoint, d in dRes['endpoints'].items():
+		print('%-26s %8d %6.2f%% %9.2f %9.2f %9.2f %9.2f %9.2f %s' % (
+			sEndpoint, d['requests'], d['error_rate'], d['p50_ms'],
+			d['p90_ms'], d['p99_ms'], d['p99_9_ms'], d['max_ms'],
+			d['errors'] and json.dumps(d['errors']) or ''
+		))
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
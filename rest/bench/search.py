@@ -0,0 +1,224 @@
+# coding=utf8
+""" Search Benchmark
+
+Measures the time to build the search index, to keep it up to date, and to
+answer queries of different kinds, at increasing numbers of documents
+
+	python -m bench.search [--sizes 10000 100000] [--queries 500]
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from argparse import ArgumentParser
+import json
+from random import Random
+from time import perf_counter
+
+# Project imports
+from shared.search import Index, Source
+
+# Constants
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+VOCABULARY = 20000
+
+def _words(rand: Random) -> list:
+	"""Words
+
+	Generates the vocabulary, made up words of 3 to 10 letters, so that
+	prefixes match realistic numbers of words. The words are returned in
+	random order, which is also the order of how often they're used
+
+	Arguments:
+		rand (Random): The random generator
+
+	Returns:
+		str[]
+	"""
+	oWords = set()
+	while len(oWords) < VOCABULARY:
+		oWords.add(''.join([
+			rand.choice(LETTERS) for _ in range(rand.randint(3, 10))
+		]))
+	lWords = sorted(oWords)
+	rand.shuffle(lWords)
+	return lWords
+
+def documents(rand: Random, size: int, words: list) -> list:
+	"""Documents
+
+	Generates the documents, a third of each type. Words are picked with a
+	Zipf like distribution, so a few are in most documents and most are in
+	very few, as in real text
+
+	Arguments:
+		rand (Random): The random generator
+		size (int): The number of documents
+		words (str[]): The vocabulary, most used first
+
+	Returns:
+		list of tuple (str, dict)
+	"""
+
+	# Weight each word by the inverse of its rank
+	lWeights = [ 1.0 / (i + 1) for i in range(len(words)) ]
+	def text(count: int) -> str:
+		return ' '.join(rand.choices(words, lWeights, k = count))
+
+	# Generate the documents
+	lRet = []
+	for i in range(size):
+		sID = '%032x' % rand.getrandbits(128)
+		if i % 3 == 0:
+			lRet.append(( 'experience', {
+				'_id': sID, 'title': text(5), 'description': text(60)
+			} ))
+		elif i % 3 == 1:
+			lRet.append(( 'skill', { '_id': sID, 'name': text(2) } ))
+		else:
+			lRet.append(( 'static', {
+				'_id': sID, 'key': 'k%d' % i,
+				'content': '<h1>%s</h1><p>%s</p>' % (text(6), text(120))
+			} ))
+	return lRet
+
+def measure(index: Index, queries: list) -> dict:
+	"""Measure
+
+	Runs each query and returns the latency percentiles in microseconds,
+	along with the average number of matches
+
+	Arguments:
+		index (Index): The index to search
+		queries (str[]): The queries
+
+	Returns:
+		dict
+	"""
+	lTimes = []
+	iMatches = 0
+	for sQuery in queries:
+		fStart = perf_counter()
+		dRes = index.search(sQuery, 10)
+		lTimes.append(perf_counter() - fStart)
+		iMatches += dRes['total']
+	lTimes.sort()
+	def percentile(p: float) -> float:
+		return lTimes[min(len(lTimes) - 1, int(len(lTimes) * p))] * 1e6
+	return {
+		'p50_us': round(percentile(0.5), 1),
+		'p99_us': round(percentile(0.99), 1),
+		'matches': round(iMatches / len(queries), 1)
+	}
+
+def run(size: int, queries: int, seed: int) -> dict:
+	"""Run
+
+	Builds an index of the given size and measures it
+
+	Arguments:
+		size (int): The number of documents
+		queries (int): The number of queries of each kind
+		seed (int): The seed of the random generator
+
+	Returns:
+		dict
+	"""
+
+	# Generate the documents
+	oRand = Random(seed)
+	lWords = _words(oRand)
+	lDocs = documents(oRand, size, lWords)
+
+	# Build the index
+	oIndex = Index([
+		Source('experience', None, { 'title': 2, 'description': 1 }, 'title'),
+		Source('skill', None, { 'name': 1 }, 'name'),
+		Source('static', None, { 'content': 1 }, 'key', [ 'content' ])
+	])
+	fStart = perf_counter()
+	for sType, dDoc in lDocs:
+		oIndex.upsert(sType, dDoc)
+	fBuild = perf_counter() - fStart
+
+	# Pick the words by how many documents they're in
+	lRare = [ oRand.choice(lWords[-5000:]) for _ in range(queries) ]
+	lCommon = [ oRand.choice(lWords[:50]) for _ in range(queries) ]
+	def pick() -> str:
+		return oRand.choice(lWords)
+
+	# Measure each kind of query
+	dQueries = {
+		'exact': measure(oIndex, [ pick() for _ in range(queries) ]),
+		'rare': measure(oIndex, lRare),
+		'common': measure(oIndex, lCommon),
+		'prefix_2': measure(oIndex, [ pick()[:2] for _ in range(queries) ]),
+		'prefix_3': measure(oIndex, [ pick()[:3] for _ in range(queries) ]),
+		'two_words': measure(oIndex, [
+			'%s %s' % (pick(), pick()[:3]) for _ in range(queries)
+		])
+	}
+
+	# Measure updating single documents
+	fStart = perf_counter()
+	for sType, dDoc in lDocs[:queries]:
+		oIndex.upsert(sType, { **dDoc, '_id': dDoc['_id'] })
+	fUpsert = (perf_counter() - fStart) / queries
+	fStart = perf_counter()
+	for sType, dDoc in lDocs[:queries]:
+		oIndex.remove(sType, dDoc['_id'])
+	fRemove = (perf_counter() - fStart) / queries
+
+	# Return the results
+	return {
+		'size': size,
+		'build_s': round(fBuild, 3),
+		'upsert_us': round(fUpsert * 1e6, 1),
+		'remove_us': round(fRemove * 1e6, 1),
+		**oIndex.stats(),
+		'queries': dQueries
+	}
+
+def main():
+	"""Main
+
+	Runs the benchmark and prints the results
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Search index benchmark')
+	oArgs.add_argument(
+		'--sizes', type = int, nargs = '+', default = [ 10000, 100000 ]
+	)
+	oArgs.add_argument('--queries', type = int, default = 500)
+	oArgs.add_argument('--seed', type = int, default = 0)
+	oArgs.add_argument('--json', action = 'store_true')
+	dArgs = oArgs.parse_args()
+
+	# Run each size
+	lResults = [ run(i, dArgs.queries, dArgs.seed) for i in dArgs.sizes ]
+
+	# Output the results
+	if dArgs.json:
+		print(json.dumps(lResults, indent = 4))
+		return
+	for d in lResults:
+		print('%d documents, %d tokens, built in %.3fs, upsert %.1fus, '
+			'remove %.1fus' % (
+				d['size'], d['tokens'], d['build_s'], d['upsert_us'],
+				d['remove_us']
+		))
+		print('\t%-10s %10s %10s %10s' % ('query', 'p50 us', 'p99 us',
+			'matches'))
+		for sName, dQuery in d['queries'].items():
+			print('\t%-10s %10.1f %10.1f %10.1f' % (
+				sName, dQuery['p50_us'], dQuery['p99_us'], dQuery['matches']
+			))
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
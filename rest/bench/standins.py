@@ -0,0 +1,765 @@
+# coding=utf8
+""" Stand-ins
+
+Local replacements for MySQL and Redis so the Primary service can be
+benchmarked on a single machine without a network. Storage keeps its records
+in SQLite, and Redis is a dictionary in the process. Both have to be
+installed before the records modules are imported
+
+	from bench import standins
+	standins.install()
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from define import Tree
+from record.exceptions import RecordDuplicate
+import record_mysql
+import undefined
+
+# Python imports
+import json
+from queue import Queue
+import sqlite3
+from threading import Lock, RLock
+from time import monotonic, time
+from uuid import uuid4
+
+# Project imports
+from shared import batch, channel
+
+# Module variables
+_database = None
+_lock = RLock()
+
+class Redis(object):
+	"""Redis
+
+	The subset of the redis client used by the records, kept in the process.
+	Values are stored as bytes, just as redis returns them
+
+	Extends:
+		object
+	"""
+
+	def __init__(self):
+		"""Constructor
+
+		Creates a new instance
+
+		Returns:
+			Redis
+		"""
+		self._data = {}
+		self._expires = {}
+		self._lock = Lock()
+		self._subscribers = {}
+
+	def _bytes(self, value: any) -> bytes:
+		"""Bytes
+
+		Returns the value as redis would store it
+
+		Arguments:
+			value (any): The value
+
+		Returns:
+			bytes
+		"""
+		if isinstance(value, bytes):
+			return value
+		return str(value).encode('utf-8')
+
+	def _live(self, key: str) -> bool:
+		"""Live
+
+		Returns True if the key exists and hasn't expired. The lock must
+		already be held
+
+		Arguments:
+			key (str): The key
+
+		Returns:
+			bool
+		"""
+		if key in self._expires and self._expires[key] <= monotonic():
+			self._data.pop(key, None)
+			del self._expires[key]
+		return key in self._data
+
+	def delete(self, *keys: str) -> int:
+		"""Delete
+
+		Removes the keys, returns the number removed
+		"""
+		with self._lock:
+			iRet = 0
+			for k in keys:
+				if self._live(k):
+					del self._data[k]
+					self._expires.pop(k, None)
+					iRet += 1
+			return iRet
+
+	def eval(self, script: str, numkeys: int, *args: str) -> int:
+		"""Eval
+
+		Only the compare and delete script used to release locks is
+		supported
+		"""
+		with self._lock:
+			if self._live(args[0]) and \
+				self._data[args[0]] == self._bytes(args[1]):
+				del self._data[args[0]]
+				self._expires.pop(args[0], None)
+				return 1
+			return 0
+
+	def exists(self, *keys: str) -> int:
+		"""Exists
+
+		Returns the number of the keys that exist
+		"""
+		with self._lock:
+			return sum([ self._live(k) and 1 or 0 for k in keys ])
+
+	def get(self, key: str) -> bytes | None:
+		"""Get
+
+		Returns the value of the key
+		"""
+		with self._lock:
+			return self._live(key) and self._data[key] or None
+
+	def hgetall(self, key: str) -> dict:
+		"""Hash Get All
+
+		Returns every field of the hash
+		"""
+		with self._lock:
+			return self._live(key) and dict(self._data[key]) or {}
+
+	def hset(self, key: str, mapping: dict) -> int:
+		"""Hash Set
+
+		Sets the fields of the hash
+		"""
+		with self._lock:
+			if not self._live(key):
+				self._data[key] = {}
+			for k, v in mapping.items():
+				self._data[key][self._bytes(k)] = self._bytes(v)
+			return len(mapping)
+
+	def incr(self, key: str) -> int:
+		"""Increment
+
+		Adds one to the key and returns the new value
+		"""
+		with self._lock:
+			iValue = int(self._live(key) and self._data[key] or 0) + 1
+			self._data[key] = self._bytes(iValue)
+			return iValue
+
+	def pipeline(self) -> 'Pipeline':
+		"""Pipeline
+
+		Returns a pipeline that runs the commands once executed
+		"""
+		return Pipeline(self)
+
+	def publish(self, channel: str, message: str) -> int:
+		"""Publish
+
+		Sends the message to every subscriber of the channel
+		"""
+		with self._lock:
+			lQueues = list(self._subscribers.get(channel, []))
+		for oQueue in lQueues:
+			oQueue.put({
+				'type': 'message',
+				'channel': channel.encode('utf-8'),
+				'data': self._bytes(message)
+			})
+		return len(lQueues)
+
+	def pubsub(self, ignore_subscribe_messages: bool = False) -> 'PubSub':
+		"""PubSub
+
+		Returns a new subscriber
+		"""
+		return PubSub(self)
+
+	def set(self,
+		key: str,
+		value: any,
+		nx: bool = False,
+		px: int = None,
+		ex: int = None
+	) -> bool | None:
+		"""Set
+
+		Sets the value of the key
+		"""
+		with self._lock:
+			if nx and self._live(key):
+				return None
+			self._data[key] = self._bytes(value)
+			self._expires.pop(key, None)
+			if px or ex:
+				self._expires[key] = monotonic() + (px and px / 1000 or ex)
+			return True
+
+	def subscribe(self, channel: str, queue: Queue) -> None:
+		"""Subscribe
+
+		Adds a queue to the subscribers of a channel
+		"""
+		with self._lock:
+			self._subscribers.setdefault(channel, []).append(queue)
+
+class Pipeline(object):
+	"""Pipeline
+
+	Queues commands and runs them one after the other on execute
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, redis: Redis):
+		self._redis = redis
+		self._commands = []
+
+	def __getattr__(self, name: str) -> callable:
+		fCommand = getattr(self._redis, name)
+		def queue(*args, **kwargs):
+			self._commands.append(( fCommand, args, kwargs ))
+			return self
+		return queue
+
+	def execute(self) -> list:
+		"""Execute
+
+		Runs the queued commands and returns their results
+		"""
+		lRet = [ f(*a, **k) for f, a, k in self._commands ]
+		self._commands = []
+		return lRet
+
+class PubSub(object):
+	"""PubSub
+
+	Subscriber receiving messages published on the channels it subscribes to
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, redis: Redis):
+		self._redis = redis
+		self._queue = Queue()
+
+	def listen(self):
+		"""Listen
+
+		Yields each message as it arrives
+		"""
+		while True:
+			yield self._queue.get()
+
+	def subscribe(self, *channels: str) -> None:
+		"""Subscribe
+
+		Starts receiving messages from the channels
+		"""
+		for s in channels:
+			self._redis.subscribe(s, self._queue)
+
+class Cache(object):
+	"""Cache
+
+	The per record cache in front of a Storage, kept in the redis stand-in
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, name: str):
+		self._name = name
+
+	def delete(self, _id: str) -> None:
+		"""Delete
+
+		Removes a record from the cache
+		"""
+		channel.connection().delete(channel.key('record', self._name, _id))
+
+	def fetch(self, _id: str) -> dict | None:
+		"""Fetch
+
+		Returns a record from the cache, or None
+		"""
+		b = channel.connection().get(channel.key('record', self._name, _id))
+		return b and json.loads(b) or None
+
+	def store(self, _id: str, record: dict) -> None:
+		"""Store
+
+		Adds a record to the cache
+		"""
+		channel.connection().set(
+			channel.key('record', self._name, _id), json.dumps(record)
+		)
+
+class Record(dict):
+	"""Record
+
+	A single record fetched from a Storage, which can be updated, validated,
+	and saved
+
+	Extends:
+		dict
+	"""
+
+	def __init__(self, storage: 'Storage', data: dict):
+		super().__init__(data)
+		self._storage = storage
+		self._changed = False
+		self.errors = []
+
+	def save(self, revision_info: dict = None) -> bool:
+		"""Save
+
+		Stores the record if it's been changed, returns True if it was
+		"""
+		if not self._changed:
+			return False
+		self['_updated'] = int(time())
+		self._storage._write([ dict(self) ], False)
+		self._changed = False
+		return True
+
+	def update(self, values: dict) -> dict:
+		"""Update
+
+		Changes the values of the record, returns the ones that changed
+		"""
+		dRet = {}
+		for k, v in values.items():
+			if self.get(k, undefined) != v:
+				self[k] = v
+				dRet[k] = v
+		if dRet:
+			self._changed = True
+		return dRet
+
+	def valid(self) -> bool:
+		"""Valid
+
+		Returns True if the record passes its definition
+		"""
+		self.errors = self._storage._invalid(self)
+		return not self.errors
+
+class Storage(Tree):
+	"""Storage
+
+	Takes the same definition and extensions as record_mysql.Storage, and
+	keeps the records in a SQLite table of the same name, as JSON, with a
+	column for each unique index. Single records are cached in the redis
+	stand-in, by ID, just as they are in front of MySQL. Like the real one,
+	it's the Tree used to validate the records
+
+	Extends:
+		define.Tree
+	"""
+
+	def __init__(self, details: dict, extend: dict = None):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			details (dict): The definition of the records
+			extend (dict): The MySQL and cache extensions
+
+		Returns:
+			Storage
+		"""
+
+		# Create the tree used to validate records
+		dExtend = extend or {}
+		self._fields = [ k for k in details if not k.startswith('__') ]
+		super().__init__(details)
+
+		# Get the table name and the unique indexes
+		dMySQL = dExtend.get('__mysql__', {})
+		self._table = dMySQL.get('name', details['__name__'].lower())
+		self._unique = {
+			k: d['fields'] for k, d in dMySQL.get('indexes', {}).items() \
+				if d.get('type') == 'unique' and isinstance(d['fields'], str)
+		}
+
+		# Get the cache indexes, they're always on a unique field
+		self._indexes = dExtend.get('__cache__', {}).get('indexes', {})
+
+		# The redis cache
+		self._cache = Cache(self._table)
+
+		# Create the table
+		self.install()
+
+	def _columns(self, record: dict) -> list:
+		"""Columns
+
+		Returns the values of the table's columns for the record
+
+		Arguments:
+			record (dict): The record
+
+		Returns:
+			list
+		"""
+		return [ record['_id'] ] + \
+			[ record.get(f) for f in self._unique.values() ] + \
+			[ json.dumps(record) ]
+
+	def _duplicate(self, records: list) -> RecordDuplicate:
+		"""Duplicate
+
+		Returns the exception for the first unique value of the records found
+		more than once, in the records or in the table
+
+		Arguments:
+			records (dict[]): The records that failed to be written
+
+		Returns:
+			RecordDuplicate
+		"""
+		for sIndex, sField in self._unique.items():
+			lValues = [ d.get(sField) for d in records ]
+			for d in records:
+				if lValues.count(d.get(sField)) > 1 or \
+					self._rows('WHERE `%s` = ? AND `_id` != ?' % sField,
+						[ d.get(sField), d['_id'] ]
+					):
+					return RecordDuplicate(d.get(sField), sIndex)
+		return RecordDuplicate(records[0]['_id'], '_id')
+
+	def _invalid(self, record: dict) -> list:
+		"""Invalid
+
+		Returns the errors of the record, an empty list if it's valid
+
+		Arguments:
+			record (dict): The record
+
+		Returns:
+			list
+		"""
+		if self.valid(dict(record)):
+			return []
+		return self.validation_failures or [ [ '', 'invalid' ] ]
+
+	def _rows(self, where: str = '', values: list = None) -> list:
+		"""Rows
+
+		Returns the records of the table matching the condition
+
+		Arguments:
+			where (str): Optional, the WHERE clause
+			values (list): Optional, the values of the clause
+
+		Returns:
+			dict[]
+		"""
+		with _lock:
+			return [ json.loads(t[0]) for t in _database.execute(
+				'SELECT `data` FROM `%s` %s' % (self._table, where),
+				values or []
+			) ]
+
+	def _write(self, records: list, insert: bool) -> None:
+		"""Write
+
+		Inserts or updates the records, all or none of them
+
+		Arguments:
+			records (dict[]): The records
+			insert (bool): True to insert, False to update
+
+		Raises:
+			RecordDuplicate
+		"""
+
+		lColumns = [ '_id' ] + list(self._unique.values()) + [ 'data' ]
+		try:
+			with _lock:
+				_database.execute('BEGIN')
+				try:
+					_database.executemany(
+						'INSERT INTO `%s` (%s) VALUES (%s) %s' % (
+							self._table,
+							', '.join([ '`%s`' % s for s in lColumns ]),
+							', '.join([ '?' ] * len(lColumns)),
+							not insert and 'ON CONFLICT (`_id`) DO UPDATE ' \
+								'SET %s' % ', '.join([
+									'`%s` = excluded.`%s`' % (s, s) \
+									for s in lColumns[1:]
+								]) or ''
+						), [ self._columns(d) for d in records ]
+					)
+				except:
+					_database.execute('ROLLBACK')
+					raise
+				_database.execute('COMMIT')
+		except sqlite3.IntegrityError:
+			raise self._duplicate(records)
+
+		# Clear the cached copies
+		for d in records:
+			self._cache.delete(d['_id'])
+
+	def add(self, value: dict, revision_info: dict = None) -> str:
+		"""Add
+
+		Validates and inserts a new record, returns its ID
+
+		Raises:
+			ValueError
+			RecordDuplicate
+		"""
+		iNow = int(time())
+		dRecord = {
+			**value, '_id': str(uuid4()), '_created': iNow, '_updated': iNow
+		}
+		lErrors = self._invalid(dRecord)
+		if lErrors:
+			raise ValueError(lErrors)
+		self._write([ dRecord ], True)
+		return dRecord['_id']
+
+	def filter(self, fields: dict, raw: bool | list = False) -> list:
+		"""Filter
+
+		Returns the records whose fields match the values, a list of values
+		matching any of them
+		"""
+		lWhere = []
+		lValues = []
+		for k, v in fields.items():
+			lV = isinstance(v, list) and v or [ v ]
+			lWhere.append('json_extract(`data`, \'$."%s"\') IN (%s)' % (
+				k, ', '.join([ '?' ] * len(lV))
+			))
+			lValues.extend(lV)
+		lRecords = self._rows('WHERE %s' % ' AND '.join(lWhere), lValues)
+		if isinstance(raw, list):
+			return [ { k: d.get(k) for k in raw } for d in lRecords ]
+		if raw:
+			return lRecords
+		return [ Record(self, d) for d in lRecords ]
+
+	def get(self,
+		_id: str | list = None,
+		index: str = undefined,
+		raw: bool = False
+	) -> Record | dict | list | None:
+		"""Get
+
+		Returns one record by ID or cache index, several by ID, or all of
+		them
+		"""
+
+		# If we want all of them
+		if _id is None:
+			lRecords = self._rows()
+
+		# Else if we want several
+		elif isinstance(_id, list):
+			dRecords = { d['_id']: d for d in self._rows(
+				'WHERE `_id` IN (%s)' % ', '.join([ '?' ] * len(_id)), _id
+			) }
+			lRecords = [ dRecords[s] for s in _id if s in dRecords ]
+
+		# Else if it's by index
+		elif index is not undefined:
+			lRecords = self._rows(
+				'WHERE `%s` = ?' % self._indexes[index], [ _id ]
+			)
+			if not lRecords:
+				return None
+			return raw and lRecords[0] or Record(self, lRecords[0])
+
+		# Else, it's by ID, look in the cache first
+		else:
+			dRecord = self._cache.fetch(_id)
+			if dRecord is None:
+				lRecords = self._rows('WHERE `_id` = ?', [ _id ])
+				if not lRecords:
+					return None
+				dRecord = lRecords[0]
+				self._cache.store(_id, dRecord)
+			return raw and dRecord or Record(self, dRecord)
+
+		# Return the list
+		return raw and lRecords or [ Record(self, d) for d in lRecords ]
+
+	def install(self) -> None:
+		"""Install
+
+		Creates the table, if it doesn't already exist
+		"""
+		with _lock:
+			_database.execute(
+				'CREATE TABLE IF NOT EXISTS `%s` (%s)' % (
+					self._table,
+					', '.join(
+						[ '`_id` TEXT PRIMARY KEY' ] + \
+						[ '`%s` TEXT UNIQUE' % s for s in self._unique.values() ] + \
+						[ '`data` TEXT NOT NULL' ]
+					)
+				)
+			)
+
+	def keys(self) -> list:
+		"""Keys
+
+		Returns the names of the fields
+		"""
+		return list(self._fields)
+
+	def remove(self,
+		_id: str | list,
+		revision_info: dict = None
+	) -> int | None:
+		"""Remove
+
+		Deletes one or more records, returns the number deleted, or None if
+		none were
+		"""
+		lIDs = isinstance(_id, list) and _id or [ _id ]
+		with _lock:
+			iCount = _database.execute(
+				'DELETE FROM `%s` WHERE `_id` IN (%s)' % (
+					self._table, ', '.join([ '?' ] * len(lIDs))
+				), lIDs
+			).rowcount
+		for s in lIDs:
+			self._cache.delete(s)
+		return iCount or None
+
+	def seed(self, records: list) -> None:
+		"""Seed
+
+		Replaces every record in the table without validating them, used to
+		load large data sets quickly
+
+		Arguments:
+			records (dict[]): The records
+		"""
+		lColumns = [ '_id' ] + list(self._unique.values()) + [ 'data' ]
+		with _lock:
+			_database.execute('DELETE FROM `%s`' % self._table)
+			_database.executemany('INSERT INTO `%s` (%s) VALUES (%s)' % (
+				self._table,
+				', '.join([ '`%s`' % s for s in lColumns ]),
+				', '.join([ '?' ] * len(lColumns))
+			), [ self._columns(d) for d in records ])
+
+	def uuid(self) -> str:
+		"""UUID
+
+		Returns a new unique ID
+		"""
+		return str(uuid4())
+
+def batch_add(storage: Storage, records: list, revision_info: dict) -> None:
+	"""Batch Add
+
+	Stands in for shared.batch.add, inserts the records, all or none of them
+
+	Raises:
+		RecordDuplicate
+	"""
+	iNow = int(time())
+	storage._write([
+		{ '_created': iNow, '_updated': iNow, **d } for d in records
+	], True)
+
+def batch_remove(storage: Storage, ids: list, revision_info: dict) -> list:
+	"""Batch Remove
+
+	Stands in for shared.batch.remove, deletes the records unless any are
+	missing, in which case their IDs are returned
+	"""
+	with _lock:
+		lFound = [ d['_id'] for d in storage.get(ids, raw = True) ]
+		lMissing = [ s for s in ids if s not in lFound ]
+		if lMissing:
+			return lMissing
+		storage.remove(ids)
+	return []
+
+def batch_save(storage: Storage, updates: list, revision_info: dict) -> list:
+	"""Batch Save
+
+	Stands in for shared.batch.save, saves the changes unless any of the
+	records' _updated no longer match, in which case their IDs are returned
+
+	Raises:
+		RecordDuplicate
+	"""
+	iNow = int(time())
+	with _lock:
+		dRecords = { d['_id']: d for d in storage._rows(
+			'WHERE `_id` IN (%s)' % ', '.join([ '?' ] * len(updates)),
+			[ t[0]['_id'] for t in updates ]
+		) }
+		lConflicts = [
+			t[0]['_id'] for t in updates \
+			if t[0]['_id'] not in dRecords or \
+				dRecords[t[0]['_id']]['_updated'] != t[0]['_updated']
+		]
+		if lConflicts:
+			return lConflicts
+		storage._write([
+			{ **dRecords[t[0]['_id']], **t[2], '_updated': iNow } \
+			for t in updates
+		], False)
+	return []
+
+def install(database: str = ':memory:') -> None:
+	"""Install
+
+	Replaces record_mysql's Storage, the batch writes, and the records redis
+	connection with the stand-ins. Must be called before the records modules
+	are imported
+
+	Arguments:
+		database (str): Optional, the SQLite file, in memory by default
+	"""
+
+	global _database
+
+	# Open the database
+	_database = sqlite3.connect(
+		database, check_same_thread = False, isolation_level = None
+	)
+
+	# Replace the Storage class
+	record_mysql.Storage = Storage
+
+	# Replace the batch writes, which are MySQL transactions
+	batch.add = batch_add
+	batch.remove = batch_remove
+	batch.save = batch_save
+
+	# Replace the redis connection
+	channel._redis = Redis()
@@ -0,0 +1,216 @@
+# coding=utf8
+""" Validation Benchmark
+
+Compares the cost per record of validating with the generic define Trees and
+with the compiled validators, for each definition, one record at a time, as
+a bulk request of records, and as the changes of an update
+
+	python -m bench.validation [--records 1000] [--bulk 100] [--repeat 5]
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from define import Tree
+import jsonb
+
+# Python imports
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+from random import Random
+from time import perf_counter, time
+
+# Project imports
+from bench.primary import _uuid, category, experience, skill, static
+from shared import validator
+
+# Constants
+DEFINITIONS = '%s/definitions' % Path(__file__).parent.parent.resolve()
+
+def records(rand: Random, name: str, count: int) -> list:
+	"""Records
+
+	Generates valid records of a definition, along with one invalid record in
+	every ten so that the failures are part of the cost
+
+	Arguments:
+		rand (Random): The random generator
+		name (str): The name of the definition
+		count (int): The number of records
+
+	Returns:
+		dict[]
+	"""
+
+	# Generate the fields of each
+	iNow = int(time())
+	lCategories = [ _uuid(rand) for _ in range(10) ]
+	lRet = []
+	for i in range(count):
+		if name == 'experience':
+			d = experience(rand, i)
+		elif name == 'skill':
+			d = skill(rand, i, lCategories)
+		elif name == 'skill_category':
+			d = category(rand, i)
+		else:
+			d = static(rand, i)
+		d.update({ '_id': _uuid(rand), '_created': iNow, '_updated': iNow })
+
+		# Break every tenth one
+		if i % 10 == 9:
+			sField = rand.choice([ k for k in d if k[0] != '_' ])
+			d[sField] = rand.choice([ None, True, -1, 'x' * 3000, [] ])
+			d['unknown'] = 1
+
+		lRet.append(d)
+
+	# Return the records
+	return lRet
+
+def time_per(function: callable, values: list, repeat: int) -> float:
+	"""Time Per
+
+	Returns the best time, of the repeats, to call the function with all the
+	values, divided by the number of values, in microseconds
+
+	Arguments:
+		function (callable): Called with the list of values
+		values (list): The values
+		repeat (int): The number of times to repeat the measure
+
+	Returns:
+		float
+	"""
+	fBest = None
+	for _ in range(repeat):
+		fStart = perf_counter()
+		function(values)
+		fTime = perf_counter() - fStart
+		if fBest is None or fTime < fBest:
+			fBest = fTime
+	return fBest / len(values) * 1e6
+
+def run(name: str, args: dict) -> dict:
+	"""Run
+
+	Measures every scenario of a definition with both validators, after
+	making sure they return the same failures
+
+	Arguments:
+		name (str): The name of the definition
+		args (dict): The arguments of the run
+
+	Returns:
+		dict
+	"""
+
+	# Load the tree and compile it
+	oTree = Tree(jsonb.load('%s/%s.json' % (DEFINITIONS, name)))
+	fCompiled = validator.build(oTree)
+
+	# Generate the records, and the changes of updates, every other field
+	oRand = Random(args['seed'])
+	lRecords = records(oRand, name, args['records'])
+	lChanges = [
+		{ k: v for i, (k, v) in enumerate(d.items()) if i % 2 } \
+		for d in lRecords
+	]
+
+	# The generic validator, the way Storage.add and Record.valid use it
+	def generic(value: dict, ignore_missing: bool = False) -> list:
+		oTree.valid(value, ignore_missing)
+		return oTree.validation_failures
+
+	# Make sure they agree before timing anything
+	for d in lRecords:
+		if generic(d) != fCompiled(d):
+			raise AssertionError('%s: %s != %s' % (
+				name, generic(d), fCompiled(d)
+			))
+	for d in lChanges:
+		if generic(d, True) != fCompiled(d, True):
+			raise AssertionError('%s: %s != %s' % (
+				name, generic(d, True), fCompiled(d, True)
+			))
+
+	# The scenarios, each called with the full list of records
+	iBulk = args['bulk']
+	def scenarios(valid: callable) -> dict:
+		def single(values: list) -> None:
+			for d in values:
+				valid(d)
+		def bulk(values: list) -> None:
+			for i in range(0, len(values), iBulk):
+				lErrors = []
+				for j, d in enumerate(values[i:i + iBulk], i):
+					lErrors.extend([
+						[ 'records.%d.%s' % (j, l[0]), l[1] ] \
+						for l in valid(d)
+					])
+		def update(values: list) -> None:
+			for d in values:
+				valid(d, True)
+		return { 'single': single, 'bulk': bulk, 'update': update }
+
+	# Time each scenario with each validator
+	dGeneric = scenarios(generic)
+	dCompiled = scenarios(fCompiled)
+	dRet = {}
+	for sScenario in dGeneric:
+		lValues = sScenario == 'update' and lChanges or lRecords
+		fBefore = time_per(dGeneric[sScenario], lValues, args['repeat'])
+		fAfter = time_per(dCompiled[sScenario], lValues, args['repeat'])
+		dRet[sScenario] = {
+			'generic_us': round(fBefore, 2),
+			'compiled_us': round(fAfter, 2),
+			'speedup': round(fBefore / fAfter, 1)
+		}
+
+	# Return the results
+	return dRet
+
+def main():
+	"""Main
+
+	Runs the benchmark and prints the results
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Record validation benchmark')
+	oArgs.add_argument('--records', type = int, default = 1000)
+	oArgs.add_argument('--bulk', type = int, default = 100)
+	oArgs.add_argument('--repeat', type = int, default = 5)
+	oArgs.add_argument('--seed', type = int, default = 0)
+	oArgs.add_argument('--json', action = 'store_true')
+	dArgs = vars(oArgs.parse_args())
+
+	# Run each definition
+	dResults = {
+		s: run(s, dArgs) for s in [
+			'experience', 'skill', 'skill_category', 'static'
+		]
+	}
+
+	# Output the results
+	if dArgs['json']:
+		print(json.dumps(dResults, indent = 4))
+		return
+	print('%-16s %-8s %12s %12s %8s' % (
+		'definition', 'scenario', 'generic us', 'compiled us', 'speedup'
+	))
+	for sName, dScenarios in dResults.items():
+		for sScenario, d in dScenarios.items():
+			print('%-16s %-8s %12.2f %12.2f %7.1fx' % (
+				sName, sScenario, d['generic_us'], d['compiled_us'],
+				d['speedup']
+			))
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
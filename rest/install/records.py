@@ -18,11 +18,14 @@ import record_redis
 # Records
 from records import experience, skill, skill_category, static
 
+# Project imports
+from shared import pool
+
 # Only run if called directly
 if __name__ == '__main__':
 
 	# Add the "_" host
-	record_mysql.add_host(config.mysql.primary({
+	pool.add_host(config.mysql.primary({
 		'charset': 'utf8',
 		'host': 'localhost',
 		'passwd': '',
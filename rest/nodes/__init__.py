@@ -16,11 +16,59 @@ import em
 
 # Python imports
 from pprint import pformat
+from threading import Lock
+
+# Project imports
+from shared.digest import Digest, fingerprint
+
+# Module variables
+_digest = None
+_lock = Lock()
+
+def _get_digest() -> Digest:
+	"""Get Digest
+
+	Returns the digest the error emails are queued on, creating it the first
+	time
+
+	Returns:
+		Digest
+	"""
+
+	global _digest
+
+	# If we don't have it yet
+	if _digest is None:
+		with _lock:
+			if _digest is None:
+
+				# Get the config
+				dConf = config.email.errors({
+					'max_emails': 10,
+					'per': 3600,
+					'queue': 1000,
+					'window': 60
+				})
+
+				# Create the digest
+				_digest = Digest(
+					em.error,
+					dConf['window'],
+					dConf['queue'],
+					dConf['max_emails'],
+					dConf['per']
+				)
+
+	# Return the digest
+	return _digest
 
 def errors(error):
 	"""Errors
 
-	Handles sending an email about an error with all the details related
+	Handles sending an email about an error with all the details related.
+	The email isn't sent here, the error is queued and sent from a background
+	thread in a digest with any other errors that happen within the window,
+	so a request is never held up by SMTP
 
 	Arguments:
 		error (dict): A dictionary of all the data associated with the script \
@@ -34,21 +82,32 @@ def errors(error):
 	if not config.email.send_error_emails(False):
 		return True
 
-	# Generate a list of the individual parts of the error
-	lErrors = [
-		'ERROR MESSAGE\n\n%s\n' % error['traceback'],
-		'REQUEST\n\n%s %s:%s\n' % (
-			error['method'], error['service'], error['path']
-		)
-	]
-	if 'data' in error and error['data']:
-		lErrors.append('DATA\n\n%s\n' % pformat(error['data']))
-	if 'session' in error and error['session']:
-		lErrors.append('SESSION\n\n%s\n' % pformat({
-			k:error['session'][k] for k in error['session']
-		}))
-	if 'environment' in error and error['environment']:
-		lErrors.append('ENVIRONMENT\n\n%s\n' % pformat(error['environment']))
-
-	# Send the email
-	return em.error('\n'.join(lErrors))
\ No newline at end of file
+	# Generates the text of the email, it's only called for the first
+	#	occurrence of an error in each digest, from the background thread
+	def report() -> str:
+
+		# Generate a list of the individual parts of the error
+		lErrors = [
+			'ERROR MESSAGE\n\n%s\n' % error['traceback'],
+			'REQUEST\n\n%s %s:%s\n' % (
+				error['method'], error['service'], error['path']
+			)
+		]
+		if 'data' in error and error['data']:
+			lErrors.append('DATA\n\n%s\n' % pformat(error['data']))
+		if 'session' in error and error['session']:
+			lErrors.append('SESSION\n\n%s\n' % pformat({
+				k:error['session'][k] for k in error['session']
+			}))
+		if 'environment' in error and error['environment']:
+			lErrors.append('ENVIRONMENT\n\n%s\n' % pformat(error['environment']))
+		return '\n'.join(lErrors)
+
+	# Queue the email, grouped with any other occurrences of the same error
+	return _get_digest().add(
+		fingerprint(
+			error['method'], error['service'], error['path'],
+			error['traceback']
+		),
+		report
+	)
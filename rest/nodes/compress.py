@@ -0,0 +1,280 @@
+# coding=utf8
+""" Compress
+
+Accept-Encoding negotiated compression of responses, and the Bottle plugin
+using it
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+import undefined
+
+# Python imports
+import gzip
+from hashlib import blake2b
+
+# Pip imports
+from bottle import request, response
+try:
+	import brotli
+except ImportError:
+	brotli = None
+
+# Project imports
+from shared.lru import LRU
+
+# Module variables
+_cache = None
+_conf = None
+
+def _config() -> dict:
+	"""Config
+
+	Returns the compression config, loading it on first use
+
+	Returns:
+		dict
+	"""
+
+	global _cache, _conf
+
+	# If we don't have it yet
+	if _conf is None:
+		_conf = config.body.rest.compression({
+			'brotli': True,
+			'cache': {
+				'max_bytes': 4194304,
+				'max_entries': 256
+			},
+			'gzip_level': 6,
+			'brotli_quality': 5,
+			'threshold': 1024
+		})
+		_cache = LRU(
+			_conf['cache']['max_bytes'],
+			_conf['cache']['max_entries']
+		)
+
+	# Return the config
+	return _conf
+
+def accepted(header: str) -> list:
+	"""Accepted
+
+	Returns the encodings we support that are accepted by the client, in
+	order of preference
+
+	Arguments:
+		header (str): The value of the Accept-Encoding header
+
+	Returns:
+		str[]
+	"""
+
+	# Go through each part of the header
+	lAccepted = []
+	for sPart in header.split(','):
+		lPart = sPart.strip().split(';')
+		sEncoding = lPart[0].strip().lower()
+
+		# If it's been explicitly refused, skip it
+		bRefused = False
+		for s in lPart[1:]:
+			s = s.strip()
+			if s.startswith('q='):
+				try:
+					bRefused = float(s[2:]) == 0
+				except ValueError:
+					pass
+		if not bRefused:
+			lAccepted.append(sEncoding)
+
+	# Return the ones we support, best first
+	lRet = []
+	if brotli and _config()['brotli'] and 'br' in lAccepted:
+		lRet.append('br')
+	if 'gzip' in lAccepted:
+		lRet.append('gzip')
+	return lRet
+
+def compress(body: bytes, encoding: str) -> bytes:
+	"""Compress
+
+	Compresses the body using the encoding
+
+	Arguments:
+		body (bytes): The data to compress
+		encoding (str): 'br' or 'gzip'
+
+	Returns:
+		bytes
+	"""
+	dConf = _config()
+	if encoding == 'br':
+		return brotli.compress(
+			body, mode = brotli.MODE_TEXT, quality = dConf['brotli_quality']
+		)
+	return gzip.compress(body, dConf['gzip_level'])
+
+def encode(body: bytes,
+	accept_encoding: str,
+	etag: str | None = None
+) -> tuple | None:
+	"""Encode
+
+	Returns the encoding and the body to send, in the best encoding the
+	client accepts. Returns None if the body is too small to be worth it. If
+	the body has an ETag it's cacheable, so the compressed form is kept and
+	reused
+
+	Arguments:
+		body (bytes): The uncompressed response
+		accept_encoding (str): The value of the Accept-Encoding header
+		etag (str | None): Optional, the ETag of the response
+
+	Returns:
+		tuple (str | None, bytes) | None
+	"""
+
+	# If it's too small to be worth it
+	if len(body) < _config()['threshold']:
+		return None
+
+	# If the client doesn't accept anything we support
+	lEncodings = accepted(accept_encoding)
+	if not lEncodings:
+		return ( None, body )
+	sEncoding = lEncodings[0]
+
+	# If the response is cacheable, look for it
+	if etag:
+		tKey = (
+			etag,
+			sEncoding,
+			blake2b(body, digest_size = 16).digest()
+		)
+		bCompressed = _cache.get(tKey)
+		if bCompressed is undefined:
+			bCompressed = compress(body, sEncoding)
+			_cache.set(tKey, bCompressed, len(bCompressed))
+
+	# Else, just compress it
+	else:
+		bCompressed = compress(body, sEncoding)
+
+	# Return the encoding and the compressed body
+	return ( sEncoding, bCompressed )
+
+def headers(encoding: str | None) -> None:
+	"""Headers
+
+	Sets the headers of a bottle response whose body depends on the
+	Accept-Encoding header. Accept-Encoding is added to any Vary header
+	already set, e.g. by CORS, and if the body is compressed, the encoding is
+	set and the ETag made weak, as the body isn't byte for byte the same as
+	the uncompressed one with the same tag
+
+	Arguments:
+		encoding (str | None): The encoding of the body, None if it's not
+			compressed
+	"""
+	response.set_header('Vary', vary(response.get_header('Vary')))
+	if encoding:
+		response.set_header('Content-Encoding', encoding)
+		sETag = response.get_header('ETag')
+		if sETag:
+			response.set_header('ETag', weak(sETag))
+
+def plugin(callback: callable) -> callable:
+	"""Plugin
+
+	Wraps a route so that any response larger than the threshold is
+	compressed with the best encoding the client accepts
+
+	Arguments:
+		callback (callable): The route callback
+
+	Returns:
+		callable
+	"""
+
+	def wrapper(*args, **kwargs):
+
+		# Call the route
+		mRet = callback(*args, **kwargs)
+
+		# If it's not something we can compress, or has already been
+		if response.status_code != 200 or \
+			'Content-Encoding' in response.headers or \
+			not isinstance(mRet, (bytes, str)):
+			return mRet
+
+		# Encode it, if it's too small to be worth it, return it as is
+		tEncoded = encode(
+			isinstance(mRet, str) and mRet.encode('utf-8') or mRet,
+			request.get_header('Accept-Encoding', ''),
+			response.get_header('ETag')
+		)
+		if tEncoded is None:
+			return mRet
+
+		# Set the headers, whatever happens, the response depends on the
+		#	Accept-Encoding header
+		headers(tEncoded[0])
+
+		# If the client doesn't accept anything we support
+		if tEncoded[0] is None:
+			return mRet
+
+		# Return the compressed body
+		return tEncoded[1]
+
+	# Return the wrapper
+	return wrapper
+
+def stats() -> dict:
+	"""Stats
+
+	Returns the counters of the compressed response cache
+
+	Returns:
+		dict
+	"""
+	_config()
+	return _cache.stats()
+
+def vary(value: str | None) -> str:
+	"""Vary
+
+	Returns the value of the Vary header with Accept-Encoding added to it
+
+	Arguments:
+		value (str | None): The current value of the header, if there is one
+
+	Returns:
+		str
+	"""
+	if not value:
+		return 'Accept-Encoding'
+	if 'accept-encoding' in [ s.strip().lower() for s in value.split(',') ]:
+		return value
+	return '%s, Accept-Encoding' % value
+
+def weak(etag: str) -> str:
+	"""Weak
+
+	Returns the weak version of an ETag
+
+	Arguments:
+		etag (str): The ETag
+
+	Returns:
+		str
+	"""
+	return etag.startswith('W/') and etag or 'W/%s' % etag
@@ -0,0 +1,60 @@
+# coding=utf8
+""" Conditional
+
+Bottle plugin handling ETag / If-None-Match conditional requests
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Pip imports
+from bottle import request, response
+
+# Project imports
+from shared import conditional
+
+def plugin(callback: callable) -> callable:
+	"""Plugin
+
+	Wraps a route so that the If-None-Match header is passed to the service,
+	and if the service generates an ETag, it is added to the response. If the
+	tag matched, a 304 with no body is returned instead
+
+	Arguments:
+		callback (callable): The route callback
+
+	Returns:
+		callable
+	"""
+
+	def wrapper(*args, **kwargs):
+
+		# Lists contain many responses, so they can't be conditional
+		if request.path.endswith('/__list'):
+			return callback(*args, **kwargs)
+
+		# Pass the header to the service and call it
+		conditional.begin(request.get_header('If-None-Match'))
+		try:
+			mRet = callback(*args, **kwargs)
+		finally:
+			dTag = conditional.end()
+
+		# If the service generated a tag
+		if dTag:
+			response.set_header('ETag', dTag['etag'])
+			response.set_header('Cache-Control', 'no-cache')
+
+			# If it matched, the client already has the data
+			if dTag['match']:
+				response.status = 304
+				return ''
+
+		# Return the response as is
+		return mRet
+
+	# Return the wrapper
+	return wrapper
@@ -0,0 +1,105 @@
+# coding=utf8
+""" Metrics
+
+Serves the metrics of the worker handling the request in Prometheus text
+format
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+
+# Python imports
+from os import getpid
+
+# Pip imports
+from bottle import response
+
+# Project imports
+from shared import cache, metrics, pool
+
+def gauges() -> str:
+	"""Gauges
+
+	Returns the cache and pool stats of the process as Prometheus gauges
+
+	Returns:
+		str
+	"""
+
+	sPID = str(getpid())
+	lLines = []
+
+	# Add the process wide cache and flight counters
+	dCache = cache.stats()
+	for sSection in [ 'flight', 'local', 'negative' ]:
+		for sKey, mValue in sorted(dCache.get(sSection, {}).items()):
+			if isinstance(mValue, (int, float)):
+				sName = '%s_cache_%s_%s' % (metrics.PREFIX, sSection, sKey)
+				lLines.extend([
+					'# TYPE %s gauge' % sName,
+					'%s{pid="%s"} %s' % (sName, sPID, mValue)
+				])
+
+	# Add the stats of each pool
+	dPools = pool.stats()
+	for sKey in sorted(set([ k for d in dPools.values() for k in d ])):
+		sName = '%s_pool_%s' % (metrics.PREFIX, sKey)
+		lLines.append('# TYPE %s gauge' % sName)
+		for sHost, dStats in sorted(dPools.items()):
+			lLines.append('%s{host="%s",pid="%s"} %s' % (
+				sName, sHost, sPID, dStats[sKey]
+			))
+
+	# Return the lines
+	return lLines and '\n'.join(lLines) + '\n' or ''
+
+def route() -> str:
+	"""Route
+
+	Route handler for GET /metrics
+
+	Returns:
+		str
+	"""
+	response.content_type = metrics.CONTENT_TYPE
+	response.set_header('Cache-Control', 'no-store')
+	return metrics.render() + gauges()
+
+def setup(instance: object) -> str | None:
+	"""Setup
+
+	If metrics are enabled, measures every request method of the service
+	instance and counts the calls to each Storage once it's created.
+	Returns the path the metrics should be served on, or None if they're
+	disabled
+
+	Arguments:
+		instance (object): The service instance
+
+	Returns:
+		str | None
+	"""
+
+	# Get the config
+	dConf = config.primary.metrics({
+		'enabled': True,
+		'path': '/metrics'
+	})
+
+	# If they're disabled
+	if not dConf['enabled']:
+		return None
+
+	# Measure the requests, and count the calls to each Storage as it's
+	#	created
+	metrics.instrument(instance)
+	cache.on_storage(lambda name, storage: metrics.storage({ name: storage }))
+
+	# Return the path
+	return dConf['path']
@@ -0,0 +1,36 @@
+# coding=utf8
+""" Pool
+
+Bottle plugin returning pooled MySQL connections at the end of each request
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Project imports
+from shared import pool
+
+def plugin(callback: callable) -> callable:
+	"""Plugin
+
+	Wraps a route so that any connection leased by the thread while handling
+	it goes back to the pool once it's done
+
+	Arguments:
+		callback (callable): The route callback
+
+	Returns:
+		callable
+	"""
+
+	def wrapper(*args, **kwargs):
+		try:
+			return callback(*args, **kwargs)
+		finally:
+			pool.release()
+
+	# Return the wrapper
+	return wrapper
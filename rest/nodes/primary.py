@@ -13,11 +13,14 @@ __created__		= "2022-08-25"
 # Ouroboros imports
 from body import register_services, REST
 from config import config
-import record_mysql
 
 # Project imports
-from . import errors
+from . import compress, conditional, errors, static
+from . import metrics as metrics_
+from . import pool as pool_
+from records import experience, skill, skill_category, static as static_
 from services.primary import Primary
+from shared import pool, profiler, search, snapshot
 
 def main():
 	"""Main
@@ -26,7 +29,7 @@ def main():
 	"""
 
 	# Add the primary host
-	record_mysql.add_host(config.mysql.primary({
+	pool.add_host(config.mysql.primary({
 		'charset': 'utf8',
 		'host': 'localhost',
 		'passwd': '',
@@ -39,8 +42,14 @@ def main():
 		'verbose': False
 	})
 
-	# Init the service
+	# Init the service, profiling and measuring its requests if enabled
 	oPrimary = Primary()
+	profiler.setup(oPrimary)
+	sMetrics = metrics_.setup(oPrimary)
+
+	# If configured to, build the search index once, before any worker is
+	#	forked, else it's built by the first search
+	search.build()
 
 	# Register the services
 	oRest = register_services({ 'primary': oPrimary })
@@ -48,15 +57,49 @@ def main():
 	# Get the primary conf
 	dPrimary = oRest['primary']
 
-	# Run the REST server with the Client instance
-	REST(
+	# Create the REST server with the Primary instance
+	oServer = REST(
 		name = 'primary',
 		instance = oPrimary,
 		cors = config.body.rest.allowed(),
 		lists = True,
 		on_errors = errors,
 		verbose = dConf['verbose']
-	).run(
+	)
+
+	# Add the response compression, it's installed first so that it wraps
+	#	everything else and sees the final response
+	oServer.install(compress.plugin)
+
+	# Add the ETag / If-None-Match handling
+	oServer.install(conditional.plugin)
+
+	# Return any pooled MySQL connection at the end of each request
+	oServer.install(pool_.plugin)
+
+	# Add the route for the compiled static pages
+	oServer.route('/static/html/<key>', 'GET', static.html)
+
+	# Add the route for the metrics of the worker
+	if sMetrics:
+		oServer.route(sMetrics, 'GET', metrics_.route)
+
+	# If there's more than one worker, load the records once, here in the
+	#	master, and share them with the workers as they're forked
+	dPrefork = config.primary.prefork({
+		'delay': 0.05,
+		'enabled': False
+	})
+	if dPrefork['enabled'] and dPrimary['workers'] > 1:
+		snapshot.Publisher([
+			experience.Cache,
+			skill.Cache,
+			skill_category.Cache,
+			static_.Cache
+		], dPrefork['delay']).start()
+
+	# Run the REST server
+	oServer.run(
 		host = dPrimary['host'],
 		port = dPrimary['port'],
 		workers = dPrimary['workers'],
@@ -0,0 +1,527 @@
+# coding=utf8
+""" Primary ASGI
+
+Handles starting the Primary service in asyncio mode on an ASGI server. The
+synchronous server in nodes.primary is still available
+
+	python -m nodes.primary_async
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from body import Error, errors
+from config import config
+from jobject import jobject
+import jsonb
+
+# Python imports
+import asyncio
+import re
+from time import perf_counter
+from traceback import format_exc
+from urllib.parse import parse_qs
+
+# Pip imports
+import uvicorn
+
+# Project imports
+from . import compress, errors as on_errors, metrics as metrics_, static
+from services.primary import Primary
+from services.primary_async import PrimaryAsync
+from shared import conditional, metrics, pool, profiler, search
+from shared.asynchronous import Async
+
+# Constants
+HTTP = {
+	'create': 'POST',
+	'delete': 'DELETE',
+	'read': 'GET',
+	'update': 'PUT'
+}
+STATIC = '/static/html/'
+
+def _encoding(headers: list, encoding: str | None) -> None:
+	"""Encoding
+
+	Sets the headers of a response whose body depends on the Accept-Encoding
+	header, the same way compress.headers does for bottle. Accept-Encoding
+	is added to any Vary header already in the list, and if the body is
+	compressed, the encoding is added and any ETag made weak
+
+	Arguments:
+		headers (list): The headers to change
+		encoding (str | None): The encoding of the body, None if it's not
+			compressed
+	"""
+
+	# Add to the Vary header, or add it
+	for i, (sName, sValue) in enumerate(headers):
+		if sName == 'Vary':
+			headers[i] = ( sName, compress.vary(sValue) )
+			break
+	else:
+		headers.append(( 'Vary', compress.vary(None) ))
+
+	# If it's compressed
+	if encoding:
+		headers.append(( 'Content-Encoding', encoding ))
+		for i, (sName, sValue) in enumerate(headers):
+			if sName == 'ETag':
+				headers[i] = ( sName, compress.weak(sValue) )
+
+class Application(object):
+	"""Application
+
+	ASGI application calling the request methods of an Async service. It
+	accepts the same requests as the synchronous REST server, and handles
+	CORS, ETags, and compression the same way its plugins do
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		service: Async,
+		cors: list | None = None,
+		on_errors: callable = None,
+		verbose: bool = False,
+		metrics_path: str | None = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			service (Async): The service to call
+			cors (str[]): Optional, the domains allowed to make requests
+			on_errors (callable): Optional, called with the details of any
+				request that crashes
+			verbose (bool): Optional, set to print every request
+			metrics_path (str): Optional, the path the metrics are served
+				on, None to not serve them
+
+		Returns:
+			Application
+		"""
+
+		# Store the arguments
+		self._service = service
+		self._on_errors = on_errors
+		self._verbose = verbose
+		self._metrics = metrics_path
+
+		# Generate the routes, the URI and HTTP method to the service method
+		self._routes = {}
+		for sName in service.methods:
+			sNoun, _, sAction = sName.rpartition('_')
+			self._routes.setdefault(
+				'/%s' % sNoun.replace('_', '/'), {}
+			)[HTTP[sAction]] = sName
+
+		# Generate the regex for the allowed origins
+		self._cors = cors and re.compile(
+			r'^https?://([a-z0-9-]+\.)*(%s)(:\d+)?$' % \
+				'|'.join([ re.escape(s) for s in cors ])
+		) or None
+
+	async def __call__(self, scope: dict, receive: callable, send: callable):
+		"""Call
+
+		Handles a single ASGI connection
+
+		Arguments:
+			scope (dict): The connection details
+			receive (callable): Returns the next event from the client
+			send (callable): Sends an event to the client
+		"""
+
+		# If it's the server starting or stopping
+		if scope['type'] == 'lifespan':
+			return await self._lifespan(receive, send)
+
+		# We only handle HTTP
+		if scope['type'] != 'http':
+			return
+
+		# Get the headers
+		dHeaders = {
+			k.decode('latin-1').lower(): v.decode('latin-1') \
+			for k, v in scope['headers']
+		}
+
+		# Add the same CORS headers as body.REST if the origin is allowed
+		lHeaders = []
+		sOrigin = dHeaders.get('origin')
+		if sOrigin and self._cors and self._cors.match(sOrigin):
+			lHeaders.extend([
+				( 'Access-Control-Allow-Origin', sOrigin ),
+				( 'Vary', 'Origin' )
+			])
+
+		# If it's a static page
+		sMethod = scope['method']
+		sPath = scope['path'].rstrip('/')
+		if sMethod == 'GET' and sPath.startswith(STATIC):
+			return await self._static(
+				sPath[len(STATIC):], dHeaders, lHeaders, send
+			)
+
+		# If it's the metrics
+		if sMethod == 'GET' and self._metrics and sPath == self._metrics:
+			return await self._send(send, 200, lHeaders + [
+				( 'Content-Type', metrics.CONTENT_TYPE ),
+				( 'Cache-Control', 'no-store' )
+			], (metrics.render() + metrics_.gauges()).encode('utf-8'))
+
+		# If the path doesn't exist
+		dRoute = self._routes.get(sPath)
+		if not dRoute:
+			return await self._send(send, 404, lHeaders)
+
+		# If it's a preflight request, answer it the way body.REST does
+		if sMethod == 'OPTIONS':
+			return await self._send(send, 200, lHeaders + [
+				( 'Access-Control-Allow-Methods',
+					'DELETE, GET, POST, PUT, OPTIONS' ),
+				( 'Access-Control-Max-Age', '1728000' ),
+				( 'Access-Control-Allow-Headers',
+					'Authorization,DNT,X-CustomHeader,Keep-Alive,User-Agent,' \
+					'X-Requested-With,If-Modified-Since,Cache-Control,' \
+					'Content-Type' ),
+				( 'Content-Type', 'text/plain charset=UTF-8' )
+			])
+
+		# If the method isn't handled by the path
+		if sMethod not in dRoute:
+			return await self._send(send, 405, lHeaders + [
+				( 'Allow', ','.join(sorted(dRoute.keys())) )
+			])
+
+		# Get the data sent
+		bBody = await self._receive(receive)
+		try:
+			dData = self._data(scope['query_string'], bBody)
+		except ValueError:
+			return await self._json(send, 200, lHeaders, dHeaders, Error(
+				errors.REST_REQUEST_DATA, 'invalid json'
+			))
+
+		# Call the service method with the If-None-Match header available
+		fStart = perf_counter()
+		conditional.begin(dHeaders.get('if-none-match'))
+		try:
+			oResponse = await getattr(self._service, dRoute[sMethod])(
+				jobject({
+					'data': jobject(dData),
+					'session': None,
+					'environment': {
+						'method': sMethod,
+						'path': sPath,
+						'headers': dHeaders
+					}
+				})
+			)
+
+		# If it crashed, send the details in the background
+		except Exception:
+			sTraceback = format_exc()
+			print(sTraceback)
+			if self._on_errors:
+				asyncio.get_running_loop().run_in_executor(
+					None, self._on_errors, {
+						'traceback': sTraceback,
+						'method': sMethod,
+						'service': 'primary',
+						'path': sPath,
+						'data': dData,
+						'environment': { 'headers': dHeaders }
+					}
+				)
+			oResponse = Error(errors.SERVICE_CRASHED, 'primary:%s' % sPath)
+
+		# Get the tag generated by the service
+		finally:
+			dTag = conditional.end()
+
+		# If we're verbose, print the request
+		if self._verbose:
+			print('%s %s %.3fms' % (
+				sMethod, sPath, (perf_counter() - fStart) * 1000
+			))
+
+		# If the service generated a tag
+		if dTag:
+			lHeaders.extend([
+				( 'ETag', dTag['etag'] ),
+				( 'Cache-Control', 'no-cache' )
+			])
+
+			# If it matched, the client already has the data
+			if dTag['match']:
+				return await self._send(send, 304, lHeaders)
+
+		# Send the response
+		return await self._json(
+			send, 200, lHeaders, dHeaders, oResponse, dTag and dTag['etag']
+		)
+
+	def _data(self, query_string: bytes, body: bytes) -> dict:
+		"""Data
+
+		Returns the data sent with the request, either as JSON in the body,
+		or in the `d` parameter of the query string
+
+		Arguments:
+			query_string (bytes): The query string of the URL
+			body (bytes): The body of the request
+
+		Raises:
+			ValueError
+
+		Returns:
+			dict
+		"""
+
+		# If we have a body, use it, else look for the query parameter
+		if body:
+			mData = jsonb.decode(body.decode('utf-8'))
+		else:
+			lD = parse_qs(query_string.decode('latin-1')).get('d')
+			mData = lD and jsonb.decode(lD[0]) or {}
+
+		# The data must be an object
+		if not isinstance(mData, dict):
+			raise ValueError('data')
+
+		# Return the data
+		return mData
+
+	async def _json(self,
+		send: callable,
+		status: int,
+		headers: list,
+		request_headers: dict,
+		response: any,
+		etag: str | None = None
+	):
+		"""JSON
+
+		Sends a service Response as JSON, compressed if the client accepts it
+
+		Arguments:
+			send (callable): Sends an event to the client
+			status (int): The HTTP status
+			headers (list): The headers to send
+			request_headers (dict): The headers of the request
+			response (Response): The service Response
+			etag (str | None): Optional, the ETag of the response
+		"""
+
+		# Convert the response to bytes
+		bBody = response.to_json().encode('utf-8')
+		headers.append(( 'Content-Type', 'application/json; charset=utf-8' ))
+
+		# Compress it
+		tEncoded = compress.encode(
+			bBody, request_headers.get('accept-encoding', ''), etag
+		)
+		if tEncoded:
+			_encoding(headers, tEncoded[0])
+			if tEncoded[0]:
+				bBody = tEncoded[1]
+
+		# Send it
+		return await self._send(send, status, headers, bBody)
+
+	async def _lifespan(self, receive: callable, send: callable):
+		"""Lifespan
+
+		Handles the server starting and stopping
+
+		Arguments:
+			receive (callable): Returns the next event from the server
+			send (callable): Sends an event to the server
+		"""
+		while True:
+			dMessage = await receive()
+			if dMessage['type'] == 'lifespan.startup':
+				await send({ 'type': 'lifespan.startup.complete' })
+			elif dMessage['type'] == 'lifespan.shutdown':
+				await asyncio.get_running_loop().run_in_executor(
+					None, self._service.shutdown
+				)
+				await send({ 'type': 'lifespan.shutdown.complete' })
+				return
+
+	async def _receive(self, receive: callable) -> bytes:
+		"""Receive
+
+		Returns the full body of the request
+
+		Arguments:
+			receive (callable): Returns the next event from the client
+
+		Returns:
+			bytes
+		"""
+		lParts = []
+		while True:
+			dMessage = await receive()
+			if dMessage['type'] == 'http.disconnect':
+				break
+			lParts.append(dMessage.get('body', b''))
+			if not dMessage.get('more_body'):
+				break
+		return b''.join(lParts)
+
+	async def _send(self,
+		send: callable,
+		status: int,
+		headers: list,
+		body: bytes = b''
+	):
+		"""Send
+
+		Sends the response to the client
+
+		Arguments:
+			send (callable): Sends an event to the client
+			status (int): The HTTP status
+			headers (list): The headers to send
+			body (bytes): Optional, the body to send
+		"""
+		await send({
+			'type': 'http.response.start',
+			'status': status,
+			'headers': [
+				( k.encode('latin-1'), v.encode('latin-1') ) \
+				for k, v in headers + [ ( 'Content-Length', str(len(body)) ) ]
+			]
+		})
+		await send({ 'type': 'http.response.body', 'body': body })
+
+	async def _static(self,
+		key: str,
+		request_headers: dict,
+		headers: list,
+		send: callable
+	):
+		"""Static
+
+		Sends the compiled HTML of a static page
+
+		Arguments:
+			key (str): The key of the static page
+			request_headers (dict): The headers of the request
+			headers (list): The headers to send
+			send (callable): Sends an event to the client
+		"""
+
+		# Find the page, in a thread, as it may have to be fetched
+		conditional.begin(request_headers.get('if-none-match'))
+		try:
+			tPage = await self._service.call(
+				lambda a: static.page(*a),
+				( key, request_headers.get('accept-encoding', '') )
+			)
+		finally:
+			dTag = conditional.end()
+
+		# If it doesn't exist
+		if tPage is None:
+			return await self._send(send, 404, headers)
+
+		# If the client already has it
+		if dTag:
+			headers.extend([
+				( 'ETag', dTag['etag'] ),
+				( 'Cache-Control', 'no-cache' )
+			])
+			if dTag['match']:
+				return await self._send(send, 304, headers)
+
+		# Send the page
+		headers.append(( 'Content-Type', 'text/html; charset=utf-8' ))
+		_encoding(headers, tPage[0])
+		mBody = tPage[1]
+		return await self._send(
+			send,
+			200,
+			headers,
+			isinstance(mBody, str) and mBody.encode('utf-8') or mBody
+		)
+
+def application() -> Application:
+	"""Application
+
+	Creates the ASGI application, called once in each worker
+
+	Returns:
+		Application
+	"""
+
+	# Add the primary host
+	pool.add_host(config.mysql.primary({
+		'charset': 'utf8',
+		'host': 'localhost',
+		'passwd': '',
+		'port': 3306,
+		'user': 'mysql'
+	}))
+
+	# Get the config
+	dConf = config.primary({
+		'verbose': False
+	})
+
+	# Init the service, profiling and measuring its requests if enabled
+	oPrimary = Primary()
+	profiler.setup(oPrimary)
+	sMetrics = metrics_.setup(oPrimary)
+
+	# If configured to, build the search index, else it's built by the
+	#	first search
+	search.build()
+
+	# Create the application with the async Primary instance
+	return Application(
+		PrimaryAsync(oPrimary),
+		cors = config.body.rest.allowed(),
+		on_errors = on_errors,
+		verbose = dConf['verbose'],
+		metrics_path = sMetrics
+	)
+
+def main():
+	"""Main
+
+	Starts the ASGI server
+	"""
+
+	# Get the REST config, the service's port is an offset from the default,
+	#	just as it is for the synchronous server
+	dDefault = config.body.rest.default({
+		'host': '0.0.0.0',
+		'port': 9000,
+		'workers': 1
+	})
+	dPrimary = config.body.rest.services.primary({})
+
+	# Run the ASGI server, each worker creates its own application
+	uvicorn.run(
+		'nodes.primary_async:application',
+		factory = True,
+		host = dPrimary.get('host', dDefault['host']),
+		port = dDefault['port'] + dPrimary.get('port', 0),
+		workers = dPrimary.get('workers', dDefault['workers']),
+		timeout_keep_alive = dPrimary.get('timeout', 30)
+	)
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,84 @@
+# coding=utf8
+""" Static
+
+Serves the compiled HTML of static pages directly, in the best encoding the
+client accepts, without going through the JSON service
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Pip imports
+from bottle import abort, request, response
+
+# Project imports
+from . import compress
+from records import static
+from shared import compiler, conditional
+
+def html(key: str) -> bytes | str:
+	"""HTML
+
+	Route handler for GET /static/html/<key>
+
+	Arguments:
+		key (str): The key of the static page
+
+	Returns:
+		bytes | str
+	"""
+
+	# Find the page
+	tPage = page(key, request.get_header('Accept-Encoding', ''))
+	if tPage is None:
+		abort(404)
+
+	# Set the headers
+	response.content_type = 'text/html; charset=utf-8'
+	compress.headers(tPage[0])
+
+	# Return the content
+	return tPage[1]
+
+def page(key: str, accept_encoding: str) -> tuple | None:
+	"""Page
+
+	Returns the encoding and content of a static page, in the best encoding
+	the client accepts, or None if the page doesn't exist. If the client
+	already has the page, the content is empty and the caller should return
+	a 304. The content is always the sanitized version, never the source
+
+	Arguments:
+		key (str): The key of the static page
+		accept_encoding (str): The value of the Accept-Encoding header
+
+	Returns:
+		tuple (str | None, bytes | str) | None
+	"""
+
+	# Find the record, already extended with the compiled content
+	tStatic = static.Cache.tagged(key, 'ui_key')
+	if not tStatic:
+		return None
+
+	# If the client already has it
+	if conditional.check(tStatic[1]):
+		return ( None, '' )
+
+	# The content of the record is always the compiled version of its
+	#	current content
+	bHTML = tStatic[0]['content'].encode('utf-8')
+
+	# If the compressed versions were compiled from the same content, send
+	#	the best encoding the client accepts
+	dCompiled = compiler.artifact(tStatic[0]['_id'])
+	if dCompiled and dCompiled['html'] == bHTML:
+		for sEncoding in compress.accepted(accept_encoding):
+			if sEncoding in dCompiled:
+				return ( sEncoding, dCompiled[sEncoding] )
+
+	# Else, send it as is
+	return ( None, bHTML )
@@ -19,51 +19,93 @@ import record_redis # to enable redis cache
 # Python imports
 from pathlib import Path
 
-# Create the Storage instance
-SkillCategory = Storage(
-
-	# The primary definition
-	jsonb.load(
-		'%s/definitions/skill_category.json' % \
-			Path(__file__).parent.parent.resolve()
-	),
-
-	# The extensions necessary to store the data and revisions in MySQL
-	{
-		# Cache related
-		'__cache__': {
-			'implementation': 'redis',
-			'redis': config.records.cache({
-				'name': 'records',
-				'ttl': 0
-			})
-		},
-
-		# Table related
-		'__mysql__': {
-			'charset': 'utf8mb4',
-			'collate': 'utf8mb4_unicode_ci',
-			'create': [ '_created', '_updated', '_order', 'name' ],
-			'db': config.mysql.db('chrisnasr'),
-			'indexes': {
-				'ui_name': {
-					'fields': 'name',
-					'type': 'unique'
-				}
+# Project imports
+from shared import validator
+from shared.cache import Tiered
+
+def _create() -> Storage:
+	"""Create
+
+	Creates the Storage instance, called by the cache the first time the
+	records are needed
+
+	Returns:
+		Storage
+	"""
+
+	# Create the Storage instance
+	oStorage = Storage(
+
+		# The primary definition
+		jsonb.load(
+			'%s/definitions/skill_category.json' % \
+				Path(__file__).parent.parent.resolve()
+		),
+
+		# The extensions necessary to store the data and revisions in MySQL
+		{
+			# Cache related
+			'__cache__': {
+				'implementation': 'redis',
+				'redis': config.records.cache({
+					'name': 'records',
+					'ttl': 0
+				})
+			},
+
+			# Table related
+			'__mysql__': {
+				'charset': 'utf8mb4',
+				'collate': 'utf8mb4_unicode_ci',
+				'create': [ '_created', '_updated', '_order', 'name' ],
+				'db': config.mysql.db('chrisnasr'),
+				'indexes': {
+					'ui_name': {
+						'fields': 'name',
+						'type': 'unique'
+					}
+				},
+				'name': 'skill_category',
+				'revisions': [ 'user' ]
 			},
-			'name': 'skill_category',
-			'revisions': [ 'user' ]
-		},
-
-		# Field related
-		'_created': { '__mysql__': {
-			'opts': 'not null default CURRENT_TIMESTAMP'
-		} },
-		'_updated': { '__mysql__': {
-			'opts': 'not null default CURRENT_TIMESTAMP on update CURRENT_TIMESTAMP'
-		} },
-		'_order': { '__mysql__': {
-			"type": "tinyint unsigned"
-		} }
-	}
-)
\ No newline at end of file
+
+			# Field related
+			'_created': { '__mysql__': {
+				'opts': 'not null default CURRENT_TIMESTAMP'
+			} },
+			'_updated': { '__mysql__': {
+				'opts': 'not null default CURRENT_TIMESTAMP on update CURRENT_TIMESTAMP'
+			} },
+			'_order': { '__mysql__': {
+				"type": "tinyint unsigned"
+			} }
+		}
+	)
+
+	# Validate records with the compiled definition instead of the generic
+	#	nodes
+	validator.install(oStorage)
+
+	# Return the instance
+	return oStorage
+
+# Create the in-process cache in front of the Storage, which isn't created
+#	until it's first needed
+Cache = Tiered('skill_category', _create, 'name')
+
+def __getattr__(name: str) -> any:
+	"""Get Attribute
+
+	Returns the Storage instance as `SkillCategory`, creating it on first
+	access, after which it's a regular attribute of the module
+
+	Arguments:
+		name (str): The name of the attribute
+
+	Returns:
+		Storage
+	"""
+	if name == 'SkillCategory':
+		globals()[name] = Cache.storage
+		return Cache.storage
+	raise AttributeError('module %r has no attribute %r' % (__name__, name))
@@ -19,55 +19,105 @@ import record_redis # to enable redis cache
 # Python imports
 from pathlib import Path
 
-# Create the Storage instance
-Static = Storage(
-
-	# The primary definition
-	jsonb.load(
-		'%s/definitions/static.json' % \
-			Path(__file__).parent.parent.resolve()
-	),
-
-	# The extensions necessary to store the data and revisions in MySQL
-	{
-		# Cache related
-		'__cache__': {
-			'implementation': 'redis',
-			'redis': config.records.cache({
-				'name': 'records',
-				'ttl': 0
-			}),
-			'indexes': { 'ui_key': 'key' }
-		},
-
-		# Table related
-		'__mysql__': {
-			'charset': 'utf8mb4',
-			'collate': 'utf8mb4_unicode_ci',
-			'create': [ '_created', '_updated', 'key', 'content' ],
-			'db': config.mysql.db('chrisnasr'),
-			'indexes': {
-				'ui_key': {
-					'fields': 'key',
-					'type': 'unique'
-				}
+# Project imports
+from shared import compiler, validator
+from shared.cache import Tiered
+
+def _create() -> Storage:
+	"""Create
+
+	Creates the Storage instance, called by the cache the first time the
+	records are needed
+
+	Returns:
+		Storage
+	"""
+
+	# Create the Storage instance
+	oStorage = Storage(
+
+		# The primary definition
+		jsonb.load(
+			'%s/definitions/static.json' % \
+				Path(__file__).parent.parent.resolve()
+		),
+
+		# The extensions necessary to store the data and revisions in MySQL
+		{
+			# Cache related
+			'__cache__': {
+				'implementation': 'redis',
+				'redis': config.records.cache({
+					'name': 'records',
+					'ttl': 0
+				}),
+				'indexes': { 'ui_key': 'key' }
+			},
+
+			# Table related
+			'__mysql__': {
+				'charset': 'utf8mb4',
+				'collate': 'utf8mb4_unicode_ci',
+				'create': [ '_created', '_updated', 'key', 'content' ],
+				'db': config.mysql.db('chrisnasr'),
+				'indexes': {
+					'ui_key': {
+						'fields': 'key',
+						'type': 'unique'
+					}
+				},
+				'name': 'static',
+				'revisions': [ 'user' ]
 			},
-			'name': 'static',
-			'revisions': [ 'user' ]
-		},
-
-		# Field related
-		'_created': { '__mysql__': {
-			'opts': 'not null default CURRENT_TIMESTAMP'
-		} },
-		'_updated': { '__mysql__': {
-			'opts': 'not null default CURRENT_TIMESTAMP on update CURRENT_TIMESTAMP'
-		} },
-		'key': { '__mysql__': {
-			'type': "char(16)"
-		} },
-		'content': { '__mysql__': {
-			'type': 'TEXT'
-		} }
-	}
-)
\ No newline at end of file
+
+			# Field related
+			'_created': { '__mysql__': {
+				'opts': 'not null default CURRENT_TIMESTAMP'
+			} },
+			'_updated': { '__mysql__': {
+				'opts': 'not null default CURRENT_TIMESTAMP on update CURRENT_TIMESTAMP'
+			} },
+			'key': { '__mysql__': {
+				'type': "char(16)"
+			} },
+			'content': { '__mysql__': {
+				'type': 'TEXT'
+			} }
+		}
+	)
+
+	# Validate records with the compiled definition instead of the generic
+	#	nodes
+	validator.install(oStorage)
+
+	# Return the instance
+	return oStorage
+
+# Create the in-process cache in front of the Storage, which isn't created
+#	until it's first needed. Single records are served with their compiled
+#	content, and keys that don't exist are rejected without any I/O
+Cache = Tiered(
+	'static',
+	_create,
+	'key',
+	indexes = [ 'ui_key' ],
+	extend = compiler.extend,
+	members = { 'ui_key': 'key' }
+)
+
+def __getattr__(name: str) -> any:
+	"""Get Attribute
+
+	Returns the Storage instance as `Static`, creating it on first access,
+	after which it's a regular attribute of the module
+
+	Arguments:
+		name (str): The name of the attribute
+
+	Returns:
+		Storage
+	"""
+	if name == 'Static':
+		globals()[name] = Cache.storage
+		return Cache.storage
+	raise AttributeError('module %r has no attribute %r' % (__name__, name))
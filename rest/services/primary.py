@@ -18,13 +18,35 @@ from tools import evaluate, without
 import undefined
 
 # Python imports
+from datetime import date
 from operator import itemgetter
 
 # Import records
 from records import experience, skill, skill_category, static
 
+# Project imports
+from shared import aggregate, batch, cache, compiler, conditional, pool, \
+	publish, query, search
+
 REPLACE_ME = '00000000-0000-0000-0000-000000000000'
 
+# Returned when a record was changed by someone else since it was read
+DB_CONFLICT = 1150
+
+def _ordinal(value: any) -> int:
+	"""Ordinal
+
+	Returns the day number of a date, so that days between dates can be
+	summed
+
+	Arguments:
+		value (str): The date, as YYYY-MM-DD
+
+	Returns:
+		int
+	"""
+	return date.fromisoformat(value).toordinal()
+
 class Primary(Service):
 	"""Primary Service class
 
@@ -47,6 +69,658 @@ class Primary(Service):
 		#	until I can be 100% sure Brain 2.0.0 works as expected
 		self._edit = config.primary.allow_editing(True)
 
+		# The skill categories with their skill counts, built once after any
+		#	change to either
+		self._categories_counted = cache.Derived(
+			lambda: self._categories_count(skill_category.Cache.all()),
+			[ skill.Cache, skill_category.Cache ]
+		)
+
+		# The skills grouped by category, built once after any change to
+		#	either
+		self._skills_grouped = cache.Derived(
+			self._skills_grouped_build,
+			[ skill.Cache, skill_category.Cache ]
+		)
+
+		# The aggregates of the skills and experiences, kept up to date with
+		#	every write instead of generated by going through the records.
+		#	The experiences are grouped by whether they're current, those
+		#	that are sum their start days, those that aren't their start and
+		#	end days, so the tenure can be calculated for any day
+		self._aggregates = [
+			( skill.Cache, 'category', aggregate.Aggregate(
+				itemgetter('category'),
+				{ 'level': itemgetter('level'), 'years': itemgetter('years') }
+			) ),
+			( skill.Cache, 'level', aggregate.Aggregate(
+				itemgetter('level'), { 'years': itemgetter('years') }
+			) ),
+			( experience.Cache, 'current', aggregate.Aggregate(
+				lambda d: not d.get('to'),
+				{
+					'from': lambda d: _ordinal(d['from']),
+					'to': lambda d: d.get('to') and _ordinal(d['to']) or 0
+				}
+			) )
+		]
+		for oTier, sName, oAggregate in self._aggregates:
+			oTier.add_aggregate(sName, oAggregate)
+
+		# The full text search index over the experiences, skills, and
+		#	static pages
+		self._search = search.setup([
+			search.Source(
+				'experience',
+				experience.Cache,
+				{ 'title': 2, 'description': 1 },
+				'title'
+			),
+			search.Source('skill', skill.Cache, { 'name': 1 }, 'name'),
+			search.Source(
+				'static',
+				static.Cache,
+				{ 'content': 1 },
+				'key',
+				[ 'content' ]
+			)
+		])
+
+		# If enabled, publish everything the public site reads as static
+		#	files after every write
+		publish.setup({
+			'experiences': lambda: experience.Cache.query(None),
+			'skills': lambda: skill.Cache.query(None),
+			'skills/grouped': self._skills_grouped.get,
+			'skill/categories': self._categories_counted.get
+		}, {
+			'static': lambda: {
+				d['key']: static.Cache.get(d['_id']) \
+				for d in static.Cache.all()
+			}
+		}, [
+			experience.Cache,
+			skill.Cache,
+			skill_category.Cache,
+			static.Cache
+		])
+
+	def _skills_grouped_build(self) -> list:
+		"""Skills Grouped (build)
+
+		Generates the list of categories, in order, each with its list of
+		skills, in order
+
+		Returns:
+			list
+		"""
+
+		# Create the categories, in order, without their skills
+		lCategories = sorted(
+			skill_category.Cache.all(),
+			key = itemgetter('_order')
+		)
+		dCategories = {
+			d['_id']: { '_id': d['_id'], 'name': d['name'], 'skills': [] } \
+			for d in lCategories
+		}
+
+		# Add each skill to its category, in order
+		for d in sorted(skill.Cache.all(), key = itemgetter('_order')):
+			if d['category'] in dCategories:
+				dCategories[d['category']]['skills'].append({
+					'_id': d['_id'],
+					'name': d['name'],
+					'level': d['level'],
+					'years': d['years']
+				})
+
+		# Return the categories in order
+		return [ dCategories[d['_id']] for d in lCategories ]
+
+	def _bulk_create(self,
+		req: jobject,
+		module: any,
+		check: callable = None,
+		after: callable = None
+	) -> Response:
+		"""Bulk Create
+
+		Creates multiple records in one request. Every record is given an ID
+		and checked before anything is written, then they're all added in a
+		single transaction, so either all of them are or none are. The caches
+		are notified once for the batch
+
+		Arguments:
+			req (jobject): Contains data and session if available
+			module (module): The records module with the Storage and Cache
+			check (callable): Optional, called with each record and the prefix
+				of its fields, returns a list of errors
+			after (callable): Optional, called with the IDs and records once
+				they've all been added
+
+		Returns:
+			Services.Response
+		"""
+
+		# Dirty fix until Brain 2.0.0 is checked for issues
+		if not self._edit:
+			return Error(errors.RIGHTS)
+
+		# If we are missing the records
+		if 'records' not in req.data:
+			return Error(errors.DATA_FIELDS, [ [ 'records', 'missing' ] ])
+
+		# If the records are not a list
+		if not isinstance(req.data.records, list) or not req.data.records:
+			return Error(errors.DATA_FIELDS, [ [ 'records', 'invalid' ] ])
+
+		# Give each record an ID, if it doesn't have one, and check every
+		#	record before doing anything
+		oStorage = module.Cache.storage
+		lErrors = []
+		lRecords = []
+		for i, d in enumerate(req.data.records):
+			if not isinstance(d, dict):
+				lErrors.append([ 'records.%d' % i, 'invalid' ])
+				continue
+			dRecord = { '_id': oStorage.uuid(), **d }
+			if not oStorage.valid(dRecord):
+				lErrors.extend([
+					[ 'records.%d.%s' % (i, l[0]), l[1] ] \
+					for l in oStorage.validation_failures
+				])
+			elif check:
+				lErrors.extend(check(dRecord, 'records.%d.' % i))
+			lRecords.append(dRecord)
+		if lErrors:
+			return Error(errors.DATA_FIELDS, lErrors)
+
+		# If any ID was sent more than once
+		lIDs = [ d['_id'] for d in lRecords ]
+		lErrors = self._duplicates(lIDs)
+		if lErrors:
+			return Error(errors.DATA_FIELDS, lErrors)
+
+		# Add them all at once
+		try:
+			batch.add(oStorage, lRecords, { 'user': REPLACE_ME })
+		except RecordDuplicate as e:
+			return Error(errors.DB_DUPLICATE, e.args)
+
+		# Notify the caches once for all of them
+		module.Cache.changed(lIDs)
+
+		# If there's anything else to do
+		if after:
+			after(lIDs, lRecords)
+
+		# Return the IDs
+		return Response(lIDs)
+
+	def _bulk_delete(self,
+		req: jobject,
+		module: any,
+		name: str,
+		check: callable = None,
+		after: callable = None
+	) -> Response:
+		"""Bulk Delete
+
+		Deletes multiple records in one request. Every ID is checked against
+		the cache before anything is removed, then they're all removed in a
+		single transaction, so either all of them are or none are. The caches
+		are notified once for the batch
+
+		Arguments:
+			req (jobject): Contains data and session if available
+			module (module): The records module with the Storage and Cache
+			name (str): The name of the records, used in errors
+			check (callable): Optional, called with the IDs before anything is
+				removed, returns an Error to stop the delete, or None
+			after (callable): Optional, called with the IDs once they've all
+				been removed
+
+		Returns:
+			Services.Response
+		"""
+
+		# Dirty fix until Brain 2.0.0 is checked for issues
+		if not self._edit:
+			return Error(errors.RIGHTS)
+
+		# Check the IDs
+		if '_ids' not in req.data:
+			return Error(errors.DATA_FIELDS, [ [ '_ids', 'missing' ] ])
+		if not isinstance(req.data._ids, list) or not req.data._ids:
+			return Error(errors.DATA_FIELDS, [ [ '_ids', 'invalid' ] ])
+
+		# If any ID was sent more than once
+		lErrors = self._duplicates(req.data._ids, '_ids.%d')
+		if lErrors:
+			return Error(errors.DATA_FIELDS, lErrors)
+
+		# If any of the records don't exist
+		lMissing = module.Cache.missing(req.data._ids)
+		if lMissing:
+			return Error(errors.DB_NO_RECORD, [ lMissing, name ])
+
+		# If there's an additional check and it fails
+		if check:
+			oError = check(req.data._ids)
+			if oError is not None:
+				return oError
+
+		# Delete them all at once, if any were removed since we checked,
+		#	nothing is deleted
+		lMissing = batch.remove(
+			module.Cache.storage,
+			req.data._ids,
+			{ 'user': REPLACE_ME }
+		)
+		if lMissing:
+			return Error(errors.DB_NO_RECORD, [ lMissing, name ])
+
+		# Notify the caches once for all of them
+		module.Cache.changed(req.data._ids)
+
+		# If there's anything else to do
+		if after:
+			after(req.data._ids)
+
+		# Return OK
+		return Response(True)
+
+	def _bulk_fetch(self,
+		module: any,
+		ids: list,
+		name: str
+	) -> tuple:
+		"""Bulk Fetch
+
+		Fetches the record instances for the IDs in one request. Returns an
+		Error and None if any don't exist, else None and the instances by ID
+
+		Arguments:
+			module (module): The records module with the Storage and Cache
+			ids (str[]): The IDs of the records
+			name (str): The name of the records, used in errors
+
+		Returns:
+			tuple (Error | None, dict | None)
+		"""
+
+		# Fetch them all at once
+		lRecords = module.Cache.storage.get(ids) or []
+		dRecords = { o['_id']: o for o in lRecords if o }
+
+		# If any are missing
+		lMissing = [ s for s in ids if s not in dRecords ]
+		if lMissing:
+			return ( Error(errors.DB_NO_RECORD, [ lMissing, name ]), None )
+
+		# Return the records
+		return ( None, dRecords )
+
+	def _conflict(self,
+		record: dict,
+		updated: any,
+		name: str
+	) -> Response | None:
+		"""Conflict
+
+		Compares the last updated timestamp the client saw with the one on the
+		record, and returns an error if the record has been changed since.
+		Whether the client sends it or not, the record is only saved if it
+		still has the timestamp it was fetched with, see _save
+
+		Arguments:
+			record (Record): The current record
+			updated (any): The _updated value sent, or undefined
+			name (str): The name of the record, used in errors
+
+		Returns:
+			Services.Response | None
+		"""
+		if updated is not undefined and updated != record['_updated']:
+			return Error(
+				DB_CONFLICT,
+				[ record['_id'], name, record['_updated'] ]
+			)
+		return None
+
+	def _bulk_update(self,
+		req: jobject,
+		module: any,
+		name: str,
+		protected: list,
+		check: callable = None,
+		after: callable = None
+	) -> Response:
+		"""Bulk Update
+
+		Updates multiple records in one request. Every record is fetched in a
+		single request and validated before anything is saved, then they're
+		all saved in a single transaction, so either all of them are or none
+		are. Records that were changed since they were fetched, or since the
+		_updated sent, are reported as conflicts. The caches are notified once
+		for the batch
+
+		Arguments:
+			req (jobject): Contains data and session if available
+			module (module): The records module with the Storage and Cache
+			name (str): The name of the records, used in errors
+			protected (str[]): The fields that can't be altered by the user
+			check (callable): Optional, called with each updated record and
+				the prefix of its fields, returns a list of errors
+			after (callable): Optional, called with the updates that had
+				changes, as ( record, previous, changes ) tuples, once
+				they've all been saved
+
+		Returns:
+			Services.Response
+		"""
+
+		# Dirty fix until Brain 2.0.0 is checked for issues
+		if not self._edit:
+			return Error(errors.RIGHTS)
+
+		# If we are missing the records
+		if 'records' not in req.data:
+			return Error(errors.DATA_FIELDS, [ [ 'records', 'missing' ] ])
+
+		# If the records are not a list
+		if not isinstance(req.data.records, list) or not req.data.records:
+			return Error(errors.DATA_FIELDS, [ [ 'records', 'invalid' ] ])
+
+		# Make sure each record is a dict with an ID
+		lErrors = []
+		for i, d in enumerate(req.data.records):
+			if not isinstance(d, dict):
+				lErrors.append([ 'records.%d' % i, 'invalid' ])
+			elif '_id' not in d:
+				lErrors.append([ 'records.%d._id' % i, 'missing' ])
+		if lErrors:
+			return Error(errors.DATA_FIELDS, lErrors)
+
+		# If any record was sent more than once
+		lIDs = [ d['_id'] for d in req.data.records ]
+		lErrors = self._duplicates(lIDs)
+		if lErrors:
+			return Error(errors.DATA_FIELDS, lErrors)
+
+		# Fetch all the records at once
+		oError, dRecords = self._bulk_fetch(module, lIDs, name)
+		if oError is not None:
+			return oError
+
+		# Go through each record and apply the changes
+		lConflicts = []
+		lUpdates = []
+		for i, d in enumerate(req.data.records):
+			oRecord = dRecords[d['_id']]
+
+			# If the record was changed since the client fetched it
+			if '_updated' in d and d['_updated'] != oRecord['_updated']:
+				lConflicts.append([ i, d['_id'], oRecord['_updated'] ])
+				continue
+
+			# Remove any fields found that can't be altered by the user
+			dValues = dict(d)
+			without(dValues, protected, True)
+
+			# Store the previous values, then update the record
+			dPrevious = { k: oRecord[k] for k in dValues if k in oRecord }
+			dChanges = oRecord.update(dValues) or {}
+
+			# Test if the updates are valid
+			if not oRecord.valid():
+				lErrors.extend([
+					[ 'records.%d.%s' % (i, l[0]), l[1] ] \
+					for l in oRecord.errors
+				])
+			elif check:
+				lErrors.extend(check(oRecord, 'records.%d.' % i))
+
+			# Add it to the list
+			lUpdates.append(( oRecord, dPrevious, dChanges ))
+
+		# If anything was changed by someone else, nothing is saved
+		if lConflicts:
+			return Error(DB_CONFLICT, lConflicts)
+
+		# If anything was invalid, nothing is saved
+		if lErrors:
+			return Error(errors.DATA_FIELDS, lErrors)
+
+		# Save the ones with changes all at once
+		lChanged = [ t for t in lUpdates if t[2] ]
+		oError = self._save(module, lChanged, name)
+		if oError is not None:
+			return oError
+
+		# If there's anything else to do
+		if after:
+			after(lChanged)
+
+		# Return the changes by ID
+		return Response({ lIDs[i]: t[2] for i, t in enumerate(lUpdates) })
+
+	def _categories_count(self, records: list) -> list:
+		"""Categories Count
+
+		Returns copies of the skill categories with the count of skills in
+		each added as `skills`
+
+		Arguments:
+			records (dict[]): The skill categories
+
+		Returns:
+			dict[]
+		"""
+		dCounts = skill.Cache.counts('category')
+		return [
+			'_id' in d and { **d, 'skills': dCounts.get(d['_id'], 0) } or d \
+			for d in records
+		]
+
+	def _duplicates(self, ids: list, field: str = 'records.%d._id') -> list:
+		"""Duplicates
+
+		Returns an error for each ID found earlier in the list
+
+		Arguments:
+			ids (str[]): The IDs
+			field (str): Optional, the name of the field of each ID, given its
+				index
+
+		Returns:
+			list
+		"""
+		return [
+			[ field % i, 'duplicate' ] for i, sID in enumerate(ids) \
+			if sID in ids[:i]
+		]
+
+	def _experience_check(self, record: any, prefix: str = 'record.') -> list:
+		"""Experience Check
+
+		Returns an error if the experience has a `to` lower than its `from`
+
+		Arguments:
+			record (dict | Record): The experience to check
+			prefix (str): Optional, added to the field names in the errors
+
+		Returns:
+			list
+		"""
+		if 'to' in record and record['to'] and 'from' in record and \
+			record['to'] < record['from']:
+			return [ [
+				'%sto' % prefix,
+				'if set, must be higher than `from`'
+			] ]
+		return []
+
+	def _skill_categories_referenced(self, ids: list) -> Response | None:
+		"""Skill Categories Referenced
+
+		Returns an Error if any skill is still in one of the categories
+
+		Arguments:
+			ids (str[]): The IDs of the categories
+
+		Returns:
+			Response | None
+		"""
+		dCounts = skill.Cache.counts('category')
+		lReferenced = [ s for s in ids if dCounts.get(s) ]
+		if lReferenced:
+			return Error(
+				errors.DB_REFERENCES,
+				[ lReferenced, 'skill_category', 'skill' ]
+			)
+		return None
+
+	def _reorder(self, req: jobject, module: any, name: str) -> Response:
+		"""Reorder
+
+		Sets the `_order` of each record to its position in the list of IDs
+		sent. Only records whose order actually changes are saved, all in a
+		single transaction, and the caches are notified once for all of them
+
+		Arguments:
+			req (jobject): Contains data and session if available
+			module (module): The records module with the Storage and Cache
+			name (str): The name of the records, used in errors
+
+		Returns:
+			Services.Response
+		"""
+
+		# Dirty fix until Brain 2.0.0 is checked for issues
+		if not self._edit:
+			return Error(errors.RIGHTS)
+
+		# Check the IDs
+		if '_ids' not in req.data:
+			return Error(errors.DATA_FIELDS, [ [ '_ids', 'missing' ] ])
+		if not isinstance(req.data._ids, list) or not req.data._ids or \
+			len(req.data._ids) > 256 or \
+			len(set(req.data._ids)) != len(req.data._ids):
+			return Error(errors.DATA_FIELDS, [ [ '_ids', 'invalid' ] ])
+
+		# If any of the records don't exist
+		lMissing = module.Cache.missing(req.data._ids)
+		if lMissing:
+			return Error(errors.DB_NO_RECORD, [ lMissing, name ])
+
+		# Find the records whose order is changing, using the cache
+		lIDs = [
+			sID for i, sID in enumerate(req.data._ids) \
+			if module.Cache.get(sID)['_order'] != i
+		]
+
+		# If nothing is changing
+		if not lIDs:
+			return Response(False)
+
+		# Fetch them all at once
+		oError, dRecords = self._bulk_fetch(module, lIDs, name)
+		if oError is not None:
+			return oError
+
+		# Set the new order of each one and save them all at once
+		oError = self._save(module, [ (
+			dRecords[sID],
+			{ '_order': dRecords[sID]['_order'] },
+			{ '_order': i }
+		) for i, sID in enumerate(req.data._ids) \
+			if sID in dRecords and dRecords[sID]['_order'] != i ], name)
+		if oError is not None:
+			return oError
+
+		# Return the IDs that changed
+		return Response(lIDs)
+
+	def _save(self, module: any, updates: list, name: str) -> Response | None:
+		"""Save
+
+		Saves the changes to the records in a single transaction, as long as
+		none of them were changed since they were fetched, then notifies the
+		caches once for all of them. Returns an Error if nothing was saved
+
+		Arguments:
+			module (module): The records module with the Storage and Cache
+			updates (list): The record, its previous values, and its changes,
+				as tuples, for each record with changes
+			name (str): The name of the records, used in errors
+
+		Returns:
+			Services.Response | None
+		"""
+
+		# If there's nothing to save
+		if not updates:
+			return None
+
+		# Save them all at once
+		try:
+			lConflicts = batch.save(
+				module.Cache.storage,
+				updates,
+				{ 'user': REPLACE_ME }
+			)
+		except RecordDuplicate as e:
+			return Error(errors.DB_DUPLICATE, e.args)
+
+		# If any were changed since they were fetched, nothing was saved
+		if lConflicts:
+			return Error(DB_CONFLICT, [ lConflicts, name ])
+
+		# Notify the caches once for all of them
+		module.Cache.changed([ t[0]['_id'] for t in updates ])
+
+		# Return no error
+		return None
+
+	def _statics_compile(self, ids: list, records: list) -> None:
+		"""Statics Compile
+
+		Compiles the content of multiple new static pages in the background
+
+		Arguments:
+			ids (str[]): The IDs of the static pages
+			records (list): The records, in the same order
+		"""
+		for i, sID in enumerate(ids):
+			compiler.submit(sID, records[i]['content'])
+
+	def _statics_recompile(self, updates: list) -> None:
+		"""Statics Recompile
+
+		Compiles the new content of multiple updated static pages in the
+		background, the previous compiled content is used until it's done.
+		Pages whose content didn't change are left alone
+
+		Arguments:
+			updates (list): The ( record, previous, changes ) tuples
+		"""
+		for oRecord, _, dChanges in updates:
+			if 'content' in dChanges:
+				compiler.submit(oRecord['_id'], oRecord['content'])
+
+	def _statics_remove(self, ids: list) -> None:
+		"""Statics Remove
+
+		Removes the compiled content of multiple deleted static pages
+
+		Arguments:
+			ids (str[]): The IDs of the static pages
+		"""
+		for sID in ids:
+			compiler.remove(sID)
+
 	def reset(self):
 		"""Reset
 
@@ -57,6 +731,204 @@ class Primary(Service):
 		"""
 		return self
 
+	def aggregates_read(self, req: jobject) -> Response:
+		"""Aggregates (read)
+
+		Returns the summary figures of the skills and experiences, the skills
+		and years in each category and at each level, and the total tenure
+		across every experience. Every figure comes from the aggregates kept
+		up to date as records change, so no records are read
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+
+		# The current tenure depends on the day, so the tag does as well
+		dToday = date.today()
+		lVersions = [
+			experience.Cache.version(),
+			skill.Cache.version(),
+			skill_category.Cache.version()
+		]
+		sTag = None not in lVersions and \
+			conditional.tag('aggregates', *lVersions, dToday.isoformat()) or \
+			None
+
+		# If the client already has them, don't send them again
+		if conditional.check(sTag):
+			return Response(None)
+
+		# Get the aggregates
+		oCategory, oLevel, oCurrent = [ t[2] for t in self._aggregates ]
+		dCategories = skill.Cache.aggregate('category')
+		dLevels = skill.Cache.aggregate('level')
+		dCurrent = experience.Cache.aggregate('current')
+
+		# Add the figures to each category, in order
+		lCategories = []
+		for d in sorted(skill_category.Cache.all(), key = itemgetter('_order')):
+			dSums = oCategory.get(dCategories, d['_id'])
+			lCategories.append({
+				'_id': d['_id'],
+				'name': d['name'],
+				'skills': dSums['count'],
+				'years': dSums['years'],
+				'level': dSums['count'] and \
+					round(dSums['level'] / dSums['count'], 2) or None
+			})
+
+		# Add the figures of each level
+		lLevels = []
+		for iLevel in sorted(dLevels):
+			dSums = oLevel.get(dLevels, iLevel)
+			lLevels.append({
+				'level': iLevel,
+				'skills': dSums['count'],
+				'years': dSums['years']
+			})
+
+		# Calculate the tenure, the days of the past experiences, and those
+		#	of the current ones up to today
+		dPast = oCurrent.get(dCurrent, False)
+		dNow = oCurrent.get(dCurrent, True)
+		iDays = dPast['to'] - dPast['from'] + \
+			dNow['count'] * dToday.toordinal() - dNow['from']
+
+		# Return the figures
+		return Response({
+			'categories': lCategories,
+			'experience': {
+				'count': dPast['count'] + dNow['count'],
+				'current': dNow['count'],
+				'days': iDays,
+				'years': round(iDays / 365.25, 1)
+			},
+			'levels': lLevels,
+			'skills': {
+				'count': sum([ d['skills'] for d in lLevels ]),
+				'years': sum([ d['years'] for d in lLevels ])
+			}
+		})
+
+	def aggregates_verify_read(self, req: jobject) -> Response:
+		"""Aggregates Verify (read)
+
+		Rebuilds every aggregate from all the records in the Storage and
+		returns the differences with the ones kept up to date in the process
+		that handled the request, by tier and aggregate name. Empty lists
+		mean they match. A write made while this runs can show up as a
+		difference, so only differences that are repeated matter
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+
+		# This reads every record, so treat it like a write
+		if not self._edit:
+			return Error(errors.RIGHTS)
+
+		# Compare each aggregate with a new one
+		dRet = {}
+		for oTier, sName, oAggregate in self._aggregates:
+			dRet['%s.%s' % (oTier.name, sName)] = aggregate.diff(
+				oTier.aggregate(sName),
+				oTier.rebuild(sName),
+				oAggregate.fields
+			)
+
+		# Return the differences
+		return Response(dRet)
+
+	def cache_stats_read(self, req: jobject) -> Response:
+		"""Cache Stats (read)
+
+		Returns the hit / miss counters for each tier of the records cache in
+		the current process
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+
+		# Dirty fix until Brain 2.0.0 is checked for issues
+		if not self._edit:
+			return Error(errors.RIGHTS)
+
+		# Return the stats
+		return Response(cache.stats())
+
+	def pool_stats_read(self, req: jobject) -> Response:
+		"""Pool Stats (read)
+
+		Returns the counters of the MySQL connection pools in the current
+		process
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+
+		# Dirty fix until Brain 2.0.0 is checked for issues
+		if not self._edit:
+			return Error(errors.RIGHTS)
+
+		# Return the stats
+		return Response(pool.stats())
+
+	def search_read(self, req: jobject) -> Response:
+		"""Search (read)
+
+		Returns the experiences, skills, and static pages containing every
+		word of the query, best first
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+
+		# Check for the query
+		if 'q' not in req.data:
+			return Error(errors.DATA_FIELDS, [ [ 'q', 'missing' ] ])
+
+		# Check the parameters
+		lErrors = []
+		if not isinstance(req.data.q, str):
+			lErrors.append([ 'q', 'invalid' ])
+		iLimit = req.data.get('limit', 10)
+		if not isinstance(iLimit, int) or isinstance(iLimit, bool) or \
+			not 1 <= iLimit <= search.MAX_LIMIT:
+			lErrors.append([ 'limit', 'invalid' ])
+		iOffset = req.data.get('offset', 0)
+		if not isinstance(iOffset, int) or isinstance(iOffset, bool) or \
+			iOffset < 0:
+			lErrors.append([ 'offset', 'invalid' ])
+		lTypes = req.data.get('types', None)
+		if lTypes is not None and (
+			not isinstance(lTypes, list) or not lTypes or not all([
+				s in [ 'experience', 'skill', 'static' ] for s in lTypes
+			])
+		):
+			lErrors.append([ 'types', 'invalid' ])
+		if lErrors:
+			return Error(errors.DATA_FIELDS, lErrors)
+
+		# Search and return the page of results
+		return Response(
+			self._search.search(req.data.q, iLimit, iOffset, lTypes)
+		)
+
 	def experience_create(self, req: jobject) -> Response:
 		"""Experience (create)
 
@@ -102,6 +974,9 @@ class Primary(Service):
 		except RecordDuplicate as e:
 			return Error(errors.DB_DUPLICATE, e.args)
 
+		# Notify the caches
+		experience.Cache.changed(sID)
+
 		# Return the result
 		return Response(sID)
 
@@ -126,7 +1001,7 @@ class Primary(Service):
 			return Error(errors.DATA_FIELDS, [ [ '_id', 'missing' ] ])
 
 		# If the experience doesn't exist
-		if not experience.Experience.exists(req.data._id):
+		if not experience.Cache.get(req.data._id):
 			return Error(errors.DB_NO_RECORD, [ req.data._id, 'experience' ])
 
 		# Delete the record
@@ -142,6 +1017,9 @@ class Primary(Service):
 				[ req.data._id, 'experience' ]
 			)
 
+		# Notify the caches
+		experience.Cache.changed(req.data._id)
+
 		# Return OK
 		return Response(dRes)
 
@@ -162,15 +1040,19 @@ class Primary(Service):
 			return Error(errors.DATA_FIELDS, [ [ '_id', 'missing' ] ])
 
 		# Fetch the record
-		dExperience = experience.Experience.get(req.data._id, raw = True)
-		if not dExperience:
+		tExperience = experience.Cache.tagged(req.data._id)
+		if not tExperience:
 			return Error(
 				errors.DB_NO_RECORD,
 				[ req.data._id, 'experience' ]
 			)
 
+		# If the client already has it, don't send it again
+		if conditional.check(tExperience[1]):
+			return Response(None)
+
 		# Return the record
-		return Response(dExperience)
+		return Response(tExperience[0])
 
 	def experience_update(self, req: jobject) -> Response:
 		"""Experience (update)
@@ -206,6 +1088,13 @@ class Primary(Service):
 				[ req.data._id, 'experience' ]
 			)
 
+		# If it was changed since the client fetched it
+		oError = self._conflict(
+			oExperience, req.data.get('_updated', undefined), 'experience'
+		)
+		if oError is not None:
+			return oError
+
 		# Remove any fields found that can't be altered by the user
 		without(
 			req.data.record,
@@ -213,8 +1102,9 @@ class Primary(Service):
 			True
 		)
 
-		# Update it using the record data sent
-		dChanges = oExperience.update(req.data.record)
+		# Store the previous values, then update it using the record data sent
+		dPrevious = { k: oExperience[k] for k in req.data.record if k in oExperience }
+		dChanges = oExperience.update(req.data.record) or {}
 
 		# Test if the updates are valid
 		if not oExperience.valid():
@@ -230,19 +1120,52 @@ class Primary(Service):
 					[ [ 'record.to', 'if set, must be higher than `from`' ] ]
 				)
 
-		# Save the record and store the result
-		try:
-			bRes = oExperience.save(revision_info = { 'user' : REPLACE_ME })
-		except RecordDuplicate as e:
-			return Error(errors.DB_DUPLICATE, e.args)
+		# Save it, as long as it wasn't changed since it was fetched
+		oError = self._save(
+			experience,
+			dChanges and [ ( oExperience, dPrevious, dChanges ) ] or [],
+			'experience'
+		)
+		if oError is not None:
+			return oError
 
 		# Return the changes or False
-		return Response(bRes and dChanges or False)
+		return Response(dChanges or False)
+
+	def experiences_create(self, req: jobject) -> Response:
+		"""Experiences (create)
+
+		Creates multiple new experiences in the system
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_create(
+			req,
+			experience,
+			check = self._experience_check
+		)
+
+	def experiences_delete(self, req: jobject) -> Response:
+		"""Experiences (delete)
+
+		Deletes multiple existing experiences from the system
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_delete(req, experience, 'experience')
 
 	def experiences_read(self, req: jobject) -> Response:
 		"""Experiences (read)
 
-		Fetches and returns all existing experiences
+		Fetches and returns existing experiences
 
 		Arguments:
 			req (jobject): Contains data and session if available
@@ -251,14 +1174,40 @@ class Primary(Service):
 			Services.Response
 		"""
 
-		# Request the records
-		lExperience = experience.Experience.get(raw = True)
+		# Parse any fields, filter, sort, cursor, or limit sent
+		try:
+			dQuery = query.parse(req.data, experience.Cache.fields())
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, e.args[0])
+
+		# If the client already has them, don't send them again
+		if conditional.check(experience.Cache.etag(dQuery)):
+			return Response(None)
+
+		# Find and return the records
+		try:
+			return Response(experience.Cache.query(dQuery))
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, e.args[0])
+
+	def experiences_update(self, req: jobject) -> Response:
+		"""Experiences (update)
 
-		# Sort them by name
-		lExperience.sort(key = itemgetter('from'), reverse = True)
+		Updates multiple existing experiences
 
-		# Find and return the experiences
-		return Response(lExperience)
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_update(
+			req,
+			experience,
+			'experience',
+			[ '_id', '_created', '_updated' ],
+			check = self._experience_check
+		)
 
 	def skill_create(self, req: jobject) -> Response:
 		"""Skill (create)
@@ -295,6 +1244,9 @@ class Primary(Service):
 		except RecordDuplicate as e:
 			return Error(errors.DB_DUPLICATE, e.args)
 
+		# Notify the caches
+		skill.Cache.changed(sID)
+
 		# Return the result
 		return Response(sID)
 
@@ -319,7 +1271,7 @@ class Primary(Service):
 			return Error(errors.DATA_FIELDS, [ [ '_id', 'missing' ] ])
 
 		# If the skill doesn't exist
-		if not skill.Skill.exists(req.data._id):
+		if not skill.Cache.get(req.data._id):
 			return Error(errors.DB_NO_RECORD, [ req.data._id, 'skill' ])
 
 		# Delete the record
@@ -335,6 +1287,9 @@ class Primary(Service):
 				[ req.data._id, 'skill' ]
 			)
 
+		# Notify the caches
+		skill.Cache.changed(req.data._id)
+
 		# Return OK
 		return Response(dRes)
 
@@ -355,15 +1310,19 @@ class Primary(Service):
 			return Error(errors.DATA_FIELDS, [ [ '_id', 'missing' ] ])
 
 		# Fetch the record
-		dSkill = skill.Skill.get(req.data._id, raw = True)
-		if not dSkill:
+		tSkill = skill.Cache.tagged(req.data._id)
+		if not tSkill:
 			return Error(
 				errors.DB_NO_RECORD,
 				[ req.data._id, 'skill' ]
 			)
 
+		# If the client already has it, don't send it again
+		if conditional.check(tSkill[1]):
+			return Response(None)
+
 		# Return the record
-		return Response(dSkill)
+		return Response(tSkill[0])
 
 	def skill_update(self, req: jobject) -> Response:
 		"""Skill (update)
@@ -399,6 +1358,13 @@ class Primary(Service):
 				[ req.data._id, 'skill' ]
 			)
 
+		# If it was changed since the client fetched it
+		oError = self._conflict(
+			oSkill, req.data.get('_updated', undefined), 'skill'
+		)
+		if oError is not None:
+			return oError
+
 		# Remove any fields found that can't be altered by the user
 		without(
 			req.data.record,
@@ -406,26 +1372,144 @@ class Primary(Service):
 			True
 		)
 
-		# Update it using the record data sent
-		dChanges = oSkill.update(req.data.record)
+		# Store the previous values, then update it using the record data sent
+		dPrevious = { k: oSkill[k] for k in req.data.record if k in oSkill }
+		dChanges = oSkill.update(req.data.record) or {}
 
 		# Test if the updates are valid
 		if not oSkill.valid():
 			return Error(errors.DATA_FIELDS, oSkill.errors)
 
-		# Save the record and store the result
-		try:
-			bRes = oSkill.save(revision_info = { 'user' : REPLACE_ME })
-		except RecordDuplicate as e:
-			return Error(errors.DB_DUPLICATE, e.args)
+		# Save it, as long as it wasn't changed since it was fetched
+		oError = self._save(
+			skill,
+			dChanges and [ ( oSkill, dPrevious, dChanges ) ] or [],
+			'skill'
+		)
+		if oError is not None:
+			return oError
 
 		# Return the changes or False
-		return Response(bRes and dChanges or False)
+		return Response(dChanges or False)
 
 	def skills_read(self, req: jobject) -> Response:
 		"""Skills (read)
 
-		Fetches and returns all existing skills
+		Fetches and returns existing skills
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+
+		# Parse any fields, filter, sort, cursor, or limit sent
+		try:
+			dQuery = query.parse(req.data, skill.Cache.fields())
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, e.args[0])
+
+		# If the client already has them, don't send them again
+		if conditional.check(skill.Cache.etag(dQuery)):
+			return Response(None)
+
+		# Find and return the records
+		try:
+			return Response(skill.Cache.query(dQuery))
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, e.args[0])
+
+	def skills_create(self, req: jobject) -> Response:
+		"""Skills (create)
+
+		Creates multiple new skills in the system
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_create(req, skill)
+
+	def skills_delete(self, req: jobject) -> Response:
+		"""Skills (delete)
+
+		Deletes multiple existing skills from the system
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_delete(req, skill, 'skill')
+
+	def skills_grouped_read(self, req: jobject) -> Response:
+		"""Skills Grouped (read)
+
+		Fetches and returns all existing skills grouped by their category, with
+		both the categories and skills in order
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+
+		# Generate the tag from the versions of both skills and categories
+		iSkills = skill.Cache.version()
+		iCategories = skill_category.Cache.version()
+		if iSkills is not None and iCategories is not None:
+			sTag = conditional.tag('skills_grouped', iSkills, iCategories)
+		else:
+			sTag = None
+
+		# If the client already has them, don't send them again
+		if conditional.check(sTag):
+			return Response(None)
+
+		# Return the skills
+		return Response(self._skills_grouped.get())
+
+	def skills_reorder_update(self, req: jobject) -> Response:
+		"""Skills Reorder (update)
+
+		Sets the order of multiple existing skills to the order of the IDs
+		sent
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._reorder(req, skill, 'skill')
+
+	def skills_update(self, req: jobject) -> Response:
+		"""Skills (update)
+
+		Updates multiple existing skills
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_update(
+			req,
+			skill,
+			'skill',
+			[ '_id', '_created', '_updated' ]
+		)
+
+	def skill_categories_create(self, req: jobject) -> Response:
+		"""Skill Categories (create)
+
+		Creates multiple new skill categories in the system
 
 		Arguments:
 			req (jobject): Contains data and session if available
@@ -433,20 +1517,31 @@ class Primary(Service):
 		Returns:
 			Services.Response
 		"""
+		return self._bulk_create(req, skill_category)
 
-		# Request the records
-		lSkills = skill.Skill.get(raw = True)
+	def skill_categories_delete(self, req: jobject) -> Response:
+		"""Skill Categories (delete)
 
-		# Sort them by name
-		lSkills.sort(key = itemgetter('name'))
+		Deletes multiple existing skill categories from the system
 
-		# Find and return the skills
-		return Response(lSkills)
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_delete(
+			req,
+			skill_category,
+			'skill_category',
+			check = self._skill_categories_referenced
+		)
 
 	def skill_categories_read(self, req: jobject) -> Response:
 		"""Skill Categories (read)
 
-		Fetches and returns all existing skill categories
+		Fetches and returns existing skill categories, each with the count of
+		skills in it
 
 		Arguments:
 			req (jobject): Contains data and session if available
@@ -455,14 +1550,73 @@ class Primary(Service):
 			Services.Response
 		"""
 
-		# Request the records
-		lCategories = skill_category.SkillCategory.get(raw = True)
+		# Parse any fields, filter, sort, cursor, or limit sent
+		try:
+			dQuery = query.parse(req.data, skill_category.Cache.fields())
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, e.args[0])
 
-		# Sort them by name
-		lCategories.sort(key = itemgetter('name'))
+		# Generate the tag from the versions of both categories and skills, as
+		#	the categories include the count of their skills
+		sTag = skill_category.Cache.etag(dQuery)
+		iSkills = skill.Cache.version()
+		if sTag is not None and iSkills is not None:
+			sTag = conditional.tag(sTag.strip('"'), iSkills)
+		else:
+			sTag = None
 
-		# Find and return the categories
-		return Response(lCategories)
+		# If the client already has them, don't send them again
+		if conditional.check(sTag):
+			return Response(None)
+
+		# If there's no query, return the prebuilt list
+		if not dQuery:
+			return Response(self._categories_counted.get())
+
+		# Find the records
+		try:
+			mRes = skill_category.Cache.query(dQuery)
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, e.args[0])
+
+		# Add the counts and return the records
+		if isinstance(mRes, dict):
+			mRes['records'] = self._categories_count(mRes['records'])
+		else:
+			mRes = self._categories_count(mRes)
+		return Response(mRes)
+
+	def skill_categories_reorder_update(self, req: jobject) -> Response:
+		"""Skill Categories Reorder (update)
+
+		Sets the order of multiple existing skill categories to the order of the IDs
+		sent
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._reorder(req, skill_category, 'skill_category')
+
+	def skill_categories_update(self, req: jobject) -> Response:
+		"""Skill Categories (update)
+
+		Updates multiple existing skill categories
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_update(
+			req,
+			skill_category,
+			'skill_category',
+			[ '_id', '_created', '_updated' ]
+		)
 
 	def skill_category_create(self, req: jobject) -> Response:
 		"""Skill Category (create)
@@ -499,6 +1653,9 @@ class Primary(Service):
 		except RecordDuplicate as e:
 			return Error(errors.DB_DUPLICATE, e.args)
 
+		# Notify the caches
+		skill_category.Cache.changed(sID)
+
 		# Return the result
 		return Response(sID)
 
@@ -523,14 +1680,11 @@ class Primary(Service):
 			return Error(errors.DATA_FIELDS, [ [ '_id', 'missing' ] ])
 
 		# If the skill category doesn't exist
-		if not skill_category.SkillCategory.exists(req.data._id):
+		if not skill_category.Cache.get(req.data._id):
 			return Error(errors.DB_NO_RECORD, [ req.data._id, 'skill_category' ])
 
 		# If there are existing skills with the skill category
-		lSkills = skill.Skill.filter({
-			'category': req.data._id
-		}, raw = [ '_id' ] )
-		if lSkills:
+		if skill.Cache.counts('category').get(req.data._id):
 			return Error(
 				errors.DB_REFERENCES,
 				[ req.data._id, 'skill_category', 'skill' ]
@@ -546,9 +1700,12 @@ class Primary(Service):
 		if dRes == None:
 			return Error(
 				errors.DB_DELETE_FAILED,
-				[ req.data._id, 'sill_category' ]
+				[ req.data._id, 'skill_category' ]
 			)
 
+		# Notify the caches
+		skill_category.Cache.changed(req.data._id)
+
 		# Return OK
 		return Response(dRes)
 
@@ -569,15 +1726,19 @@ class Primary(Service):
 			return Error(errors.DATA_FIELDS, [ [ '_id', 'missing' ] ])
 
 		# Fetch the record
-		dCategory = skill_category.SkillCategory.get(req.data._id, raw = True)
-		if not dCategory:
+		tCategory = skill_category.Cache.tagged(req.data._id)
+		if not tCategory:
 			return Error(
 				errors.DB_NO_RECORD,
 				[ req.data._id, 'skill_category' ]
 			)
 
+		# If the client already has it, don't send it again
+		if conditional.check(tCategory[1]):
+			return Response(None)
+
 		# Return the record
-		return Response(dCategory)
+		return Response(tCategory[0])
 
 	def skill_category_update(self, req: jobject) -> Response:
 		"""Skill Category (update)
@@ -613,6 +1774,13 @@ class Primary(Service):
 				[ req.data._id, 'skill_category' ]
 			)
 
+		# If it was changed since the client fetched it
+		oError = self._conflict(
+			oCategory, req.data.get('_updated', undefined), 'skill_category'
+		)
+		if oError is not None:
+			return oError
+
 		# Remove any fields found that can't be altered by the user
 		without(
 			req.data.record,
@@ -620,21 +1788,25 @@ class Primary(Service):
 			True
 		)
 
-		# Update it using the record data sent
-		dChanges = oCategory.update(req.data.record)
+		# Store the previous values, then update it using the record data sent
+		dPrevious = { k: oCategory[k] for k in req.data.record if k in oCategory }
+		dChanges = oCategory.update(req.data.record) or {}
 
 		# Test if the updates are valid
 		if not oCategory.valid():
 			return Error(errors.DATA_FIELDS, oCategory.errors)
 
-		# Save the record and store the result
-		try:
-			bRes = oCategory.save(revision_info = { 'user' : REPLACE_ME })
-		except RecordDuplicate as e:
-			return Error(errors.DB_DUPLICATE, e.args)
+		# Save it, as long as it wasn't changed since it was fetched
+		oError = self._save(
+			skill_category,
+			dChanges and [ ( oCategory, dPrevious, dChanges ) ] or [],
+			'skill_category'
+		)
+		if oError is not None:
+			return oError
 
 		# Return the changes or False
-		return Response(bRes and dChanges or False)
+		return Response(dChanges or False)
 
 	def static_create(self, req: jobject) -> Response:
 		"""Static (create)
@@ -671,6 +1843,12 @@ class Primary(Service):
 		except RecordDuplicate as e:
 			return Error(errors.DB_DUPLICATE, e.args)
 
+		# Notify the caches
+		static.Cache.changed(sID)
+
+		# Compile the content in the background
+		compiler.submit(sID, req.data.record['content'])
+
 		# Return the result
 		return Response(sID)
 
@@ -695,7 +1873,7 @@ class Primary(Service):
 			return Error(errors.DATA_FIELDS, [ [ '_id', 'missing' ] ])
 
 		# If the static doesn't exist
-		if not static.Static.exists(req.data._id):
+		if not static.Cache.get(req.data._id):
 			return Error(errors.DB_NO_RECORD, [ req.data._id, 'static' ])
 
 		# Delete the record
@@ -711,6 +1889,10 @@ class Primary(Service):
 				[ req.data._id, 'static' ]
 			)
 
+		# Remove the compiled content and notify the caches
+		compiler.remove(req.data._id)
+		static.Cache.changed(req.data._id)
+
 		# Return OK
 		return Response(dRes)
 
@@ -741,16 +1923,16 @@ class Primary(Service):
 			return Error(errors.DATA_FIELDS, [ [ '_id', 'missing' ] ])
 
 		# Fetch the record
-		dStatic = static.Static.get(
-			_id,
-			index = index,
-			raw = True
-		)
-		if not dStatic:
+		tStatic = static.Cache.tagged(_id, index)
+		if not tStatic:
 			return Error(errors.DB_NO_RECORD, [ _id, 'static' ])
 
+		# If the client already has it, don't send it again
+		if conditional.check(tStatic[1]):
+			return Response(None)
+
 		# Return the record
-		return Response(dStatic)
+		return Response(tStatic[0])
 
 	def static_update(self, req: jobject) -> Response:
 		"""Static (update)
@@ -786,6 +1968,13 @@ class Primary(Service):
 				[ req.data._id, 'static' ]
 			)
 
+		# If it was changed since the client fetched it
+		oError = self._conflict(
+			oStatic, req.data.get('_updated', undefined), 'static'
+		)
+		if oError is not None:
+			return oError
+
 		# Remove any fields found that can't be altered by the user
 		without(
 			req.data.record,
@@ -793,26 +1982,70 @@ class Primary(Service):
 			True
 		)
 
-		# Update it using the record data sent
-		dChanges = oStatic.update(req.data.record)
+		# Store the previous values, then update it using the record data sent
+		dPrevious = { k: oStatic[k] for k in req.data.record if k in oStatic }
+		dChanges = oStatic.update(req.data.record) or {}
 
 		# Test if the updates are valid
 		if not oStatic.valid():
 			return Error(errors.DATA_FIELDS, oStatic.errors)
 
-		# Save the record and store the result
-		try:
-			bRes = oStatic.save(revision_info = { 'user' : REPLACE_ME })
-		except RecordDuplicate as e:
-			return Error(errors.DB_DUPLICATE, e.args)
+		# Save it, as long as it wasn't changed since it was fetched
+		oError = self._save(
+			static,
+			dChanges and [ ( oStatic, dPrevious, dChanges ) ] or [],
+			'static'
+		)
+		if oError is not None:
+			return oError
+
+		# If the content changed, compile it in the background, the previous
+		#	compiled content is used until it's done
+		if 'content' in dChanges:
+			compiler.submit(req.data._id, oStatic['content'])
 
 		# Return the changes or False
-		return Response(bRes and dChanges or False)
+		return Response(dChanges or False)
+
+	def statics_create(self, req: jobject) -> Response:
+		"""Statics (create)
+
+		Creates multiple new static pages in the system
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_create(
+			req,
+			static,
+			after = self._statics_compile
+		)
+
+	def statics_delete(self, req: jobject) -> Response:
+		"""Statics (delete)
+
+		Deletes multiple existing static pages from the system
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_delete(
+			req,
+			static,
+			'static',
+			after = self._statics_remove
+		)
 
 	def statics_read(self, req: jobject) -> Response:
 		"""Statics (read)
 
-		Fetches and returns all existing static records
+		Fetches and returns existing static records
 
 		Arguments:
 			req (jobject): Contains data and session if available
@@ -821,11 +2054,37 @@ class Primary(Service):
 			Services.Response
 		"""
 
-		# Request the records
-		lStatic = static.Static.get(raw = True)
+		# Parse any fields, filter, sort, cursor, or limit sent
+		try:
+			dQuery = query.parse(req.data, static.Cache.fields())
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, e.args[0])
 
-		# Sort them by name
-		lStatic.sort(key = itemgetter('key'))
+		# If the client already has them, don't send them again
+		if conditional.check(static.Cache.etag(dQuery)):
+			return Response(None)
 
-		# Find and return the statics
-		return Response(lStatic)
\ No newline at end of file
+		# Find and return the records
+		try:
+			return Response(static.Cache.query(dQuery))
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, e.args[0])
+
+	def statics_update(self, req: jobject) -> Response:
+		"""Statics (update)
+
+		Updates multiple existing static pages
+
+		Arguments:
+			req (jobject): Contains data and session if available
+
+		Returns:
+			Services.Response
+		"""
+		return self._bulk_update(
+			req,
+			static,
+			'static',
+			[ '_id', '_created', '_updated', 'key' ],
+			after = self._statics_recompile
+		)
\ No newline at end of file
@@ -0,0 +1,53 @@
+# coding=utf8
+""" Primary Async Service
+
+Asyncio version of the Primary service, used by the ASGI server
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+
+# Project imports
+from services.primary import Primary
+from shared import pool
+from shared.asynchronous import Async
+
+class PrimaryAsync(Async):
+	"""Primary Async
+
+	Every request method of Primary, e.g. experiences_read, as a coroutine,
+	e.g. await oPrimary.experiences_read(req)
+
+	Extends:
+		Async
+	"""
+
+	def __init__(self, primary: Primary = None):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			primary (Primary): Optional, the synchronous instance to use,
+				one is created if not set
+
+		Returns:
+			PrimaryAsync
+		"""
+
+		# Get the config
+		dConf = config.primary.asynchronous({
+			'threads': 16
+		})
+
+		# Call the parent constructor, returning any pooled MySQL connection
+		#	after each request
+		super().__init__(
+			primary or Primary(), dConf['threads'], pool.release
+		)
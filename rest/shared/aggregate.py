@@ -0,0 +1,122 @@
+# coding=utf8
+""" Aggregate
+
+Sums of values of the records by group, kept up to date one record at a time
+as records are added, changed, and removed, so that reading them never needs
+a scan of the records
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+class Aggregate(object):
+	"""Aggregate
+
+	Describes how records are grouped and which values are summed for each
+	group. The state is a dict of group to the list of the count of records
+	followed by each of the sums, in the order of `fields`. Only sums are
+	kept as they can be undone exactly when a record is removed, a minimum or
+	maximum could not be
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, group: callable, values: dict = None):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			group (callable): Returns the group of a record
+			values (dict): Optional, functions returning the integer values
+				to sum by their names
+
+		Returns:
+			Aggregate
+		"""
+		self._group = group
+		self._values = list((values or {}).values())
+		self.fields = [ 'count' ] + list((values or {}).keys())
+
+	def add(self, state: dict, record: dict, step: int) -> None:
+		"""Add
+
+		Adds the record to the state, or removes it if the step is -1. Groups
+		left with no records are removed
+
+		Arguments:
+			state (dict): The state to change
+			record (dict): The record
+			step (int): 1 to add the record, -1 to remove it
+		"""
+		m = self._group(record)
+		try:
+			lSums = state[m]
+		except KeyError:
+			lSums = state[m] = [ 0 ] * len(self.fields)
+		lSums[0] += step
+		for i, f in enumerate(self._values, 1):
+			lSums[i] += step * f(record)
+		if not lSums[0]:
+			del state[m]
+
+	def build(self, records: list) -> dict:
+		"""Build
+
+		Returns a new state made from every record
+
+		Arguments:
+			records (dict[]): The records
+
+		Returns:
+			dict
+		"""
+		dState = {}
+		for d in records:
+			self.add(dState, d, 1)
+		return dState
+
+	def get(self, state: dict, group: any) -> dict:
+		"""Get
+
+		Returns the count and sums of a group by name, all zero if the group
+		has no records
+
+		Arguments:
+			state (dict): The state
+			group (any): The group
+
+		Returns:
+			dict
+		"""
+		return dict(zip(
+			self.fields, state.get(group) or [ 0 ] * len(self.fields)
+		))
+
+def diff(current: dict, rebuilt: dict, fields: list) -> list:
+	"""Diff
+
+	Returns every difference between two states of the same aggregate, one
+	per group and field, as [ group, field, current value, rebuilt value ]
+
+	Arguments:
+		current (dict): The state kept up to date incrementally
+		rebuilt (dict): The state built from every record
+		fields (str[]): The fields of the aggregate
+
+	Returns:
+		list[]
+	"""
+	lRet = []
+	lZero = [ 0 ] * len(fields)
+	for m in sorted(set(current) | set(rebuilt), key = str):
+		lCurrent = current.get(m, lZero)
+		lRebuilt = rebuilt.get(m, lZero)
+		for i, sField in enumerate(fields):
+			if lCurrent[i] != lRebuilt[i]:
+				lRet.append([ m, sField, lCurrent[i], lRebuilt[i] ])
+	return lRet
@@ -0,0 +1,171 @@
+# coding=utf8
+""" Asynchronous
+
+Wraps a synchronous service so that its request methods can be awaited from
+an event loop. Each call runs in a bounded pool of threads, so a slow MySQL
+or Redis call only holds up the request that made it
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+# Constants
+ACTIONS = [ 'create', 'delete', 'read', 'update' ]
+
+class Async(object):
+	"""Async
+
+	Exposes every request method of the wrapped instance, those ending in
+	_create, _delete, _read, or _update, as a coroutine with the same name
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		instance: object,
+		threads: int = 16,
+		after: callable = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			instance (object): The synchronous service instance
+			threads (int): The maximum number of requests run at once
+			after (callable): Optional, called with no arguments in the
+				thread after each request
+
+		Returns:
+			Async
+		"""
+
+		# Store the instance
+		self._instance = instance
+		self._after = after
+
+		# Create the pool the requests are run in
+		self._pool = ThreadPoolExecutor(threads, 'async')
+
+		# Find all the request methods
+		self._methods = {}
+		for sName in dir(instance):
+			if sName.startswith('_') or \
+				sName.rpartition('_')[2] not in ACTIONS:
+				continue
+			fMethod = getattr(instance, sName)
+			if callable(fMethod):
+				self._methods[sName] = fMethod
+
+	def __getattr__(self, name: str) -> callable:
+		"""Get Attribute
+
+		Returns the coroutine function for the named request method
+
+		Arguments:
+			name (str): The name of the method
+
+		Raises:
+			AttributeError
+
+		Returns:
+			callable
+		"""
+
+		# If it's not a request method
+		if name.startswith('_') or name not in self._methods:
+			raise AttributeError(name)
+
+		# Create the coroutine function and store it so it's only created once
+		fMethod = self._methods[name]
+		async def method(req: any) -> any:
+			return await self.call(fMethod, req)
+		method.__name__ = name
+		setattr(self, name, method)
+
+		# Return it
+		return method
+
+	async def call(self, method: callable, req: any) -> any:
+		"""Call
+
+		Runs the method in the pool and returns its result. The method runs in
+		a copy of the current context, and any context variables it sets are
+		copied back once it's done, so that it behaves as if it was called
+		directly
+
+		Arguments:
+			method (callable): The synchronous method
+			req (any): The request passed to the method
+
+		Returns:
+			any
+		"""
+
+		# Run the method in a copy of the context
+		oContext = copy_context()
+		try:
+			return await asyncio.get_running_loop().run_in_executor(
+				self._pool, oContext.run, self._run, method, req
+			)
+
+		# Bring back anything it changed
+		finally:
+			for oVar, mValue in oContext.items():
+				oVar.set(mValue)
+
+	def _run(self, method: callable, req: any) -> any:
+		"""Run
+
+		Calls the method, then the after callback, in the thread
+
+		Arguments:
+			method (callable): The synchronous method
+			req (any): The request passed to the method
+
+		Returns:
+			any
+		"""
+		try:
+			return method(req)
+		finally:
+			if self._after:
+				self._after()
+
+	@property
+	def instance(self) -> object:
+		"""Instance
+
+		Returns the synchronous instance being wrapped
+
+		Returns:
+			object
+		"""
+		return self._instance
+
+	@property
+	def methods(self) -> list:
+		"""Methods
+
+		Returns the names of the request methods
+
+		Returns:
+			str[]
+		"""
+		return sorted(self._methods.keys())
+
+	def shutdown(self) -> None:
+		"""Shutdown
+
+		Waits for any running requests and stops the threads
+		"""
+		self._pool.shutdown(wait = True)
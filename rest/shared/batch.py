@@ -0,0 +1,341 @@
+# coding=utf8
+""" Batch
+
+Writes many records of a Storage as a single MySQL transaction on one
+connection, with the revisions of all of them added in one statement. If any
+statement fails the transaction is rolled back, so either every record is
+written or none are
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+import jsonb
+from record.exceptions import RecordDuplicate
+from record_mysql import server
+from record_mysql.table import escape, Literal
+import undefined
+
+# Python imports
+from contextlib import contextmanager
+
+# Pip imports
+import pymysql
+
+class _Rollback(Exception):
+	"""Rollback
+
+	Raised inside a transaction to roll it back without it being an error
+	"""
+	pass
+
+def _revisions(storage: any, rows: list, info: dict) -> str | None:
+	"""Revisions
+
+	Returns the single INSERT statement that adds the revisions of every row,
+	or None if the Storage doesn't keep revisions
+
+	Arguments:
+		storage (Storage): The Storage the records are in
+		rows (list): The ID and the changes of each record, as tuples
+		info (dict): The additional information stored with each revision
+
+	Returns:
+		str | None
+	"""
+
+	# If there's no revisions, there's nothing to do
+	oTable = storage._parent._table
+	oStruct = oTable._struct
+	if not oStruct.revisions:
+		return None
+
+	# Get the fields required in each revision
+	dInfo = isinstance(oStruct.revisions, list) and \
+		{ f: info[f] for f in oStruct.revisions } or {}
+
+	# Generate and return the INSERT statement
+	return 'INSERT INTO `%s`.`%s_revisions` (`%s`, `created`, `items`) ' \
+			'VALUES %s' % (
+				oStruct.db,
+				oStruct.name,
+				oStruct.key,
+				', '.join([
+					'(%s, CURRENT_TIMESTAMP, \'%s\')' % (
+						escape(oTable._columns[oStruct.key], sID, oStruct.host),
+						server.escape(
+							jsonb.encode({ **dItems, **dInfo }),
+							oStruct.host
+						)
+					) for sID, dItems in rows
+				])
+			)
+
+@contextmanager
+def _transaction(host: str):
+	"""Transaction
+
+	Starts a transaction on the connection record_mysql uses for the host,
+	which is the thread's own if the connections are pooled, and yields a
+	cursor. The transaction is committed when the block is done, and rolled
+	back if anything is raised
+
+	Arguments:
+		host (str): The name of the host
+
+	Raises:
+		RecordDuplicate
+
+	Returns:
+		pymysql.cursors.DictCursor
+	"""
+
+	# Get the connection and start the transaction
+	oCon = server._connection(host)
+	oCon.begin()
+	oCursor = oCon.cursor(pymysql.cursors.DictCursor)
+
+	# Run the block, and commit it
+	try:
+		yield oCursor
+		oCon.commit()
+
+	# If we were asked to, roll it back
+	except _Rollback:
+		oCon.rollback()
+
+	# If a unique index was hit, roll it back and raise the same exception
+	#	record_mysql would
+	except pymysql.err.IntegrityError as e:
+		oCon.rollback()
+		oMatch = server.DUP_ENTRY_REGEX.match(e.args[1])
+		if oMatch:
+			raise RecordDuplicate(oMatch.group(1), oMatch.group(2))
+		raise RecordDuplicate(e.args[0], e.args[1])
+
+	# If anything else failed, roll it back and let it through
+	except BaseException:
+		oCon.rollback()
+		raise
+
+	# Always close the cursor
+	finally:
+		oCursor.close()
+
+def add(storage: any, records: list, revision_info: dict) -> None:
+	"""Add
+
+	Inserts the records, which must already have their IDs and be valid,
+	in one statement, and their revisions in another
+
+	Arguments:
+		storage (Storage): The Storage to add the records to
+		records (dict[]): The records to add
+		revision_info (dict): The additional information stored with each
+			revision
+
+	Raises:
+		RecordDuplicate
+	"""
+
+	# Get the table and the fields set in any of the records
+	oTable = storage._parent._table
+	oStruct = oTable._struct
+	lFields = [ f for f in oTable._columns if any([ f in d for d in records ]) ]
+
+	# Generate the INSERT statement, any field not set in a record gets its
+	#	default
+	sInsert = 'INSERT INTO `%s`.`%s` (%s) VALUES %s' % (
+		oStruct.db,
+		oStruct.name,
+		', '.join([ '`%s`' % f for f in lFields ]),
+		', '.join([
+			'(%s)' % ', '.join([
+				f in d and escape(oTable._columns[f], d[f], oStruct.host) or \
+					'DEFAULT' \
+				for f in lFields
+			]) for d in records
+		])
+	)
+
+	# Generate the revisions
+	sRevisions = _revisions(
+		storage,
+		[ ( d[oStruct.key], { 'old': None, 'new': d } ) for d in records ],
+		revision_info
+	)
+
+	# Add them all at once
+	with _transaction(oStruct.host) as oCursor:
+		oCursor.execute(sInsert)
+		if sRevisions:
+			oCursor.execute(sRevisions)
+
+def remove(storage: any, ids: list, revision_info: dict) -> list:
+	"""Remove
+
+	Deletes the records in one statement, and adds their revisions in
+	another. The records are locked and read first, and if any of them no
+	longer exist, nothing is deleted and the IDs of the missing ones are
+	returned
+
+	Arguments:
+		storage (Storage): The Storage to remove the records from
+		ids (str[]): The IDs of the records
+		revision_info (dict): The additional information stored with each
+			revision
+
+	Returns:
+		str[]
+	"""
+
+	# Get the table
+	oTable = storage._parent._table
+	oStruct = oTable._struct
+
+	# Init the missing IDs
+	lMissing = []
+
+	# Start the transaction
+	with _transaction(oStruct.host) as oCursor:
+
+		# Lock the records, and get them for the revisions
+		oCursor.execute('%s FOR UPDATE' % oTable._select(
+			fields = list(oTable._columns.keys()),
+			where = { oStruct.key: ids }
+		))
+		dRecords = { d[oStruct.key]: d for d in oCursor.fetchall() }
+
+		# If any are missing, delete nothing
+		lMissing = [ s for s in ids if s not in dRecords ]
+		if lMissing:
+			raise _Rollback()
+
+		# Delete them and add the revisions
+		oCursor.execute(oTable._delete({ oStruct.key: ids }))
+		sRevisions = _revisions(
+			storage,
+			[ ( s, { 'old': dRecords[s], 'new': None } ) for s in ids ],
+			revision_info
+		)
+		if sRevisions:
+			oCursor.execute(sRevisions)
+
+	# If nothing was deleted, return the missing IDs
+	if lMissing:
+		return lMissing
+
+	# Mark the records as missing in the Storage's cache, just as it would
+	if storage._cache:
+		storage._cache.add_missing(ids)
+
+	# Return no missing IDs
+	return []
+
+def save(storage: any, updates: list, revision_info: dict) -> list:
+	"""Save
+
+	Updates each record only if its _updated is still the one it was
+	fetched with, and adds the revisions of all of them in one statement. If
+	any of the records was changed by someone else since, or removed,
+	nothing is saved and their IDs are returned
+
+	The records are locked and their _updated compared here, not in the
+	UPDATE, as MySQL only counts the rows an UPDATE actually changes, and
+	timestamps compared in SQL depend on the session's time zone. _updated
+	only has a resolution of one second, so a change made in the same
+	second the record was last saved can't be told apart from it, and the
+	later of the two wins
+
+	Arguments:
+		storage (Storage): The Storage the records are in
+		updates (list): The record as it was fetched, the previous values,
+			and the changes, as tuples, for each record with changes
+		revision_info (dict): The additional information stored with each
+			revision
+
+	Raises:
+		RecordDuplicate
+
+	Returns:
+		str[]
+	"""
+
+	# Get the table
+	oTable = storage._parent._table
+	oStruct = oTable._struct
+	oKey = oTable._columns[oStruct.key]
+
+	# Init the conflicts
+	lConflicts = []
+
+	# Start the transaction
+	with _transaction(oStruct.host) as oCursor:
+
+		# Lock the records, and get their _updated, and the time the new one
+		#	will be, as the server sees it so the time zone never matters
+		oCursor.execute(
+			'SELECT `%s`, `_updated`, CURRENT_TIMESTAMP() AS `_now` ' \
+			'FROM `%s`.`%s` WHERE `%s` IN (%s) FOR UPDATE' % (
+				oStruct.key,
+				oStruct.db,
+				oStruct.name,
+				oStruct.key,
+				', '.join([
+					escape(oKey, t[0][oStruct.key], oStruct.host) \
+					for t in updates
+				])
+			)
+		)
+		lRows = oCursor.fetchall()
+		dUpdated = { d[oStruct.key]: d['_updated'] for d in lRows }
+
+		# If any were changed or removed since they were fetched, save nothing
+		lConflicts = [
+			t[0][oStruct.key] for t in updates \
+			if dUpdated.get(t[0][oStruct.key], undefined) != t[0]['_updated']
+		]
+		if lConflicts:
+			raise _Rollback()
+
+		# Update each record, setting _updated to the time we got
+		sNow = lRows[0]['_now']
+		oNow = Literal('\'%s\'' % server.escape(sNow, oStruct.host))
+		for oRecord, _, dChanges in updates:
+			oCursor.execute(oTable._update(
+				{ **dChanges, '_updated': oNow },
+				{ oStruct.key: oRecord[oStruct.key] }
+			))
+
+		# Add the revisions
+		sRevisions = _revisions(storage, [ (
+			oRecord[oStruct.key], {
+				'old': { k: dPrevious.get(k) for k in dChanges },
+				'new': dChanges
+			}
+		) for oRecord, dPrevious, dChanges in updates ], revision_info)
+		if sRevisions:
+			oCursor.execute(sRevisions)
+
+	# If nothing was saved, return the conflicts
+	if lConflicts:
+		return lConflicts
+
+	# Store the new records in the Storage's cache, just as it would, made
+	#	from the records as they were fetched, so they don't have to be
+	#	fetched again
+	if storage._cache:
+		iNow = server._converter_timestamp(sNow)
+		for oRecord, _, dChanges in updates:
+			storage._cache.set(oRecord[oStruct.key], {
+				**{ k: oRecord[k] for k in oTable._columns if k in oRecord },
+				**dChanges,
+				'_updated': iNow
+			})
+
+	# Return no conflicts
+	return []
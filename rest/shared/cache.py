@@ -0,0 +1,1115 @@
+# coding=utf8
+""" Cache
+
+Two tier cache of raw records, a bounded in-process LRU in front of the
+Storage's own redis cache, kept consistent across workers and nodes through
+the records pub/sub channel
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+from record_mysql import Storage
+import undefined
+
+# Python imports
+from bisect import bisect_right
+from hashlib import blake2b
+import json
+from sys import stderr
+from threading import Lock, RLock
+
+# Project imports
+from shared import channel, conditional, metrics, pool, query as _query, \
+	snapshot
+from shared.aggregate import Aggregate
+from shared.flight import Flight
+from shared.lru import LRU
+from shared.view import key_function, Sorted
+
+# Module variables
+_flight = Flight()
+_lru = None
+_lru_lock = Lock()
+_negative = None
+_storages = []
+_tiers = {}
+
+def local() -> LRU:
+	"""Local
+
+	Returns the LRU shared by every tier in the process, creating it on first
+	use
+
+	Returns:
+		LRU
+	"""
+
+	global _lru
+
+	# If we don't have the LRU yet
+	if _lru is None:
+		with _lru_lock:
+			if _lru is None:
+
+				# Get the limits from the config
+				dConf = config.records.local({
+					'max_bytes': 4194304,
+					'max_entries': 4096
+				})
+
+				# Create the instance
+				_lru = LRU(dConf['max_bytes'], dConf['max_entries'])
+
+	# Return the instance
+	return _lru
+
+def negative() -> LRU:
+	"""Negative
+
+	Returns the LRU of records known not to exist, shared by every tier in the
+	process, creating it on first use. It's kept apart from the local LRU so
+	that junk requests can't push out real records
+
+	Returns:
+		LRU
+	"""
+
+	global _negative
+
+	# If we don't have the LRU yet
+	if _negative is None:
+		with _lru_lock:
+			if _negative is None:
+
+				# Get the limit from the config
+				dConf = config.records.negative({
+					'max_entries': 4096
+				})
+
+				# Create the instance, every entry has the same size
+				_negative = LRU(dConf['max_entries'], dConf['max_entries'])
+
+	# Return the instance
+	return _negative
+
+def _received(message: dict | None) -> None:
+	"""Received
+
+	Callback for the records channel, clears whatever the message says is no
+	longer valid
+
+	Arguments:
+		message (dict | None): The message, None if the subscription was
+			(re)made and anything could have changed
+	"""
+
+	# If we have no message, nothing can be trusted
+	if message is None:
+		for o in _tiers.values():
+			o.flush()
+		return
+
+	# If the message is one of ours
+	if message.get('name') not in _tiers:
+		return
+
+	# If only what the records are extended with changed, clear them
+	if message.get('type') == 'refreshed':
+		_tiers[message['name']]._clear(message['ids'])
+
+	# If the records changed, update the tier, then give back any connection
+	#	used to do it, the listener has no request to end
+	elif message.get('type') == 'changed':
+		try:
+			_tiers[message['name']].invalidate(
+				message['ids'], message.get('version')
+			)
+		finally:
+			pool.release()
+
+def measure(value: any) -> tuple:
+	"""Measure
+
+	Returns an estimate of the number of bytes a value takes up, based on its
+	serialised form, which is what will be sent to clients anyway, along with
+	a hash of that form to be used as a tag
+
+	Arguments:
+		value (any): The value to measure
+
+	Returns:
+		tuple (int, str)
+	"""
+	sJSON = json.dumps(value, sort_keys = True, default = str)
+	return (
+		len(sJSON),
+		blake2b(sJSON.encode('utf-8'), digest_size = 8).hexdigest()
+	)
+
+def on_storage(callback: callable) -> None:
+	"""On Storage
+
+	Adds a callback to be called with the name of each tier and its Storage,
+	as the Storage is created, so that nothing has to create them just to
+	alter them. Called right away for any Storage already created
+
+	Arguments:
+		callback (callable): Called with the name and the Storage
+	"""
+	_storages.append(callback)
+	for o in list(_tiers.values()):
+		with o._storage_lock:
+			if o._storage is not None:
+				callback(o._name, o._storage)
+
+def stats() -> dict:
+	"""Stats
+
+	Returns the hit / miss counters for each tier
+
+	Returns:
+		dict
+	"""
+	return {
+		'flight': _flight.stats(),
+		'local': local().stats(),
+		'negative': negative().stats(),
+		'redis': { k: o.redis_stats() for k,o in _tiers.items() }
+	}
+
+def tier(name: str) -> 'Tiered':
+	"""Tier
+
+	Returns the tier with the given name
+
+	Arguments:
+		name (str): The name of the tier
+
+	Returns:
+		Tiered
+	"""
+	return _tiers[name]
+
+class Derived(object):
+	"""Derived
+
+	Holds a value built from the records of one or more tiers. The value is
+	built on first use and kept until one of the tiers changes, so it is
+	built at most once per write
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, build: callable, tiers: list):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			build (callable): Called with no arguments to build the value
+			tiers (Tiered[]): The tiers the value is built from
+
+		Returns:
+			Derived
+		"""
+
+		# Store the builder
+		self._build = build
+
+		# The value, and the generation it belongs to
+		self._value = undefined
+		self._generation = 0
+
+		# The lock
+		self._lock = Lock()
+
+		# Clear the value whenever any of the tiers change
+		for o in tiers:
+			o.watch(self.clear)
+
+	def clear(self) -> None:
+		"""Clear
+
+		Drops the current value so it will be built again on the next get
+		"""
+		with self._lock:
+			self._value = undefined
+			self._generation += 1
+
+	def get(self) -> any:
+		"""Get
+
+		Returns the value, building it if necessary
+
+		Returns:
+			any
+		"""
+
+		# If we have a value, return it
+		mValue = self._value
+		if mValue is not undefined:
+			return mValue
+
+		# Note the generation, then build the value
+		iGeneration = self._generation
+		mValue = self._build()
+
+		# Only keep it if nothing changed while we were building it
+		with self._lock:
+			if iGeneration == self._generation:
+				self._value = mValue
+
+		# Return the value
+		return mValue
+
+class Tiered(object):
+	"""Tiered
+
+	Wraps a Storage instance so that raw reads are first looked up in the
+	process, and only then in redis / mysql via the Storage. The full list of
+	records is kept as a sorted view which is updated record by record
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		name: str,
+		storage: any,
+		sort: str,
+		reverse: bool = False,
+		indexes: list = None,
+		extend: callable = None,
+		members: dict = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			name (str): The unique name of the tier, used in messages
+			storage (Storage | callable): The Storage instance to fetch records
+				from, or a function returning it, called the first time it's
+				needed so that creating the tier costs nothing
+			sort (str): The field the list of all records is ordered by
+			reverse (bool): Optional, set to order the list descending
+			indexes (list): Optional, the names of cache indexes records can
+				be fetched by
+			extend (callable): Optional, called with each single record
+				before it's stored locally, returns the record to store
+			members (dict): Optional, index names to the field they're
+				made of. The values of each field are kept in a set so
+				that lookups of values that don't exist need no I/O
+
+		Returns:
+			Tiered
+		"""
+
+		# Store the arguments
+		self._name = name
+		self._indexes = indexes or []
+		self._extend = extend
+
+		# The Storage, or the function to create it when it's first needed
+		if callable(storage):
+			self._create = storage
+			self._storage = None
+		else:
+			self._create = None
+			self._storage = storage
+		self._storage_lock = Lock()
+
+		# The sorted view of all records
+		self._view = Sorted(sort, reverse)
+
+		# Callbacks to notify of any change, and those that want the IDs
+		self._watchers = []
+		self._watchers_ids = []
+
+		# Callbacks to notify of writes made by this process
+		self._writers = []
+
+		# Counts of records by the value of a field, by field
+		self._counts = {}
+		self._counts_lock = RLock()
+
+		# The aggregates of the records, and their states, by name
+		self._aggregates = {}
+		self._sums = {}
+
+		# The generation of the shared snapshot the view was loaded from
+		self._shared = None
+
+		# The version of the records, shared by every process
+		self._version = None
+
+		# The generation of the local entries, changed by every invalidation
+		#	so that loads started before one don't store what they fetched
+		self._generation = 0
+		self._generation_lock = Lock()
+
+		# Redis counters
+		self._redis = { 'hits': 0, 'misses': 0 }
+
+		# The labels of the lookups counted by the metrics
+		self._lookups = {
+			'%s_%s' % (sLevel, sResult): (
+				( 'tier', name ), ( 'level', sLevel ), ( 'result', sResult )
+			) for sLevel in [ 'local', 'members', 'negative', 'redis' ] \
+				for sResult in [ 'hit', 'miss' ]
+		}
+
+		# If we have the Storage already, count the redis hits and misses by
+		#	wrapping its cache
+		if self._storage is not None:
+			self._count_redis(self._storage)
+
+		# The sets of the existing values of the member indexes, rebuilt
+		#	after any change
+		self._members = {
+			k: Derived(
+				lambda f = f: frozenset([ d.get(f) for d in self.all() ]),
+				[ self ]
+			) for k, f in (members or {}).items()
+		}
+
+		# Add it to the module so messages can find it
+		_tiers[name] = self
+
+	def _clear(self, ids: list) -> None:
+		"""Clear
+
+		Starts a new generation, then removes the local entries associated
+		with the IDs, and every index entry, as the previous index values of
+		the records aren't known
+
+		Arguments:
+			ids (str[]): The IDs of the records
+		"""
+		with self._generation_lock:
+			self._generation += 1
+		lIDs = set(ids)
+		local().delete_if(lambda k: k[0] == self._name and (
+			k[1] != '_id' or k[2] in lIDs
+		))
+		negative().delete_if(lambda k: k[0] == self._name and k[2] in lIDs)
+
+	def _count(self, record: dict | None, step: int) -> None:
+		"""Count
+
+		Adds the step to the count of the record's value for each field being
+		counted, and to the state of each aggregate. The counts lock must
+		already be held
+
+		Arguments:
+			record (dict | None): The record, None to do nothing
+			step (int): 1 to add the record, -1 to remove it
+		"""
+		if record:
+			for sField, dCounts in self._counts.items():
+				m = record.get(sField)
+				dCounts[m] = dCounts.get(m, 0) + step
+				if not dCounts[m]:
+					del dCounts[m]
+			for sName, dState in self._sums.items():
+				self._aggregates[sName].add(dState, record, step)
+
+	def _count_redis(self, storage: Storage) -> None:
+		"""Count Redis
+
+		Wraps the fetch method of the Storage's cache, if it has one, in order
+		to count how often the second tier is hit or missed
+
+		Arguments:
+			storage (Storage): The Storage instance
+		"""
+
+		# If the Storage has no cache, there's nothing to count
+		oCache = getattr(storage, '_cache', None)
+		if not oCache or not hasattr(oCache, 'fetch'):
+			return
+
+		# Keep the original
+		fFetch = oCache.fetch
+
+		# Create the wrapper
+		def fetch(*args, **kwargs):
+			mRes = fFetch(*args, **kwargs)
+			lRes = isinstance(mRes, list) and mRes or [ mRes ]
+			for m in lRes:
+				self._redis[m and 'hits' or 'misses'] += 1
+				metrics.count(
+					'cache_lookups_total',
+					self._lookups[m and 'redis_hit' or 'redis_miss']
+				)
+			return mRes
+
+		# Replace it
+		oCache.fetch = fetch
+
+	def _load(self) -> list:
+		"""Load
+
+		Fetches every record and loads them into the sorted view, unless
+		another thread did it while we waited
+
+		Returns:
+			list
+		"""
+		lRecords = self._view.records
+		if lRecords is None:
+			lRecords = self._view.load(self.storage.get(raw = True))
+		return lRecords
+
+	def _records(self) -> list:
+		"""Records
+
+		Returns the records in the sorted view. If the master process has
+		published a newer snapshot, the view is loaded from it, else if the
+		view isn't loaded, every record is fetched from the Storage once
+
+		Returns:
+			list
+		"""
+
+		# If there's a snapshot we haven't loaded yet
+		lRecords = self._view.records
+		iShared = snapshot.generation()
+		tShared = iShared and iShared != self._shared and \
+			snapshot.get(self._name)
+		if tShared and tShared[0] != self._shared:
+
+			# Only use it if it's not older than what we already have, which
+			#	it can be right after one of our own writes
+			iVersion = self.version()
+			if iVersion is None or tShared[1] is None or \
+				tShared[1] >= iVersion:
+				with self._counts_lock:
+					lRecords = self._view.load(tShared[2])
+					self._counts = {}
+					self._sums = {}
+					self._shared = tShared[0]
+
+		# If the view isn't loaded, fetch and sort every record once, no
+		#	matter how many threads want them
+		if lRecords is None:
+			lRecords = _flight.do(( self._name, '*' ), self._load)
+
+		# Return the records
+		return lRecords
+
+	def _subscribe(self) -> None:
+		"""Subscribe
+
+		Makes sure the process is listening for changes before anything is
+		stored locally. Called on every read as the process may have forked
+		since the last one
+		"""
+		channel.subscribe(_received)
+
+	def _tag(self, key: tuple, _id: str, index: str) -> tuple | None:
+		"""Tag
+
+		Fetches a single record from the Storage, extends it, and stores it
+		locally along with its tag
+
+		Arguments:
+			key (tuple): The local key of the record
+			_id (str): The ID, or the value of the index
+			index (str): The name of the index to use, or undefined
+
+		Returns:
+			tuple (dict, str) | None
+		"""
+
+		# If another thread stored it while we waited
+		tRecord = local().get(key)
+		if tRecord is not undefined:
+			return tRecord
+
+		# Note the generation, then fetch it from the Storage
+		iGeneration = self._generation
+		dRecord = self.storage.get(_id, index = index, raw = True)
+
+		# If it doesn't exist and it was by ID, remember that, unless it was
+		#	changed while we were fetching it
+		if not dRecord:
+			if index is undefined:
+				with self._generation_lock:
+					if iGeneration == self._generation:
+						negative().set(key, True, 1)
+			return None
+
+		# If we have an extension, let it alter the record
+		if self._extend:
+			dRecord = self._extend(dRecord)
+
+		# Measure it, and store it locally along with its tag, unless it was
+		#	changed while we were fetching it
+		iSize, sHash = measure(dRecord)
+		tRecord = ( dRecord, conditional.tag(self._name, sHash) )
+		with self._generation_lock:
+			if iGeneration == self._generation:
+				local().set(key, tRecord, iSize)
+
+		# Return the record and tag
+		return tRecord
+
+	def add_aggregate(self, name: str, aggregate: Aggregate) -> None:
+		"""Add Aggregate
+
+		Adds an aggregate of the records that is kept up to date as they
+		change, in this process or any other
+
+		Arguments:
+			name (str): The name of the aggregate
+			aggregate (Aggregate): The grouping and values summed
+		"""
+		with self._counts_lock:
+			self._aggregates[name] = aggregate
+			self._sums.pop(name, None)
+
+	def aggregate(self, name: str) -> dict:
+		"""Aggregate
+
+		Returns the state of an aggregate. It's generated from the sorted
+		view the first time it's requested, then kept up to date as records
+		change. The dict returned is shared and must not be modified
+
+		Arguments:
+			name (str): The name of the aggregate
+
+		Returns:
+			dict
+		"""
+
+		# If we already have it, return it
+		dState = self._sums.get(name)
+		if dState is not None:
+			return dState
+
+		# Make sure we are listening
+		self._subscribe()
+
+		# Build it from every record, making sure nothing changes while we do
+		with self._counts_lock:
+			lRecords = self._records()
+			if name not in self._sums:
+				self._sums[name] = self._aggregates[name].build(lRecords)
+			return self._sums[name]
+
+	def all(self) -> list:
+		"""All
+
+		Returns every raw record in the Storage, in order. The list returned
+		is shared and must not be modified
+
+		Returns:
+			list
+		"""
+
+		# Make sure we are listening
+		self._subscribe()
+
+		# Return the records
+		return self._records()
+
+	def changed(self, ids: str | list) -> None:
+		"""Changed
+
+		Called after any write to the Storage. Clears the local values and
+		notifies every other process to do the same
+
+		Arguments:
+			ids (str | list): The ID or IDs of the records added, changed, or
+				removed
+		"""
+
+		# Make sure we have a list
+		if not isinstance(ids, list):
+			ids = [ ids ]
+
+		# Bump the version shared by every process
+		iVersion = channel.counter(self._name, True)
+
+		# Clear locally right away so we can read our own writes
+		self.invalidate(ids, iVersion)
+
+		# Notify everyone else
+		channel.publish({
+			'type': 'changed',
+			'name': self._name,
+			'ids': ids,
+			'version': iVersion
+		})
+
+		# Let anything that follows our writes know
+		for f in self._writers:
+			try:
+				f(ids)
+			except Exception as e:
+				print('%s write callback failed: %s' % (self._name, str(e)),
+					file = stderr)
+
+	def flush(self) -> None:
+		"""Flush
+
+		Removes every local entry associated with the tier. A view loaded from
+		the current snapshot is kept, as the master publishes a new one
+		whenever anything changes
+		"""
+		with self._generation_lock:
+			self._generation += 1
+		local().delete_if(lambda k: k[0] == self._name)
+		negative().delete_if(lambda k: k[0] == self._name)
+		with self._counts_lock:
+			if self._shared is None or self._shared != snapshot.generation():
+				self._view.clear()
+				self._counts = {}
+				self._sums = {}
+				self._shared = None
+		self._version = None
+		for f in self._watchers:
+			f()
+		for f in self._watchers_ids:
+			f(None)
+
+	def counts(self, field: str) -> dict:
+		"""Counts
+
+		Returns the number of records for each value of the field. The counts
+		are generated from the sorted view the first time they're requested,
+		then kept up to date as records change. The dict returned is shared
+		and must not be modified
+
+		Arguments:
+			field (str): The field to count by
+
+		Returns:
+			dict
+		"""
+
+		# If we already have it, return it
+		dCounts = self._counts.get(field)
+		if dCounts is not None:
+			return dCounts
+
+		# Make sure we are listening
+		self._subscribe()
+
+		# Count every record, making sure nothing changes while we do
+		with self._counts_lock:
+			lRecords = self._records()
+			if field not in self._counts:
+				dCounts = {}
+				for d in lRecords:
+					m = d.get(field)
+					dCounts[m] = dCounts.get(m, 0) + 1
+				self._counts[field] = dCounts
+			return self._counts[field]
+
+	def etag(self, query: dict = None) -> str | None:
+		"""ETag
+
+		Returns a tag representing the current version of all the records,
+		or None if the version is unknown
+
+		Arguments:
+			query (dict): Optional, the parsed list parameters, if any
+
+		Returns:
+			str | None
+		"""
+
+		# If we don't know the version, we can't generate a tag
+		iVersion = self.version()
+		if iVersion is None:
+			return None
+
+		# If we have a query, the tag must be unique to it
+		if query:
+			return conditional.tag(self._name, iVersion, _query.digest(query))
+
+		# Return the tag
+		return conditional.tag(self._name, iVersion)
+
+	def fields(self) -> list:
+		"""Fields
+
+		Returns the names of the fields in the records
+
+		Returns:
+			str[]
+		"""
+		return list(self.storage.keys())
+
+	def get(self, _id: str, index: str = undefined) -> dict | None:
+		"""Get
+
+		Returns a single raw record by ID, or by one of the cache indexes
+
+		Arguments:
+			_id (str): The ID, or the value of the index
+			index (str): Optional, the name of the index to use
+
+		Returns:
+			dict | None
+		"""
+		t = self.tagged(_id, index)
+		return t and t[0] or None
+
+	def invalidate(self, ids: list, version: int = None) -> None:
+		"""Invalidate
+
+		Removes the local entries associated with the IDs. As the previous
+		index values of the records aren't known, every index entry is
+		removed. If the sorted view is loaded, each record is fetched again
+		and moved to its new position, or removed if it no longer exists
+
+		Arguments:
+			ids (str[]): The IDs of the records
+			version (int): Optional, the new version of the records
+		"""
+
+		# Clear the local entries
+		self._clear(ids)
+
+		# If the view is loaded, update it, along with any counts
+		if self._view.loaded:
+			for sID in ids:
+				dRecord = self.storage.get(sID, raw = True)
+				with self._counts_lock:
+					self._count(self._view.get(sID), -1)
+					if dRecord:
+						self._view.upsert(dRecord)
+						self._count(dRecord, 1)
+					else:
+						self._view.remove(sID)
+
+		# Store the new version, or if we don't know it, forget the old one.
+		#	This is done only after the records are updated so that a tag can
+		#	never be newer than the records it's sent with
+		if version is None:
+			self._version = None
+		elif self._version is not None and version > self._version:
+			self._version = version
+
+		# Notify the watchers
+		for f in self._watchers:
+			f()
+		for f in self._watchers_ids:
+			f(ids)
+
+	def missing(self, ids: list) -> list:
+		"""Missing
+
+		Returns the IDs that don't exist, checked against the sorted view
+		instead of the Storage
+
+		Arguments:
+			ids (str[]): The IDs to check
+
+		Returns:
+			str[]
+		"""
+		self.all()
+		return [ s for s in ids if self._view.get(s) is None ]
+
+	@property
+	def name(self) -> str:
+		"""Name
+
+		Returns the unique name of the tier
+
+		Returns:
+			str
+		"""
+		return self._name
+
+	def on_write(self, callback: callable) -> None:
+		"""On Write
+
+		Adds a callback to be notified, with the list of IDs, after every
+		write made by this process. Unlike watch, changes made by other
+		processes are not passed on
+
+		Arguments:
+			callback (callable): The function to call
+		"""
+		if callback not in self._writers:
+			self._writers.append(callback)
+
+	def published(self, generation: int) -> None:
+		"""Published
+
+		Called by the master once it has published a snapshot made from the
+		view, so that workers forked with the view don't load it again
+
+		Arguments:
+			generation (int): The generation of the snapshot
+		"""
+		with self._counts_lock:
+			if self._view.loaded:
+				self._shared = generation
+
+	def query(self, query: dict | None) -> list | dict:
+		"""Query
+
+		Returns the records matching the parsed list parameters. Without a
+		filter, the records come from the sorted view in memory. With one,
+		the filter and the projection are passed on to the Storage so only
+		the matching rows and requested columns are fetched. If a limit or
+		cursor was sent, a dict with the records and the cursor for the next
+		page is returned, else just the list of records
+
+		Arguments:
+			query (dict | None): The parsed list parameters, see shared.query
+
+		Raises:
+			ValueError
+
+		Returns:
+			list | dict
+		"""
+
+		# If there's no query, return everything
+		if not query:
+			return self.all()
+
+		# Get the sort, the default being the order of the view
+		sDefault = '%s%s' % (self._view.reverse and '-' or '', self._view.field)
+		sSort = query.get('sort', sDefault)
+		sField = sSort.lstrip('-')
+		bReverse = sSort.startswith('-')
+
+		# A cursor is only valid for the sort it was generated with
+		if 'cursor' in query and query['cursor'][0] != sSort:
+			raise ValueError([ [ 'cursor', 'invalid' ] ])
+
+		# If we have a filter, let the Storage handle it along with the
+		#	projection, making sure we get what we need to sort
+		lKeys = None
+		if 'filter' in query:
+			mRaw = 'fields' in query and \
+				list(set(query['fields'] + [ sField, '_id' ])) or \
+				True
+			fKey = key_function(sField, bReverse)
+			lRecords = sorted(
+				self.storage.filter(query['filter'], raw = mRaw) or [],
+				key = fKey
+			)
+
+		# Else, if we want the order of the view, use it as is
+		elif sSort == sDefault:
+			lRecords = self.all()
+			fKey = self._view.key
+
+			# If the keys match the records, use them as well
+			tSnapshot = self._view.snapshot
+			if tSnapshot and tSnapshot[0] is lRecords:
+				lKeys = tSnapshot[1]
+
+		# Else, sort the view
+		else:
+			fKey = key_function(sField, bReverse)
+			lRecords = sorted(self.all(), key = fKey)
+
+		# If we have a cursor, start right after it
+		iStart = 0
+		if 'cursor' in query:
+			if lKeys is None:
+				lKeys = [ fKey(d) for d in lRecords ]
+			iStart = bisect_right(lKeys, fKey({
+				sField: query['cursor'][1],
+				'_id': query['cursor'][2]
+			}))
+
+		# Get the page of records
+		if 'limit' in query:
+			iEnd = iStart + query['limit']
+			lPage = lRecords[iStart:iEnd]
+		else:
+			iEnd = len(lRecords)
+			lPage = iStart and lRecords[iStart:] or lRecords
+
+		# Strip any fields not requested
+		lPage = _query.project(lPage, query.get('fields'))
+
+		# If we weren't asked to paginate, return the records as is
+		if 'limit' not in query and 'cursor' not in query:
+			return lPage
+
+		# Return the records and, if there's more, the next cursor
+		return {
+			'records': lPage,
+			'cursor': iEnd < len(lRecords) and _query.cursor_encode(
+				sSort,
+				lRecords[iEnd - 1].get(sField),
+				lRecords[iEnd - 1]['_id']
+			) or None
+		}
+
+	def rebuild(self, name: str) -> dict:
+		"""Rebuild
+
+		Returns a new state of an aggregate built from every record fetched
+		from the Storage, ignoring every local tier, so that it can be
+		compared with the state kept up to date
+
+		Arguments:
+			name (str): The name of the aggregate
+
+		Returns:
+			dict
+		"""
+		return self._aggregates[name].build(self.storage.get(raw = True))
+
+	def redis_stats(self) -> dict:
+		"""Redis Stats
+
+		Returns the counters for the Storage's redis cache
+
+		Returns:
+			dict
+		"""
+		return dict(self._redis)
+
+	def refresh(self, ids: str | list) -> None:
+		"""Refresh
+
+		Called when what the records are extended with has changed, but the
+		records themselves haven't. Clears the local values and notifies every
+		other process to do the same, without changing the version or letting
+		anything that follows the records know
+
+		Arguments:
+			ids (str | list): The ID or IDs of the records
+		"""
+
+		# Make sure we have a list
+		if not isinstance(ids, list):
+			ids = [ ids ]
+
+		# Clear locally right away
+		self._clear(ids)
+
+		# Notify everyone else
+		channel.publish({
+			'type': 'refreshed',
+			'name': self._name,
+			'ids': ids
+		})
+
+	@property
+	def storage(self) -> Storage:
+		"""Storage
+
+		Returns the Storage instance the tier is in front of, creating it the
+		first time if the tier was given a function to do so
+
+		Returns:
+			Storage
+		"""
+
+		# If we don't have it yet
+		if self._storage is None:
+			with self._storage_lock:
+				if self._storage is None:
+
+					# Create it, count its redis hits and misses, and let
+					#	anything else that alters it know, before any other
+					#	thread can use it
+					oStorage = self._create()
+					self._count_redis(oStorage)
+					for f in _storages:
+						f(self._name, oStorage)
+					self._storage = oStorage
+
+		# Return the Storage
+		return self._storage
+
+	def tagged(self, _id: str, index: str = undefined) -> tuple | None:
+		"""Tagged
+
+		Returns a single raw record by ID, or by one of the cache indexes,
+		along with a tag unique to the current version of the record
+
+		Arguments:
+			_id (str): The ID, or the value of the index
+			index (str): Optional, the name of the index to use
+
+		Returns:
+			tuple (dict, str) | None
+		"""
+
+		# Make sure we are listening
+		self._subscribe()
+
+		# If the value can't be a key, it can't exist
+		try:
+			hash(_id)
+		except TypeError:
+			return None
+
+		# Generate the key
+		tKey = (self._name, index is undefined and '_id' or index, _id)
+
+		# Look for it locally
+		tRecord = local().get(tKey)
+		if tRecord is not undefined:
+			metrics.count('cache_lookups_total', self._lookups['local_hit'])
+			return tRecord
+		metrics.count('cache_lookups_total', self._lookups['local_miss'])
+
+		# If the value isn't one of the index's members, it doesn't exist
+		if index is not undefined and index in self._members:
+			if _id not in self._members[index].get():
+				metrics.count(
+					'cache_lookups_total', self._lookups['members_hit']
+				)
+				return None
+
+		# If we already know the ID doesn't exist
+		elif index is undefined and negative().get(tKey) is not undefined:
+			metrics.count('cache_lookups_total', self._lookups['negative_hit'])
+			return None
+
+		# Fetch it, only once no matter how many threads want it
+		return _flight.do(tKey, lambda: self._tag(tKey, _id, index))
+
+	def version(self) -> int | None:
+		"""Version
+
+		Returns the current version of the records, fetching it if we don't
+		already know it. Returns None if it can't be fetched
+
+		Returns:
+			int | None
+		"""
+		if self._version is None:
+			self._subscribe()
+			self._version = channel.counter(self._name)
+		return self._version
+
+	def watch(self, callback: callable, ids: bool = False) -> None:
+		"""Watch
+
+		Adds a callback to be notified whenever any record in the tier
+		changes, in this process or any other
+
+		Arguments:
+			callback (callable): The function to call
+			ids (bool): Optional, if set the callback is passed the list of
+				IDs changed, or None if anything could have changed, else it
+				is passed nothing
+		"""
+		lWatchers = self._watchers_ids if ids else self._watchers
+		if callback not in lWatchers:
+			lWatchers.append(callback)
@@ -0,0 +1,204 @@
+# coding=utf8
+""" Channel
+
+Redis pub/sub channel used to notify every worker on every node that records
+have changed
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+
+# Python imports
+import json
+from os import getpid
+from socket import gethostname
+from sys import stderr
+from threading import Lock, Thread
+from time import sleep
+
+# Pip imports
+from redis import StrictRedis
+
+# Module variables
+_callbacks = []
+_lock = Lock()
+_redis = None
+_thread = None
+
+def _channel() -> str:
+	"""Channel
+
+	Returns the name of the pub/sub channel
+
+	Returns:
+		str
+	"""
+	return config.records.channel('chrisnasr:records')
+
+def _origin() -> str:
+	"""Origin
+
+	Returns a string unique to the current process. It is generated on each
+	call so that workers forked from a master don't share a value
+
+	Returns:
+		str
+	"""
+	return '%s:%d' % (gethostname(), getpid())
+
+def _listen() -> None:
+	"""Listen
+
+	Runs forever in a background thread, passing every message received on
+	the channel to the callbacks. Any time the subscription is (re)made the
+	callbacks are passed None as messages may have been missed
+	"""
+
+	while True:
+		try:
+
+			# Subscribe to the channel
+			oPubSub = connection().pubsub(ignore_subscribe_messages = True)
+			oPubSub.subscribe(_channel())
+
+			# Let everyone know they can't trust what they have
+			for f in _callbacks:
+				f(None)
+
+			# Loop through each message
+			for dMsg in oPubSub.listen():
+
+				# Decode it
+				try:
+					dData = json.loads(dMsg['data'])
+				except (TypeError, ValueError):
+					continue
+
+				# If it came from us, it's already been handled
+				if dData.get('origin') == _origin():
+					continue
+
+				# Pass it along
+				for f in _callbacks:
+					f(dData)
+
+		# If anything goes wrong, wait a moment, then re-subscribe
+		except Exception as e:
+			print('channel listener failed: %s' % str(e), file = stderr)
+			sleep(1)
+
+def connection() -> StrictRedis:
+	"""Connection
+
+	Returns the connection to the records redis server
+
+	Returns:
+		StrictRedis
+	"""
+
+	global _redis
+
+	# If we don't have a connection yet
+	if _redis is None:
+
+		# Get the name of the redis config used by the records
+		sName = config.records.cache({
+			'redis': 'records'
+		})['redis']
+
+		# Create the connection
+		_redis = StrictRedis(**getattr(config.redis, sName)({
+			'host': 'localhost',
+			'port': 6379
+		}))
+
+	# Return the connection
+	return _redis
+
+def counter(name: str, increment: bool = False) -> int | None:
+	"""Counter
+
+	Returns the current value of a counter shared by every process, after
+	incrementing it if requested. Returns None if redis could not be reached
+
+	Arguments:
+		name (str): The name of the counter
+		increment (bool): Optional, set to increment the counter first
+
+	Returns:
+		int | None
+	"""
+
+	# Generate the key
+	sKey = key('counter', name)
+
+	# Increment or fetch the value, but never let a counter break a request
+	try:
+		if increment:
+			return connection().incr(sKey)
+		else:
+			return int(connection().get(sKey) or 0)
+	except Exception as e:
+		print('channel counter failed: %s' % str(e), file = stderr)
+		return None
+
+def key(*parts: str) -> str:
+	"""Key
+
+	Returns a redis key unique to the records, made from the parts
+
+	Arguments:
+		*parts (str): The parts of the key
+
+	Returns:
+		str
+	"""
+	return ':'.join([ _channel() ] + [ str(s) for s in parts ])
+
+def publish(message: dict) -> None:
+	"""Publish
+
+	Sends a message to every other process listening on the channel
+
+	Arguments:
+		message (dict): The data to send
+	"""
+
+	# Mark the message as our own
+	message['origin'] = _origin()
+
+	# Publish it, but never let a notification break a write
+	try:
+		connection().publish(_channel(), json.dumps(message))
+	except Exception as e:
+		print('channel publish failed: %s' % str(e), file = stderr)
+
+def subscribe(callback: callable) -> None:
+	"""Subscribe
+
+	Adds a callback to be notified of messages, and starts the listener
+	thread if it isn't already running. This must not be called before the
+	process forks
+
+	Arguments:
+		callback (callable): Called with the message dict, or None
+	"""
+
+	global _thread
+
+	with _lock:
+
+		# Add the callback
+		if callback not in _callbacks:
+			_callbacks.append(callback)
+
+		# If the thread isn't running in this process
+		if _thread is None or not _thread.is_alive():
+			_thread = Thread(target = _listen, daemon = True)
+			_thread.start()
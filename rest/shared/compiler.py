@@ -0,0 +1,338 @@
+# coding=utf8
+""" Compiler
+
+Compiles static page content in a pool of processes when it's written, and
+stores the result in redis next to the record so that reads never have to
+do any processing
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+import undefined
+
+# Python imports
+from concurrent.futures import Future, ProcessPoolExecutor, \
+	TimeoutError as FutureTimeout
+from multiprocessing import get_context
+from os import getpid
+from sys import stderr
+from threading import Lock
+
+# Project imports
+from shared import cache, channel, html, pool
+
+# Module variables
+_lock = Lock()
+_pending = {}
+_pool = None
+_pool_pid = None
+
+def _conf() -> dict:
+	"""Conf
+
+	Returns the compile config
+
+	Returns:
+		dict
+	"""
+	return config.primary.compile({
+		'processes': 2,
+		'wait': 5,
+		'expire': 60
+	})
+
+def _extended(record: dict, compiled: dict) -> dict:
+	"""Extended
+
+	Returns the record with its content replaced by the compiled version
+
+	Arguments:
+		record (dict): The raw static record
+		compiled (dict): The compiled version
+
+	Returns:
+		dict
+	"""
+	return { **record, 'content': compiled['html'].decode('utf-8') }
+
+def _key(_id: str) -> str:
+	"""Key
+
+	Returns the redis key the compiled version of a record is stored under
+
+	Arguments:
+		_id (str): The ID of the static record
+
+	Returns:
+		str
+	"""
+	return '%s:static:%s' % (
+		config.records.channel('chrisnasr:records'), _id
+	)
+
+def _executor() -> ProcessPoolExecutor:
+	"""Executor
+
+	Returns the process pool, creating it on first use in each process.
+	Children are spawned rather than forked as the parent has threads running
+
+	Returns:
+		ProcessPoolExecutor
+	"""
+
+	global _pool, _pool_pid
+
+	# If we don't have a pool in this process
+	if _pool is None or _pool_pid != getpid():
+		_pool = ProcessPoolExecutor(
+			max_workers = _conf()['processes'],
+			mp_context = get_context('spawn')
+		)
+		_pool_pid = getpid()
+
+	# Return the pool
+	return _pool
+
+def _marked(_id: str) -> str | None:
+	"""Marked
+
+	Returns the hash of the content a process is compiling for a record, or
+	None if none is
+
+	Arguments:
+		_id (str): The ID of the static record
+
+	Returns:
+		str | None
+	"""
+	try:
+		bSource = channel.connection().get('%s:pending' % _key(_id))
+	except Exception as e:
+		print('static compile fetch failed: %s' % str(e), file = stderr)
+		return None
+	return bSource and bSource.decode() or None
+
+def _store(_id: str, compiled: dict) -> bool:
+	"""Store
+
+	Stores a compiled version in redis, replacing whatever was there
+
+	Arguments:
+		_id (str): The ID of the static record
+		compiled (dict): The compiled version
+
+	Returns:
+		bool
+	"""
+	try:
+		oPipe = channel.connection().pipeline()
+		oPipe.delete(_key(_id))
+		oPipe.hset(_key(_id), mapping = compiled)
+		oPipe.execute()
+	except Exception as e:
+		print('static compile store failed: %s' % str(e), file = stderr)
+		return False
+	return True
+
+def _stored(key: tuple, future: Future) -> None:
+	"""Stored
+
+	Called when a compilation is finished, stores the result in redis and
+	has every process drop the record it extended with the previous version.
+	The record itself hasn't changed, so its version is left alone. If it
+	failed, the mark is removed so reads compile it themselves
+
+	Arguments:
+		key (tuple): The ID of the static record and the hash of the content
+		future (Future): The finished compilation
+	"""
+
+	# Whatever happens, it's no longer pending
+	with _lock:
+		_pending.pop(key, None)
+
+	# Get the result, or remove the mark
+	try:
+		dCompiled = future.result()
+	except Exception as e:
+		print('static compile failed: %s' % str(e), file = stderr)
+		remove(key[0], True)
+		dCompiled = None
+
+	# Replace whatever was stored, then let every process know the compiled
+	#	version has changed, giving back any connection used to do it as the
+	#	thread belongs to the pool
+	try:
+		if dCompiled is None or _store(key[0], dCompiled):
+			cache.tier('static').refresh(key[0])
+	finally:
+		pool.release()
+
+def artifact(_id: str) -> dict | None:
+	"""Artifact
+
+	Returns the compiled version of a record, from the process if we have it,
+	else from redis. Returns None if there is no compiled version
+
+	Arguments:
+		_id (str): The ID of the static record
+
+	Returns:
+		dict | None
+	"""
+
+	# Look for it locally
+	tKey = ( 'static', 'compiled', _id )
+	dCompiled = cache.local().get(tKey)
+	if dCompiled is not undefined:
+		return dCompiled
+
+	# Fetch it from redis
+	try:
+		dRaw = channel.connection().hgetall(_key(_id))
+	except Exception as e:
+		print('static compile fetch failed: %s' % str(e), file = stderr)
+		return None
+	if not dRaw:
+		return None
+
+	# Decode the keys and the source hash, leave the rest as bytes
+	dCompiled = { k.decode(): v for k,v in dRaw.items() }
+	dCompiled['source'] = dCompiled['source'].decode()
+
+	# Store it locally
+	cache.local().set(
+		tKey, dCompiled, sum([ len(v) for v in dCompiled.values() ])
+	)
+
+	# Return it
+	return dCompiled
+
+def extend(record: dict) -> dict:
+	"""Extend
+
+	Used by the static tier to replace the content of a record with its
+	compiled version. If the compiled version is of older content, and this
+	process is compiling the current content, it waits for it. If another
+	process is, the previous version is used until it's done. Only if no one
+	is, or it failed, is it compiled here and now. The raw content is never
+	returned
+
+	Arguments:
+		record (dict): The raw static record
+
+	Returns:
+		dict
+	"""
+
+	# Get the compiled version, if it's of the current content, use it
+	dCompiled = artifact(record['_id'])
+	sSource = html.digest(record['content'])
+	if dCompiled and dCompiled['source'] == sSource:
+		return _extended(record, dCompiled)
+
+	# If this process is compiling the current content, wait for it, if it
+	#	takes too long use the previous version
+	oFuture = _pending.get(( record['_id'], sSource ))
+	if oFuture is not None:
+		try:
+			return _extended(record, oFuture.result(_conf()['wait']))
+		except FutureTimeout:
+			if dCompiled:
+				return _extended(record, dCompiled)
+		except Exception:
+			pass
+
+	# Else, if another process is compiling it, use the previous version
+	elif dCompiled and _marked(record['_id']) == sSource:
+		return _extended(record, dCompiled)
+
+	# Compile it now, and store it for every other process. Any error is
+	#	raised so nothing is stored locally
+	dCompiled = html.compile(record['content'])
+	if _store(record['_id'], dCompiled):
+		cache.local().set(
+			( 'static', 'compiled', record['_id'] ),
+			dCompiled,
+			sum([ len(v) for v in dCompiled.values() ])
+		)
+
+	# Return the record with the compiled content
+	return _extended(record, dCompiled)
+
+def remove(_id: str, pending: bool = False) -> None:
+	"""Remove
+
+	Removes the compiled version of a deleted record, and the mark of any
+	compilation of it
+
+	Arguments:
+		_id (str): The ID of the static record
+		pending (bool): Optional, set to only remove the mark
+	"""
+	try:
+		sKey = _key(_id)
+		if pending:
+			channel.connection().delete('%s:pending' % sKey)
+		else:
+			channel.connection().delete(sKey, '%s:pending' % sKey)
+	except Exception as e:
+		print('static compile delete failed: %s' % str(e), file = stderr)
+
+def shutdown() -> None:
+	"""Shutdown
+
+	Stops the process pool of the current process, if it has one, cancelling
+	anything that hasn't started. Only needed by processes that leave without
+	running their exit handlers, or the pool's children are left behind
+	"""
+
+	global _pool
+
+	if _pool is not None and _pool_pid == getpid():
+		_pool.shutdown(cancel_futures = True)
+		_pool = None
+
+def submit(_id: str, content: str) -> None:
+	"""Submit
+
+	Starts compiling the content of a record in the process pool, returns
+	immediately. Every process is told it's being compiled so that they
+	keep using the previous version until it's done
+
+	Arguments:
+		_id (str): The ID of the static record
+		content (str): The source HTML
+	"""
+
+	# Mark it for every other process first, so it can't be finished before
+	#	it's marked
+	tKey = ( _id, html.digest(content) )
+	sPending = '%s:pending' % _key(_id)
+	try:
+		channel.connection().set(sPending, tKey[1], ex = _conf()['expire'])
+	except Exception as e:
+		print('static compile mark failed: %s' % str(e), file = stderr)
+
+	# If the same content is already being compiled, don't bother
+	with _lock:
+		if tKey in _pending:
+			return
+
+		# Start it
+		try:
+			oFuture = _executor().submit(html.compile, content)
+		except Exception as e:
+			print('static compile submit failed: %s' % str(e), file = stderr)
+			remove(_id, True)
+			return
+		_pending[tKey] = oFuture
+
+	# Store it when it's done
+	oFuture.add_done_callback(lambda f: _stored(tKey, f))
@@ -0,0 +1,98 @@
+# coding=utf8
+""" Conditional
+
+Tracks the If-None-Match tags sent with the current request and the ETag
+generated for its response, so that services can skip sending data the
+client already has without knowing anything about HTTP
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from contextvars import ContextVar
+
+# Module variables
+_request = ContextVar('conditional_request', default = None)
+_response = ContextVar('conditional_response', default = None)
+
+def begin(if_none_match: str | None) -> None:
+	"""Begin
+
+	Called before the request is processed with the value of the
+	If-None-Match header, if there was one
+
+	Arguments:
+		if_none_match (str | None): The header value
+	"""
+
+	# Split the header into its individual tags, ignoring the weak prefix
+	if if_none_match:
+		lTags = [
+			s.strip().removeprefix('W/') for s in if_none_match.split(',')
+		]
+		_request.set(set(lTags))
+	else:
+		_request.set(set())
+
+	# Reset the response
+	_response.set(None)
+
+def check(etag: str | None) -> bool:
+	"""Check
+
+	Called by a service with the ETag of the data it's about to return.
+	Returns True if the client already has it, and so the data can be skipped
+
+	Arguments:
+		etag (str | None): The ETag of the data, None if it's unknown
+
+	Returns:
+		bool
+	"""
+
+	# If we aren't in a conditional request, or don't know the tag
+	lTags = _request.get()
+	if lTags is None or etag is None:
+		return False
+
+	# Store the tag and whether it matched
+	bMatch = etag in lTags or '*' in lTags
+	_response.set({ 'etag': etag, 'match': bMatch })
+
+	# Return if it matched
+	return bMatch
+
+def end() -> dict | None:
+	"""End
+
+	Called after the request is processed, returns the ETag and whether it
+	matched, if the service generated one
+
+	Returns:
+		dict | None
+	"""
+
+	# Get the response and reset everything
+	dResponse = _response.get()
+	_request.set(None)
+	_response.set(None)
+
+	# Return the response
+	return dResponse
+
+def tag(*parts: any) -> str:
+	"""Tag
+
+	Generates a quoted ETag from one or more parts
+
+	Arguments:
+		*parts (any): The values that make up the tag
+
+	Returns:
+		str
+	"""
+	return '"%s"' % '-'.join([ str(m) for m in parts ])
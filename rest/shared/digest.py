@@ -0,0 +1,292 @@
+# coding=utf8
+""" Digest
+
+Collects error reports on a bounded queue and sends them from a background
+thread, grouped by fingerprint, as a single digest per window. Nothing that
+adds a report ever waits on the sending of one
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+import atexit
+from collections import deque
+from datetime import datetime
+from hashlib import sha1
+from os import getpid
+from queue import Empty, Full, Queue
+import re
+import sys
+from threading import Lock, Thread
+from time import monotonic, time
+
+# Project imports
+from shared import metrics
+
+# Constants
+_ADDRESS = re.compile(r'0x[0-9a-fA-F]+')
+
+def fingerprint(*parts: str) -> str:
+	"""Fingerprint
+
+	Returns a fingerprint for an error made from the parts passed, usually
+	where it happened and the traceback. Only the frames of the traceback and
+	the type of the exception are used, so that the same error with a
+	different message, an ID or a value, is still grouped together
+
+	Arguments:
+		*parts (str): The parts of the error, the last being the traceback
+
+	Returns:
+		str
+	"""
+
+	# Split up the traceback
+	lLines = parts[-1].strip().splitlines()
+
+	# Keep the file lines and the exception type, minus any addresses
+	lKeep = [ s.strip() for s in lLines if s.lstrip().startswith('File ') ]
+	if lLines:
+		lKeep.append(lLines[-1].partition(':')[0])
+
+	# Hash everything together
+	return sha1(_ADDRESS.sub('0x', '\n'.join(
+		list(parts[:-1]) + lKeep
+	)).encode('utf-8')).hexdigest()[:12]
+
+class Digest(object):
+	"""Digest
+
+	Queues reports, groups them by fingerprint within each window, and sends
+	one message per window with the number of times each one happened. The
+	number of messages sent is capped, and anything over the cap, or over the
+	size of the queue, is dropped and counted
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		send: callable,
+		window: float = 60,
+		queue: int = 1000,
+		max_sends: int = 10,
+		per: float = 3600
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			send (callable): Called with the text of each digest
+			window (float): The seconds reports are grouped for
+			queue (int): The most reports that can be waiting
+			max_sends (int): The most digests sent in any period
+			per (float): The seconds in the period
+
+		Returns:
+			Digest
+		"""
+
+		# Store the arguments
+		self._send = send
+		self._window = window
+		self._max_sends = max_sends
+		self._per = per
+
+		# The reports waiting, the times of the last digests sent, and the
+		#	number of reports dropped since the last one by reason
+		self._queue = Queue(queue)
+		self._sent = deque()
+		self._dropped = { 'queue': 0, 'rate': 0 }
+		self._lock = Lock()
+
+		# The process the thread was started in
+		self._pid = None
+		self._thread = None
+
+		# Send whatever is waiting when the process exits
+		atexit.register(self.stop)
+
+	def _deliver(self, groups: dict, start: float) -> None:
+		"""Deliver
+
+		Sends the digest of a window, unless the cap has been reached
+
+		Arguments:
+			groups (dict): The reports of the window by fingerprint
+			start (float): The time the window started
+		"""
+
+		# Forget the sends that are outside the period
+		fNow = monotonic()
+		while self._sent and fNow - self._sent[0] > self._per:
+			self._sent.popleft()
+
+		# If we've hit the cap, drop the reports
+		iTotal = sum([ l[0] for l in groups.values() ])
+		if len(self._sent) >= self._max_sends:
+			self._drop('rate', iTotal)
+			return
+
+		# Take the dropped counts
+		with self._lock:
+			dDropped = self._dropped
+			self._dropped = { 'queue': 0, 'rate': 0 }
+
+		# Generate the summary
+		lParts = [ '%d error(s), %d unique, in %d seconds, process %d\n' % (
+			iTotal, len(groups), round(time() - start), getpid()
+		) ]
+		if dDropped['queue'] or dDropped['rate']:
+			lParts.append(
+				'DROPPED\n\n%d with the queue full, %d over the rate cap\n' % (
+					dDropped['queue'], dDropped['rate']
+				)
+			)
+
+		# Add each group, the most frequent first
+		for sPrint, lGroup in sorted(
+			groups.items(), key = lambda t: -t[1][0]
+		):
+			mReport = lGroup[3]
+			if callable(mReport):
+				try:
+					mReport = mReport()
+				except Exception as e:
+					mReport = 'failed to generate the report: %s' % str(e)
+			lParts.append('%s\n\nOCCURRENCES: %d, first %s, last %s\n\n%s' % (
+				'=' * 72, lGroup[0],
+				datetime.fromtimestamp(lGroup[1]).isoformat(' ', 'seconds'),
+				datetime.fromtimestamp(lGroup[2]).isoformat(' ', 'seconds'),
+				mReport
+			))
+
+		# Send it
+		self._sent.append(fNow)
+		try:
+			self._send('\n'.join(lParts))
+			metrics.count('error_digests_total')
+		except Exception as e:
+			print('digest: %s' % str(e), file = sys.stderr)
+
+	def _drop(self, reason: str, count: int = 1) -> None:
+		"""Drop
+
+		Counts reports that were dropped
+
+		Arguments:
+			reason (str): 'queue' or 'rate'
+			count (int): The number dropped
+		"""
+		with self._lock:
+			self._dropped[reason] += count
+		metrics.count('error_reports_dropped_total', (
+			( 'reason', reason ),
+		), count)
+
+	def _run(self) -> None:
+		"""Run
+
+		Runs forever in a background thread, waits for a report, groups
+		everything that arrives within the window, and delivers the digest
+		"""
+
+		while True:
+
+			# Wait for the first report of a window
+			mItem = self._queue.get()
+			if mItem is None:
+				return
+
+			# Start the window
+			fStart = time()
+			fEnd = monotonic() + self._window
+			dGroups = {}
+			bStop = False
+
+			# Collect reports until the window ends
+			while True:
+				sPrint, fWhen, mReport = mItem
+				try:
+					dGroups[sPrint][0] += 1
+					dGroups[sPrint][2] = fWhen
+				except KeyError:
+					dGroups[sPrint] = [ 1, fWhen, fWhen, mReport ]
+
+				fWait = fEnd - monotonic()
+				if fWait <= 0:
+					break
+				try:
+					mItem = self._queue.get(timeout = fWait)
+				except Empty:
+					break
+				if mItem is None:
+					bStop = True
+					break
+
+			# Send the digest
+			self._deliver(dGroups, fStart)
+			if bStop:
+				return
+
+	def _start(self) -> None:
+		"""Start
+
+		Starts the sending thread, if it's not already running in this
+		process. Anything queued in a parent process stays with the parent
+		"""
+		if self._pid != getpid():
+			with self._lock:
+				if self._pid != getpid():
+					self._pid = getpid()
+					self._queue = Queue(self._queue.maxsize)
+					self._dropped = { 'queue': 0, 'rate': 0 }
+					self._sent.clear()
+					self._thread = Thread(target = self._run, daemon = True)
+					self._thread.start()
+
+	def add(self, key: str, report: any) -> bool:
+		"""Add
+
+		Adds a report to the queue without waiting. Returns False if the queue
+		is full and the report was dropped
+
+		Arguments:
+			key (str): The fingerprint of the error
+			report (str | callable): The full text of the report, or a
+				function returning it, only called for the first report of
+				each fingerprint in a window
+
+		Returns:
+			bool
+		"""
+		self._start()
+		metrics.count('error_reports_total')
+		try:
+			self._queue.put_nowait(( key, time(), report ))
+			return True
+		except Full:
+			self._drop('queue')
+			return False
+
+	def stop(self, timeout: float = 5.0) -> None:
+		"""Stop
+
+		Sends whatever is waiting and stops the thread, used at exit so the
+		last window isn't lost
+
+		Arguments:
+			timeout (float): The most seconds to wait
+		"""
+		if self._thread is None or self._pid != getpid():
+			return
+		try:
+			self._queue.put(None, timeout = timeout)
+		except Full:
+			return
+		self._thread.join(timeout)
@@ -0,0 +1,217 @@
+# coding=utf8
+""" Flight
+
+Single-flight loading, so that concurrent misses for the same key wait for
+one load instead of each going to the Storage. Threads in a process share
+the load directly, and, optionally, processes take turns through a redis
+lock, so that only the first goes to MySQL and the rest find the records
+already in the Storage's redis cache
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+
+# Python imports
+from sys import stderr
+from threading import Event, Lock
+from time import monotonic, sleep
+from uuid import uuid4
+
+# Project imports
+from shared import channel
+
+# Deletes the lock only if it's still ours
+_RELEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+	return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class _Call(object):
+	"""Call
+
+	A load in progress, and its result once it's done
+
+	Extends:
+		object
+	"""
+
+	__slots__ = ( 'done', 'error', 'value' )
+
+	def __init__(self):
+		self.done = Event()
+		self.error = None
+		self.value = None
+
+class Flight(object):
+	"""Flight
+
+	Runs at most one load per key at a time, every caller asking for the
+	same key while it runs gets the same result
+
+	Extends:
+		object
+	"""
+
+	def __init__(self):
+		"""Constructor
+
+		Creates a new instance
+
+		Returns:
+			Flight
+		"""
+
+		# The loads in progress by key
+		self._calls = {}
+		self._lock = Lock()
+
+		# The counters
+		self._stats = { 'loads': 0, 'shared': 0, 'locked': 0, 'waited': 0 }
+
+		# The redis lock config, loaded on first use
+		self._conf = None
+
+	def _config(self) -> dict:
+		"""Config
+
+		Returns the config, loading it on first use
+
+		Returns:
+			dict
+		"""
+		if self._conf is None:
+			self._conf = config.records.flight({
+				'poll': 0.05,
+				'redis': False,
+				'ttl': 5000
+			})
+		return self._conf
+
+	def _distributed(self, key: tuple, load: callable) -> any:
+		"""Distributed
+
+		Runs the load holding a redis lock on the key. If another process
+		already holds it, waits for it to finish, then loads, as what the
+		other process fetched is now cached in redis
+
+		Arguments:
+			key (tuple): The key being loaded
+			load (callable): The function that loads it
+
+		Returns:
+			any
+		"""
+
+		# Try to get the lock, if redis is unavailable just load
+		dConf = self._config()
+		sKey = channel.key('flight', *key)
+		sToken = uuid4().hex
+		try:
+			oRedis = channel.connection()
+			bLocked = oRedis.set(sKey, sToken, nx = True, px = dConf['ttl'])
+		except Exception as e:
+			print('flight lock failed: %s' % str(e), file = stderr)
+			return load()
+
+		# If we got it, load, then release it. If it's no longer ours, it
+		#	expired while loading and another process may have loaded too
+		if bLocked:
+			with self._lock:
+				self._stats['locked'] += 1
+			fStart = monotonic()
+			try:
+				return load()
+			finally:
+				try:
+					if not oRedis.eval(_RELEASE, 1, sKey, sToken):
+						print('flight lock %s expired after %dms, the load ' \
+							'took %dms' % (
+								sKey, dConf['ttl'],
+								(monotonic() - fStart) * 1000
+							), file = stderr)
+				except Exception:
+					pass
+
+		# Else, wait for the lock to be released, or to expire
+		with self._lock:
+			self._stats['waited'] += 1
+		fEnd = monotonic() + dConf['ttl'] / 1000
+		try:
+			while monotonic() < fEnd and oRedis.exists(sKey):
+				sleep(dConf['poll'])
+		except Exception:
+			pass
+
+		# Now load
+		return load()
+
+	def do(self, key: tuple, load: callable) -> any:
+		"""Do
+
+		Returns the result of the load, running it only if no other thread is
+		already running it for the same key
+
+		Arguments:
+			key (tuple): The key being loaded
+			load (callable): The function that loads it
+
+		Returns:
+			any
+		"""
+
+		# Join a load in progress, or start a new one
+		with self._lock:
+			oCall = self._calls.get(key)
+			bLeader = oCall is None
+			if bLeader:
+				oCall = self._calls[key] = _Call()
+				self._stats['loads'] += 1
+			else:
+				self._stats['shared'] += 1
+
+		# If someone else is loading, wait for them
+		if not bLeader:
+			oCall.done.wait()
+			if oCall.error:
+				raise oCall.error
+			return oCall.value
+
+		# Else, load it ourselves
+		try:
+			if self._config()['redis']:
+				oCall.value = self._distributed(key, load)
+			else:
+				oCall.value = load()
+			return oCall.value
+
+		# If it failed, everyone waiting fails with it
+		except Exception as e:
+			oCall.error = e
+			raise
+
+		# Let everyone waiting know it's done
+		finally:
+			with self._lock:
+				del self._calls[key]
+			oCall.done.set()
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the number of loads run, the number of callers that shared
+		one instead, and, if the redis lock is used, the number of times it
+		was taken or waited on
+
+		Returns:
+			dict
+		"""
+		with self._lock:
+			return dict(self._stats)
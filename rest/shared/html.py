@@ -0,0 +1,247 @@
+# coding=utf8
+""" HTML
+
+Compiles the HTML content of static pages, sanitizing and minifying it, then
+compressing the result, and extracts their text. Everything here must be
+importable and picklable by a child process
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+import gzip
+from hashlib import blake2b
+from html import escape
+from html.parser import HTMLParser
+import re
+
+# Pip imports
+try:
+	import brotli
+except ImportError:
+	brotli = None
+
+# Tags which are removed along with everything in them
+DROP_CONTENT = {
+	'applet', 'embed', 'frame', 'frameset', 'iframe', 'noscript', 'object',
+	'script', 'style', 'template'
+}
+
+# Tags which are removed, but whose content is kept
+DROP_TAG = { 'base', 'form', 'link', 'meta' }
+
+# Tags which have no closing tag
+VOID = {
+	'area', 'br', 'col', 'hr', 'img', 'input', 'source', 'track', 'wbr'
+}
+
+# Tags in which whitespace must be kept as is
+PREFORMATTED = { 'pre', 'textarea' }
+
+# Attributes which contain URLs
+URL_ATTRIBUTES = { 'action', 'background', 'formaction', 'href', 'src' }
+
+# Regexes
+_reWhitespace = re.compile(r'\s+')
+_reUnsafeURL = re.compile(r'^\s*(javascript|vbscript|data):', re.IGNORECASE)
+
+class _Compiler(HTMLParser):
+	"""Compiler
+
+	Rebuilds the HTML a piece at a time, skipping anything unsafe and
+	collapsing any whitespace outside of preformatted tags
+
+	Extends:
+		html.parser.HTMLParser
+	"""
+
+	def __init__(self):
+		"""Constructor
+
+		Creates a new instance
+
+		Returns:
+			_Compiler
+		"""
+		super().__init__(convert_charrefs = True)
+		self.parts = []
+		self._drop = 0
+		self._pre = 0
+		self._space = False
+
+	def handle_starttag(self, tag: str, attrs: list) -> None:
+
+		# If we're already dropping, or this starts a drop
+		if self._drop or tag in DROP_CONTENT:
+			if tag in DROP_CONTENT:
+				self._drop += 1
+			return
+
+		# If the tag itself is dropped
+		if tag in DROP_TAG:
+			return
+
+		# Keep track of preformatted text
+		if tag in PREFORMATTED:
+			self._pre += 1
+
+		# Add the tag with only the safe attributes
+		lAttrs = []
+		for sName, sValue in attrs:
+			if sName.startswith('on'):
+				continue
+			if sName in URL_ATTRIBUTES and sValue and \
+				_reUnsafeURL.match(sValue):
+				continue
+			if sValue is None:
+				lAttrs.append(' %s' % sName)
+			else:
+				lAttrs.append(' %s="%s"' % (sName, escape(sValue)))
+		self.parts.append('<%s%s>' % (tag, ''.join(lAttrs)))
+		self._space = False
+
+	def handle_startendtag(self, tag: str, attrs: list) -> None:
+		self.handle_starttag(tag, attrs)
+
+	def handle_endtag(self, tag: str) -> None:
+
+		# If the tag ends a drop
+		if tag in DROP_CONTENT:
+			if self._drop:
+				self._drop -= 1
+			return
+
+		# If we're dropping, or the tag is dropped or has no end
+		if self._drop or tag in DROP_TAG or tag in VOID:
+			return
+
+		# Keep track of preformatted text
+		if tag in PREFORMATTED and self._pre:
+			self._pre -= 1
+
+		# Add the tag
+		self.parts.append('</%s>' % tag)
+		self._space = False
+
+	def handle_data(self, data: str) -> None:
+
+		# If we're dropping, skip it
+		if self._drop:
+			return
+
+		# Escape the text, collapsing the whitespace if we can, including
+		#	with any space left before something that was dropped, e.g. a
+		#	comment or a script
+		sData = escape(data, quote = False)
+		if not self._pre:
+			sData = _reWhitespace.sub(' ', sData)
+			if self._space and sData[:1] == ' ':
+				sData = sData[1:]
+			if sData:
+				self._space = sData[-1] == ' '
+		self.parts.append(sData)
+
+class _Text(HTMLParser):
+	"""Text
+
+	Keeps only the text of the HTML, skipping anything inside tags whose
+	content is never displayed
+
+	Extends:
+		html.parser.HTMLParser
+	"""
+
+	def __init__(self):
+		"""Constructor
+
+		Creates a new instance
+
+		Returns:
+			_Text
+		"""
+		super().__init__(convert_charrefs = True)
+		self.parts = []
+		self._drop = 0
+
+	def handle_starttag(self, tag: str, attrs: list) -> None:
+		if tag in DROP_CONTENT:
+			self._drop += 1
+
+		# Tags separate words
+		self.parts.append(' ')
+
+	def handle_endtag(self, tag: str) -> None:
+		if tag in DROP_CONTENT and self._drop:
+			self._drop -= 1
+		self.parts.append(' ')
+
+	def handle_data(self, data: str) -> None:
+		if not self._drop:
+			self.parts.append(data)
+
+def digest(content: str) -> str:
+	"""Digest
+
+	Returns a short hash of the source content, used to know if a compiled
+	version is still valid
+
+	Arguments:
+		content (str): The source HTML
+
+	Returns:
+		str
+	"""
+	return blake2b(content.encode('utf-8'), digest_size = 8).hexdigest()
+
+def compile(content: str) -> dict:
+	"""Compile
+
+	Sanitizes and minifies the HTML, then compresses it with gzip, and with
+	brotli if it's installed
+
+	Arguments:
+		content (str): The source HTML
+
+	Returns:
+		dict
+	"""
+
+	# Sanitize and minify
+	oCompiler = _Compiler()
+	oCompiler.feed(content)
+	oCompiler.close()
+	sHTML = ''.join(oCompiler.parts).strip()
+
+	# Encode and compress it
+	bHTML = sHTML.encode('utf-8')
+	dRet = {
+		'source': digest(content),
+		'html': bHTML,
+		'gzip': gzip.compress(bHTML, 9)
+	}
+	if brotli:
+		dRet['br'] = brotli.compress(bHTML, mode = brotli.MODE_TEXT)
+
+	# Return the compiled data
+	return dRet
+
+def text(content: str) -> str:
+	"""Text
+
+	Returns the text of the HTML, without any tags, and with the whitespace
+	collapsed
+
+	Arguments:
+		content (str): The source HTML
+
+	Returns:
+		str
+	"""
+	oText = _Text()
+	oText.feed(content)
+	oText.close()
+	return _reWhitespace.sub(' ', ''.join(oText.parts)).strip()
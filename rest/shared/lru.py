@@ -0,0 +1,194 @@
+# coding=utf8
+""" LRU
+
+Bounded in-process least recently used cache with per entry size accounting
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+import undefined
+
+# Python imports
+from collections import OrderedDict
+from threading import RLock
+
+class LRU(object):
+	"""LRU
+
+	Stores values up to a maximum number of entries and a maximum number of
+	bytes, evicting the least recently used entries first. Every method is
+	thread safe as entries can be invalidated from a background thread
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, max_bytes: int, max_entries: int):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			max_bytes (int): The maximum total size of all entries
+			max_entries (int): The maximum number of entries
+
+		Returns:
+			LRU
+		"""
+
+		# Store the limits
+		self._max_bytes = max_bytes
+		self._max_entries = max_entries
+
+		# The entries, stored as key => (value, size)
+		self._entries = OrderedDict()
+
+		# The current total size
+		self._bytes = 0
+
+		# Counters
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+		# The lock
+		self._lock = RLock()
+
+	def __len__(self) -> int:
+		"""Length
+
+		Returns the number of entries
+
+		Returns:
+			int
+		"""
+		return len(self._entries)
+
+	def clear(self) -> None:
+		"""Clear
+
+		Removes every entry
+		"""
+		with self._lock:
+			self._entries.clear()
+			self._bytes = 0
+
+	def delete(self, key: any) -> bool:
+		"""Delete
+
+		Removes a single entry, returns True if it existed
+
+		Arguments:
+			key (any): The key of the entry
+
+		Returns:
+			bool
+		"""
+		with self._lock:
+			try:
+				self._bytes -= self._entries.pop(key)[1]
+				return True
+			except KeyError:
+				return False
+
+	def delete_if(self, test: callable) -> int:
+		"""Delete If
+
+		Removes every entry whose key passes the test, returns the count of
+		entries removed
+
+		Arguments:
+			test (callable): Called with each key, returns True to remove
+
+		Returns:
+			int
+		"""
+		with self._lock:
+			lKeys = [ k for k in self._entries if test(k) ]
+			for k in lKeys:
+				self._bytes -= self._entries.pop(k)[1]
+			return len(lKeys)
+
+	def get(self, key: any) -> any:
+		"""Get
+
+		Returns the value associated with the key, or undefined if there is
+		none
+
+		Arguments:
+			key (any): The key of the entry
+
+		Returns:
+			any
+		"""
+		with self._lock:
+			try:
+				t = self._entries[key]
+			except KeyError:
+				self._misses += 1
+				return undefined
+			self._entries.move_to_end(key)
+			self._hits += 1
+			return t[0]
+
+	def set(self, key: any, value: any, size: int) -> bool:
+		"""Set
+
+		Stores the value under the key, evicting older entries as necessary.
+		Returns False if the value is too large to ever be stored
+
+		Arguments:
+			key (any): The key of the entry
+			value (any): The value to store
+			size (int): The size of the value in bytes
+
+		Returns:
+			bool
+		"""
+
+		# If the entry could never fit, don't bother
+		if size > self._max_bytes:
+			return False
+
+		with self._lock:
+
+			# If we already have the key, remove it first
+			if key in self._entries:
+				self._bytes -= self._entries.pop(key)[1]
+
+			# Add the entry at the most recent end
+			self._entries[key] = (value, size)
+			self._bytes += size
+
+			# Evict until we are under both limits
+			while self._bytes > self._max_bytes or \
+				len(self._entries) > self._max_entries:
+				self._bytes -= self._entries.popitem(last = False)[1][1]
+				self._evictions += 1
+
+		# Return OK
+		return True
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the current counters and sizes
+
+		Returns:
+			dict
+		"""
+		with self._lock:
+			return {
+				'bytes': self._bytes,
+				'entries': len(self._entries),
+				'evictions': self._evictions,
+				'hits': self._hits,
+				'max_bytes': self._max_bytes,
+				'max_entries': self._max_entries,
+				'misses': self._misses
+			}
@@ -0,0 +1,323 @@
+# coding=utf8
+""" Metrics
+
+Counters, gauges, and latency histograms for every service request, along
+with the Storage calls, cache lookups, and MySQL queries made by each, in
+Prometheus text format
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from bisect import bisect_left
+from contextvars import ContextVar
+from os import getpid
+from threading import Lock
+from time import perf_counter
+
+# Constants
+ACTIONS = [ 'create', 'delete', 'read', 'update' ]
+BUCKETS = (
+	0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+	2.5, 5.0, 10.0
+)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+PREFIX = 'primary'
+STORAGE_CALLS = [ 'add', 'count', 'exists', 'filter', 'get', 'remove' ]
+
+# Help for each metric
+HELP = {
+	'cache_lookups_total': 'Cache lookups by tier, level, and result',
+	'error_digests_total': 'Error digest emails sent',
+	'error_reports_dropped_total': 'Error reports dropped by reason',
+	'error_reports_total': 'Error reports queued or dropped',
+	'mysql_queries_total': 'Queries sent to MySQL',
+	'request_duration_seconds': 'Service request latency by outcome',
+	'requests_in_flight': 'Service requests currently running',
+	'storage_calls_total': 'Calls made to Storage instances'
+}
+
+# Module variables
+_counters = {}
+_histograms = {}
+_inflight = 0
+_lock = Lock()
+_method = ContextVar('metrics_method', default = '')
+
+def _counted(name: str, call: str, function: callable) -> callable:
+	"""Counted
+
+	Returns a Storage method that counts each call
+
+	Arguments:
+		name (str): The name of the Storage
+		call (str): The name of the method
+		function (callable): The method
+
+	Returns:
+		callable
+	"""
+	tLabels = ( ( 'storage', name ), ( 'call', call ) )
+	def counted(*args, **kwargs):
+		count('storage_calls_total', tLabels)
+		return function(*args, **kwargs)
+	return counted
+
+def _escape(value: str) -> str:
+	"""Escape
+
+	Escapes a label value
+
+	Arguments:
+		value (str): The value
+
+	Returns:
+		str
+	"""
+	return str(value).replace('\\', '\\\\').replace('"', '\\"'). \
+		replace('\n', '\\n')
+
+def _labels(pairs: tuple) -> str:
+	"""Labels
+
+	Returns the label pairs in Prometheus format
+
+	Arguments:
+		pairs (tuple): The (name, value) pairs
+
+	Returns:
+		str
+	"""
+	return ','.join([ '%s="%s"' % (k, _escape(v)) for k, v in pairs ])
+
+def _observe(method: str, outcome: str, seconds: float) -> None:
+	"""Observe
+
+	Adds the latency to the histogram. The lock must already be held
+
+	Arguments:
+		method (str): The name of the service method
+		outcome (str): 'success', 'exception', or the error code
+		seconds (float): The time the request took
+	"""
+	tKey = ( method, outcome )
+	lHist = _histograms.get(tKey)
+	if lHist is None:
+		lHist = _histograms[tKey] = [ 0 ] * (len(BUCKETS) + 1) + [ 0.0 ]
+	lHist[bisect_left(BUCKETS, seconds)] += 1
+	lHist[-1] += seconds
+
+def _outcome(response: any) -> str:
+	"""Outcome
+
+	Returns 'success', or the error code, of a service Response
+
+	Arguments:
+		response (Response): The Response returned by the method
+
+	Returns:
+		str
+	"""
+	mError = getattr(response, 'error', None)
+	if isinstance(mError, dict) and 'code' in mError:
+		return str(mError['code'])
+	if isinstance(mError, (list, tuple)) and mError:
+		return str(mError[0])
+	return 'success'
+
+def _wrap(name: str, method: callable) -> callable:
+	"""Wrap
+
+	Returns the request method wrapped so it's measured
+
+	Arguments:
+		name (str): The name of the method
+		method (callable): The method
+
+	Returns:
+		callable
+	"""
+
+	def wrapper(req: any) -> any:
+
+		global _inflight
+
+		# Mark the request as started
+		with _lock:
+			_inflight += 1
+		oToken = _method.set(name)
+		fStart = perf_counter()
+		sOutcome = 'exception'
+
+		# Call the method and note how it went
+		try:
+			oRes = method(req)
+			sOutcome = _outcome(oRes)
+			return oRes
+
+		# Record the latency and mark the request as done
+		finally:
+			fTook = perf_counter() - fStart
+			_method.reset(oToken)
+			with _lock:
+				_observe(name, sOutcome, fTook)
+				_inflight -= 1
+
+	# Keep the name and docs of the method
+	wrapper.__name__ = method.__name__
+	wrapper.__doc__ = method.__doc__
+	return wrapper
+
+def count(name: str, labels: tuple = (), step: int = 1) -> None:
+	"""Count
+
+	Adds to a counter, labelled with the service method currently running,
+	if any
+
+	Arguments:
+		name (str): The name of the counter, without the prefix
+		labels (tuple): Optional, the (name, value) pairs of the labels
+		step (int): Optional, the amount to add
+	"""
+	tKey = ( name, _method.get(), labels )
+	with _lock:
+		_counters[tKey] = _counters.get(tKey, 0) + step
+
+def instrument(instance: object) -> object:
+	"""Instrument
+
+	Replaces every request method of the instance, those ending in _create,
+	_delete, _read, or _update, with one that records its latency, outcome,
+	and everything counted while it runs. Returns the instance
+
+	Arguments:
+		instance (object): The service instance
+
+	Returns:
+		object
+	"""
+	for sName in dir(instance):
+		if sName.startswith('_') or \
+			sName.rpartition('_')[2] not in ACTIONS:
+			continue
+		fMethod = getattr(instance, sName)
+		if callable(fMethod):
+			setattr(instance, sName, _wrap(sName, fMethod))
+	return instance
+
+def mysql(connection: any) -> any:
+	"""MySQL
+
+	Counts every query sent through the connection. Returns the connection
+
+	Arguments:
+		connection (pymysql.Connection): The connection
+
+	Returns:
+		pymysql.Connection
+	"""
+	fQuery = connection.query
+	def query(*args, **kwargs):
+		count('mysql_queries_total')
+		return fQuery(*args, **kwargs)
+	connection.query = query
+	return connection
+
+def observe(method: str, outcome: str, seconds: float) -> None:
+	"""Observe
+
+	Adds a request's latency to the histogram of its method and outcome
+
+	Arguments:
+		method (str): The name of the service method
+		outcome (str): 'success', 'exception', or the error code
+		seconds (float): The time the request took
+	"""
+	with _lock:
+		_observe(method, outcome, seconds)
+
+def render() -> str:
+	"""Render
+
+	Returns every metric in the process in Prometheus text format. Each
+	worker process keeps its own, so they're labelled with the process ID
+
+	Returns:
+		str
+	"""
+
+	# Copy everything so the lock isn't held while formatting
+	with _lock:
+		dCounters = dict(_counters)
+		dHistograms = { k: list(l) for k, l in _histograms.items() }
+		iInflight = _inflight
+
+	sPID = str(getpid())
+	lLines = []
+
+	# The in flight gauge
+	sName = '%s_requests_in_flight' % PREFIX
+	lLines.extend([
+		'# HELP %s %s' % (sName, HELP['requests_in_flight']),
+		'# TYPE %s gauge' % sName,
+		'%s{pid="%s"} %d' % (sName, sPID, iInflight)
+	])
+
+	# The latency histograms
+	sName = '%s_request_duration_seconds' % PREFIX
+	lLines.extend([
+		'# HELP %s %s' % (sName, HELP['request_duration_seconds']),
+		'# TYPE %s histogram' % sName
+	])
+	for (sMethod, sOutcome), lHist in sorted(dHistograms.items()):
+		sLabels = _labels((
+			( 'method', sMethod ), ( 'outcome', sOutcome ), ( 'pid', sPID )
+		))
+		iTotal = 0
+		for i, fBound in enumerate(BUCKETS):
+			iTotal += lHist[i]
+			lLines.append('%s_bucket{%s,le="%s"} %d' % (
+				sName, sLabels, fBound, iTotal
+			))
+		iTotal += lHist[len(BUCKETS)]
+		lLines.extend([
+			'%s_bucket{%s,le="+Inf"} %d' % (sName, sLabels, iTotal),
+			'%s_sum{%s} %.6f' % (sName, sLabels, lHist[-1]),
+			'%s_count{%s} %d' % (sName, sLabels, iTotal)
+		])
+
+	# The counters, grouped by name
+	dByName = {}
+	for (sCounter, sMethod, tLabels), iValue in dCounters.items():
+		dByName.setdefault(sCounter, []).append((
+			( ( 'method', sMethod ), ) + tLabels + ( ( 'pid', sPID ), ),
+			iValue
+		))
+	for sCounter in sorted(dByName):
+		sName = '%s_%s' % (PREFIX, sCounter)
+		if sCounter in HELP:
+			lLines.append('# HELP %s %s' % (sName, HELP[sCounter]))
+		lLines.append('# TYPE %s counter' % sName)
+		for tLabels, iValue in sorted(dByName[sCounter]):
+			lLines.append('%s{%s} %d' % (sName, _labels(tLabels), iValue))
+
+	# Return the text
+	return '\n'.join(lLines) + '\n'
+
+def storage(instances: dict) -> None:
+	"""Storage
+
+	Counts every call made to the Storage instances
+
+	Arguments:
+		instances (dict): Storage instances by the name to label them with
+	"""
+	for sName, oStorage in instances.items():
+		for sCall in STORAGE_CALLS:
+			fCall = getattr(oStorage, sCall, None)
+			if callable(fCall):
+				setattr(oStorage, sCall, _counted(sName, sCall, fCall))
@@ -0,0 +1,483 @@
+# coding=utf8
+""" Pool
+
+Pool of MySQL connections used by record_mysql in place of its single
+connection per host. Each thread leases a connection the first time it needs
+one, and gives it back with release() once the request is done
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+import record_mysql
+
+# Python imports
+from collections import deque
+from importlib import import_module
+from os import getpid
+from sys import stderr
+from threading import Condition, local
+from time import monotonic
+
+# Pip imports
+import pymysql
+from pymysql.constants import FIELD_TYPE
+
+# Project imports
+from shared import metrics
+
+# Module variables
+_hooked = False
+_leases = local()
+_pools = {}
+
+class Pool(object):
+	"""Pool
+
+	Bounded set of connections to a single host. Connections are created on
+	demand up to the max size, reused most recently used first so that the
+	extra ones go idle and are closed, and checked before being handed out
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		info: dict,
+		min_size: int = 1,
+		max_size: int = 10,
+		idle_timeout: int = 300,
+		pre_ping: bool = True,
+		max_lifetime: int = 3600,
+		timeout: int = 10
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			info (dict): The connection details passed to pymysql
+			min_size (int): The number of idle connections always kept
+			max_size (int): The maximum number of connections at once
+			idle_timeout (int): Seconds after which an idle connection above
+				the minimum is closed
+			pre_ping (bool): Set to check each connection before it's used
+			max_lifetime (int): Seconds after which a connection is closed
+				and replaced, 0 for no limit
+			timeout (int): Seconds to wait for a connection when all of them
+				are in use
+
+		Returns:
+			Pool
+		"""
+
+		# Store the arguments
+		self._info = info
+		self._min = min_size
+		self._max = max_size
+		self._idle_timeout = idle_timeout
+		self._pre_ping = pre_ping
+		self._max_lifetime = max_lifetime
+		self._timeout = timeout
+
+		# The condition used to wait for a connection
+		self._cond = Condition()
+
+		# Init the connections
+		self._reset()
+
+	def _close(self, lease: list) -> None:
+		"""Close
+
+		Closes a connection, ignoring any errors
+
+		Arguments:
+			lease (list): The connection, its creation, and last use times
+		"""
+		try:
+			lease[0].close()
+		except Exception:
+			pass
+		with self._cond:
+			self._stats['closed'] += 1
+
+	def _connect(self) -> list:
+		"""Connect
+
+		Opens a new connection, set up exactly as record_mysql sets up its
+		own, without autocommit, as it begins and commits every statement
+		itself, and with timestamps converted to ints, and dates and times
+		to strings
+
+		Returns:
+			list
+		"""
+		oConn = pymysql.connect(**self._info)
+		oConn.autocommit(False)
+		oServer = import_module('record_mysql.server')
+		dConv = oConn.decoders.copy()
+		dConv[FIELD_TYPE.TIMESTAMP] = oServer._converter_timestamp
+		for i in [ FIELD_TYPE.DATE, FIELD_TYPE.TIME, FIELD_TYPE.DATETIME ]:
+			dConv[i] = str
+		oConn.decoders = dConv
+		sTZ = config.mysql.tz(None)
+		if sTZ:
+			with oConn.cursor() as oCur:
+				oCur.execute('SET time_zone = %s', ( sTZ, ))
+		metrics.mysql(oConn)
+		fNow = monotonic()
+		return [ oConn, fNow, fNow ]
+
+	def _expired(self, lease: list, now: float) -> bool:
+		"""Expired
+
+		Returns True if the connection has lived past the max lifetime
+
+		Arguments:
+			lease (list): The connection, its creation, and last use times
+			now (float): The current monotonic time
+
+		Returns:
+			bool
+		"""
+		return self._max_lifetime and \
+			now - lease[1] > self._max_lifetime or False
+
+	def _reap(self, now: float) -> list:
+		"""Reap
+
+		Removes idle connections above the minimum that haven't been used in
+		the idle timeout, and returns them to be closed. The condition must
+		already be held
+
+		Arguments:
+			now (float): The current monotonic time
+
+		Returns:
+			list
+		"""
+		lRet = []
+		while len(self._idle) > self._min and \
+			now - self._idle[0][2] > self._idle_timeout:
+			lRet.append(self._idle.popleft())
+		return lRet
+
+	def _reset(self) -> None:
+		"""Reset
+
+		Forgets every connection, used on creation and whenever the process
+		has been forked, as a connection can't be shared by two processes
+		"""
+		self._pid = getpid()
+		self._idle = deque()
+		self._active = 0
+		self._connecting = 0
+		self._stats = {
+			'checkouts': 0,
+			'closed': 0,
+			'created': 0,
+			'ping_failures': 0,
+			'timeouts': 0,
+			'wait_ms_max': 0.0,
+			'wait_ms_total': 0.0,
+			'waits': 0
+		}
+
+	def acquire(self) -> list:
+		"""Acquire
+
+		Checks out a connection, waiting for one if they are all in use
+
+		Raises:
+			TimeoutError
+
+		Returns:
+			list
+		"""
+
+		fStart = monotonic()
+		bWaited = False
+		while True:
+			lClose = []
+			lLease = None
+			bCreate = False
+
+			with self._cond:
+
+				# If we've been forked, nothing we have is ours
+				if self._pid != getpid():
+					self._reset()
+
+				# Look for an idle connection, newest first
+				fNow = monotonic()
+				lClose.extend(self._reap(fNow))
+				while self._idle:
+					l = self._idle.pop()
+					if self._expired(l, fNow):
+						lClose.append(l)
+					else:
+						lLease = l
+						break
+
+				# If we found one, or there's room for a new one, take it
+				if lLease or \
+					self._active + self._connecting < self._max:
+					if lLease:
+						self._active += 1
+					else:
+						self._connecting += 1
+						bCreate = True
+
+				# Else, wait for one to be released
+				else:
+					fLeft = self._timeout - (fNow - fStart)
+					if fLeft <= 0:
+						self._stats['timeouts'] += 1
+						raise TimeoutError('mysql pool exhausted')
+					bWaited = True
+					self._cond.wait(fLeft)
+
+			# Close anything that's no longer needed
+			for l in lClose:
+				self._close(l)
+
+			# If we need a new connection
+			if bCreate:
+				try:
+					lLease = self._connect()
+				finally:
+					with self._cond:
+						self._connecting -= 1
+						if lLease:
+							self._active += 1
+							self._stats['created'] += 1
+						self._cond.notify()
+
+			# If we have nothing yet, try again
+			if not lLease:
+				continue
+
+			# If we check connections and it's not a new one
+			if self._pre_ping and not bCreate:
+				try:
+					lLease[0].ping(reconnect = False)
+				except Exception:
+					with self._cond:
+						self._stats['ping_failures'] += 1
+					self.release(lLease, True)
+					continue
+
+			# Update the stats and return the connection
+			fWait = (monotonic() - fStart) * 1000
+			with self._cond:
+				self._stats['checkouts'] += 1
+				self._stats['wait_ms_total'] += fWait
+				if fWait > self._stats['wait_ms_max']:
+					self._stats['wait_ms_max'] = fWait
+				if bWaited:
+					self._stats['waits'] += 1
+			return lLease
+
+	def release(self, lease: list, discard: bool = False) -> None:
+		"""Release
+
+		Returns a connection to the pool
+
+		Arguments:
+			lease (list): The connection returned by acquire
+			discard (bool): Optional, set to close the connection instead
+		"""
+
+		lClose = []
+		with self._cond:
+
+			# If we've been forked since it was acquired, it's not ours
+			if self._pid != getpid():
+				return
+
+			# Put it back, unless it's bad or too old
+			self._active -= 1
+			fNow = monotonic()
+			if discard or self._expired(lease, fNow):
+				lClose.append(lease)
+			else:
+				lease[2] = fNow
+				self._idle.append(lease)
+
+			# Close any that have been idle too long, and let the next waiting
+			#	thread know there's a connection
+			lClose.extend(self._reap(fNow))
+			self._cond.notify()
+
+		# Close anything that's no longer needed
+		for l in lClose:
+			self._close(l)
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the counters of the pool
+
+		Returns:
+			dict
+		"""
+		with self._cond:
+			dRet = dict(self._stats)
+			dRet['active'] = self._active
+			dRet['idle'] = len(self._idle)
+			dRet['max_size'] = self._max
+			dRet['min_size'] = self._min
+		dRet['wait_ms_avg'] = dRet['checkouts'] and \
+			dRet['wait_ms_total'] / dRet['checkouts'] or 0.0
+		return dRet
+
+def _held() -> dict:
+	"""Held
+
+	Returns the connections leased by the current thread, by host. Anything
+	inherited from before a fork is forgotten
+
+	Returns:
+		dict
+	"""
+	if getattr(_leases, 'pid', None) != getpid():
+		_leases.pid = getpid()
+		_leases.hosts = {}
+	return _leases.hosts
+
+def _discard(host: str) -> None:
+	"""Discard
+
+	Closes the connection the current thread has leased from the host's pool,
+	called when record_mysql finds it's no longer usable
+
+	Arguments:
+		host (str): The name of the host
+	"""
+	dLeases = _held()
+	if host in dLeases:
+		_pools[host].release(dLeases.pop(host), True)
+
+def _hook() -> bool:
+	"""Hook
+
+	Replaces record_mysql's connection functions with ones that use the
+	pools, returns False if they can't be found
+
+	Returns:
+		bool
+	"""
+
+	global _hooked
+
+	# If we've already done it
+	if _hooked:
+		return True
+
+	# Find the functions
+	try:
+		oServer = import_module('record_mysql.server')
+	except ImportError:
+		return False
+	if not callable(getattr(oServer, '_connection', None)) or \
+		not callable(getattr(oServer, '_clear_connection', None)) or \
+		not callable(getattr(oServer, '_converter_timestamp', None)):
+		return False
+
+	# Keep the originals
+	fConnection = oServer._connection
+	fClear = oServer._clear_connection
+
+	# Use the pool for any host that has one
+	def connection(host: str, *args, **kwargs):
+		if host in _pools:
+			return lease(host)
+		return fConnection(host, *args, **kwargs)
+	def clear_connection(host: str, *args, **kwargs):
+		if host in _pools:
+			return _discard(host)
+		return fClear(host, *args, **kwargs)
+
+	# Replace them
+	oServer._connection = connection
+	oServer._clear_connection = clear_connection
+	_hooked = True
+	return True
+
+def add_host(info: dict, name: str = '_') -> None:
+	"""Add Host
+
+	Adds the host to record_mysql. If the info has a `pool` section, the
+	connections to the host are pooled
+
+	Arguments:
+		info (dict): The host info, with the optional pool config
+		name (str): Optional, the name of the host
+	"""
+
+	# Split the pool config from the connection details
+	dInfo = dict(info)
+	dPool = dInfo.pop('pool', None)
+
+	# Add the host to record_mysql
+	record_mysql.add_host(dInfo)
+
+	# If we have no pool config, we're done
+	if not dPool:
+		return
+
+	# If the connections can't be replaced, leave them as is
+	if not _hook():
+		print(
+			'pool: record_mysql has no _connection to replace, not pooling',
+			file = stderr
+		)
+		return
+
+	# Create the pool
+	_pools[name] = Pool(dInfo, **dPool)
+
+def lease(host: str = '_') -> pymysql.Connection:
+	"""Lease
+
+	Returns the connection the current thread has leased from the host's
+	pool, acquiring one if it has none
+
+	Arguments:
+		host (str): Optional, the name of the host
+
+	Returns:
+		pymysql.Connection
+	"""
+	dLeases = _held()
+	if host not in dLeases:
+		dLeases[host] = _pools[host].acquire()
+	return dLeases[host][0]
+
+def release() -> None:
+	"""Release
+
+	Returns every connection the current thread has leased, called at the end
+	of each request, and by background threads after each unit of work so
+	their connections are still checked and expired like any other
+	"""
+	dLeases = _held()
+	if dLeases:
+		for sHost, lLease in list(dLeases.items()):
+			_pools[sHost].release(lLease)
+		dLeases.clear()
+
+def stats() -> dict:
+	"""Stats
+
+	Returns the counters of each pool in the current process
+
+	Returns:
+		dict
+	"""
+	return { k: o.stats() for k,o in _pools.items() }
@@ -0,0 +1,376 @@
+# coding=utf8
+""" Profiler
+
+Sampling profiler for service requests. Requests are chosen one in every N,
+by method name, or once they've run longer than a threshold, and while they
+run the stack of their thread is sampled at a fixed interval. The samples of
+each request are written to the data directory as collapsed stacks, one
+"frame;frame;frame count" line per unique stack
+
+To aggregate the files into one flamegraph ready report per method
+
+	python -m shared.profiler [--method name] [--top 10]
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+
+# Python imports
+from argparse import ArgumentParser
+from collections import Counter
+from os import getpid
+from pathlib import Path
+import sys
+from threading import get_ident, Lock, Thread
+from time import monotonic, sleep, time_ns
+
+# Constants
+ACTIONS = [ 'create', 'delete', 'read', 'update' ]
+EXTENSION = '.collapsed'
+
+# Module variables
+_active = {}
+_lock = Lock()
+_sampler = None
+
+def _directory() -> Path:
+	"""Directory
+
+	Returns the directory the profiles are stored in
+
+	Returns:
+		Path
+	"""
+	return Path(config.brain.data('./.data')) / 'profiles'
+
+def _frame(frame: any) -> str:
+	"""Frame
+
+	Returns the name of a frame as it appears in a collapsed stack
+
+	Arguments:
+		frame (frame): The frame
+
+	Returns:
+		str
+	"""
+	oCode = frame.f_code
+	oPath = Path(oCode.co_filename)
+	return '%s (%s/%s)' % (oCode.co_name, oPath.parent.name, oPath.name)
+
+class Sampler(object):
+	"""Sampler
+
+	Chooses the requests to profile, and samples the stacks of the ones
+	being profiled from a single background thread
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		every: int = 0,
+		methods: list = None,
+		threshold: int = 0,
+		interval: int = 5,
+		max_files: int = 1000
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			every (int): Profile one in every N requests, 0 for none
+			methods (str[]): The names of the methods to always profile
+			threshold (int): Milliseconds after which any request is
+				profiled, 0 for none
+			interval (int): Milliseconds between samples
+			max_files (int): The most files the process will write
+
+		Returns:
+			Sampler
+		"""
+
+		# Store the arguments
+		self._every = every
+		self._methods = set(methods or [])
+		self._threshold = threshold / 1000.0
+		self._interval = interval / 1000.0
+		self._max_files = max_files
+
+		# The number of requests seen and files written
+		self._requests = 0
+		self._files = 0
+
+		# The process the thread was started in
+		self._pid = None
+
+	def _run(self) -> None:
+		"""Run
+
+		Runs forever in a background thread, sampling every request that's
+		being profiled
+		"""
+		while True:
+			sleep(self._interval)
+
+			# If no request is running
+			if not _active:
+				continue
+
+			# Get the current frame of every thread
+			dFrames = sys._current_frames()
+			fNow = monotonic()
+
+			with _lock:
+				for iThread, lRequest in _active.items():
+
+					# If it's not being profiled yet
+					if not lRequest[2] and \
+						(not self._threshold or \
+							fNow - lRequest[1] < self._threshold):
+						continue
+
+					# Walk the stack from the current frame up to the
+					#	request method
+					oFrame = dFrames.get(iThread)
+					lStack = []
+					while oFrame is not None and oFrame is not lRequest[3]:
+						lStack.append(_frame(oFrame))
+						oFrame = oFrame.f_back
+
+					# Add the stack, root first
+					lStack.append(lRequest[0])
+					lRequest[4][';'.join(reversed(lStack))] += 1
+
+	def _start(self) -> None:
+		"""Start
+
+		Starts the sampling thread, if it's not already running in this
+		process
+		"""
+		if self._pid != getpid():
+			self._pid = getpid()
+			Thread(target = self._run, daemon = True).start()
+
+	def _write(self, method: str, stacks: Counter) -> None:
+		"""Write
+
+		Writes the samples of a request to the data directory
+
+		Arguments:
+			method (str): The name of the method
+			stacks (Counter): The number of samples of each stack
+		"""
+
+		# If we've written all we're allowed to
+		with _lock:
+			if self._files >= self._max_files:
+				return
+			self._files += 1
+
+		# Write the stacks
+		oDir = _directory() / method
+		oDir.mkdir(parents = True, exist_ok = True)
+		with open(oDir / ('%d_%d%s' % (
+			time_ns(), getpid(), EXTENSION
+		)), 'w') as oFile:
+			for sStack, iCount in stacks.items():
+				oFile.write('%s %d\n' % (sStack, iCount))
+
+	def wrap(self, name: str, method: callable) -> callable:
+		"""Wrap
+
+		Returns the request method wrapped so it's profiled when chosen
+
+		Arguments:
+			name (str): The name of the method
+			method (callable): The method
+
+		Returns:
+			callable
+		"""
+
+		def wrapper(req: any) -> any:
+
+			# Decide if the request is profiled from the start
+			with _lock:
+				self._requests += 1
+				bChosen = name in self._methods or \
+					(self._every and self._requests % self._every == 0)
+
+			# If it's not, and it can't become so, just call the method
+			if not bChosen and not self._threshold:
+				return method(req)
+
+			# Add it to the running requests
+			self._start()
+			iThread = get_ident()
+			lRequest = [
+				name, monotonic(), bChosen, sys._getframe(), Counter()
+			]
+			with _lock:
+				_active[iThread] = lRequest
+
+			# Call the method
+			try:
+				return method(req)
+
+			# Remove the request, and if it was sampled, write the samples
+			finally:
+				with _lock:
+					_active.pop(iThread, None)
+				if lRequest[4]:
+					try:
+						self._write(name, lRequest[4])
+					except Exception as e:
+						print('profiler: %s' % str(e), file = sys.stderr)
+
+		# Keep the name and docs of the method
+		wrapper.__name__ = method.__name__
+		wrapper.__doc__ = method.__doc__
+		return wrapper
+
+def report(directory: Path, method: str = None) -> dict:
+	"""Report
+
+	Merges the samples of every request by method
+
+	Arguments:
+		directory (Path): The directory the profiles are stored in
+		method (str): Optional, only report on this method
+
+	Returns:
+		dict
+	"""
+
+	dRet = {}
+
+	# Go through each method's directory
+	for oDir in sorted(directory.iterdir()):
+		if not oDir.is_dir() or (method and oDir.name != method):
+			continue
+
+		# Merge the stacks of each file
+		oStacks = Counter()
+		iFiles = 0
+		for oFile in oDir.glob('*%s' % EXTENSION):
+			iFiles += 1
+			with open(oFile) as oF:
+				for sLine in oF:
+					sStack, _, sCount = sLine.rstrip('\n').rpartition(' ')
+					if sStack:
+						oStacks[sStack] += int(sCount)
+
+		# Store the totals
+		if iFiles:
+			dRet[oDir.name] = {
+				'requests': iFiles,
+				'stacks': oStacks
+			}
+
+	# Return the methods
+	return dRet
+
+def setup(instance: object) -> None:
+	"""Setup
+
+	If profiling is enabled, wraps every request method of the service
+	instance, those ending in _create, _delete, _read, or _update, so that
+	the ones chosen are profiled
+
+	Arguments:
+		instance (object): The service instance
+	"""
+
+	global _sampler
+
+	# Get the config
+	dConf = config.primary.profile({
+		'enabled': False,
+		'every': 0,
+		'interval': 5,
+		'max_files': 1000,
+		'methods': [],
+		'threshold': 0
+	})
+
+	# If it's disabled
+	if not dConf['enabled']:
+		return
+
+	# Create the sampler
+	_sampler = Sampler(
+		dConf['every'],
+		dConf['methods'],
+		dConf['threshold'],
+		dConf['interval'],
+		dConf['max_files']
+	)
+
+	# Wrap each request method
+	for sName in dir(instance):
+		if sName.startswith('_') or \
+			sName.rpartition('_')[2] not in ACTIONS:
+			continue
+		fMethod = getattr(instance, sName)
+		if callable(fMethod):
+			setattr(instance, sName, _sampler.wrap(sName, fMethod))
+
+def main():
+	"""Main
+
+	Aggregates the profiles into one collapsed stack file per method, ready
+	to be passed to flamegraph.pl or loaded into speedscope, and prints the
+	frames each method spends the most time in
+	"""
+
+	# Parse the arguments
+	oArgs = ArgumentParser(description = 'Aggregate request profiles')
+	oArgs.add_argument('--directory', default = None,
+		help = 'the profiles directory, defaults to brain.data/profiles')
+	oArgs.add_argument('--method', default = None)
+	oArgs.add_argument('--output', default = None,
+		help = 'the report directory, defaults to the profiles directory')
+	oArgs.add_argument('--top', type = int, default = 10)
+	dArgs = oArgs.parse_args()
+
+	# Get the directories
+	oDir = Path(dArgs.directory or _directory())
+	if not oDir.is_dir():
+		print('no profiles in %s' % oDir)
+		return
+	oOutput = Path(dArgs.output or oDir)
+	oOutput.mkdir(parents = True, exist_ok = True)
+
+	# Go through each method
+	for sMethod, dMethod in report(oDir, dArgs.method).items():
+
+		# Write the merged stacks
+		oFile = oOutput / ('%s.folded' % sMethod)
+		with open(oFile, 'w') as oF:
+			for sStack, iCount in sorted(dMethod['stacks'].items()):
+				oF.write('%s %d\n' % (sStack, iCount))
+
+		# Count the samples each frame was at the top of the stack
+		oSelf = Counter()
+		for sStack, iCount in dMethod['stacks'].items():
+			oSelf[sStack.rpartition(';')[2]] += iCount
+		iSamples = sum(oSelf.values())
+
+		# Print the summary
+		print('%s: %d requests, %d samples, %s' % (
+			sMethod, dMethod['requests'], iSamples, oFile
+		))
+		for sFrame, iCount in oSelf.most_common(dArgs.top):
+			print('\t%6.2f%%  %s' % (iCount * 100.0 / iSamples, sFrame))
+
+# Only run if called directly
+if __name__ == '__main__':
+	main()
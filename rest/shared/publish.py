@@ -0,0 +1,333 @@
+# coding=utf8
+""" Publish
+
+Writes the public data set, everything the www site reads, as static JSON
+files after every write, so that it can be served by nginx or a CDN instead
+of the REST service. Each file is named by the hash of its content, and a
+small manifest maps the requests to the current files
+
+	manifest.json                        no-cache, swapped atomically
+	experiences.<hash>.json              immutable
+	skills.grouped.<hash>.json           immutable
+	static/<key>.<hash>.json             immutable
+
+Every file contains exactly what the REST service would return, a "data"
+key with the records, so clients can switch between the two by URL alone
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+
+# Python imports
+from datetime import datetime, timezone
+from hashlib import blake2b
+import json
+import os
+from pathlib import Path
+import re
+from sys import stderr
+from threading import Event, Lock, Thread
+from time import sleep, time
+
+# Project imports
+from shared import pool
+
+# Constants
+MANIFEST = 'manifest.json'
+_SAFE = re.compile(r'^[a-z0-9_]+$')
+
+# Module variables
+_publisher = None
+
+def _hash(data: bytes) -> str:
+	"""Hash
+
+	Returns the hash used to name a file with the given content
+
+	Arguments:
+		data (bytes): The content of the file
+
+	Returns:
+		str
+	"""
+	return blake2b(data, digest_size = 8).hexdigest()
+
+def _write(path: Path, data: bytes) -> None:
+	"""Write
+
+	Writes a file so that it appears all at once, readers never see a partial
+	file
+
+	Arguments:
+		path (Path): The path of the file
+		data (bytes): The content
+	"""
+	path.parent.mkdir(parents = True, exist_ok = True)
+	oTemp = path.with_name('.%s.%d.tmp' % (path.name, os.getpid()))
+	with open(oTemp, 'wb') as oF:
+		oF.write(data)
+	os.replace(oTemp, path)
+
+class Publisher(object):
+	"""Publisher
+
+	Builds each of the public requests, writes the ones that changed, and
+	swaps the manifest. Publishing happens in a background thread shortly
+	after the last write, so a burst of writes results in a single snapshot
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		directory: str,
+		requests: dict,
+		keyed: dict = None,
+		delay: float = 0.25,
+		retain: int = 3600
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			directory (str): The directory to write the files to
+			requests (dict): Functions returning the data of each request by
+				the noun of the request
+			keyed (dict): Functions returning a dict of the data of each key
+				by the noun of the request, i.e. statics by key
+			delay (float): Seconds to wait after a write for any others
+			retain (int): Seconds files no longer in the manifest are kept,
+				for clients still holding an older manifest
+
+		Returns:
+			Publisher
+		"""
+
+		# Store the arguments
+		self._directory = Path(directory)
+		self._requests = requests
+		self._keyed = keyed or {}
+		self._delay = delay
+		self._retain = retain
+
+		# The flag set after writes, and the thread waiting on it
+		self._event = Event()
+		self._lock = Lock()
+		self._pid = None
+
+	def _file(self, noun: str, data: any) -> str:
+		"""File
+
+		Writes the data of a request, if a file with the same content doesn't
+		already exist, and returns its name relative to the directory
+
+		Arguments:
+			noun (str): The noun of the request
+			data (any): The data returned by the request
+
+		Returns:
+			str
+		"""
+
+		# Generate the content and its name
+		bData = json.dumps(
+			{ 'data': data }, separators = (',', ':'), default = str
+		).encode('utf-8')
+		sName = '%s.%s.json' % (noun.replace('/', '.'), _hash(bData))
+
+		# Keyed requests are stored in a directory of their own
+		if '/' in noun and noun.split('/')[0] in self._keyed:
+			sBase, _, sKey = noun.partition('/')
+			sName = '%s/%s.%s.json' % (sBase, sKey, _hash(bData))
+
+		# Write it if it's new
+		oPath = self._directory / sName
+		if not oPath.exists():
+			_write(oPath, bData)
+
+		# Return the name
+		return sName
+
+	def _prune(self, files: set, previous: set) -> None:
+		"""Prune
+
+		Touches the files that just left the manifest, so that their
+		modified time is the time they stopped being used, then removes the
+		files that aren't in the manifest and haven't been for longer than
+		the retain time
+
+		Arguments:
+			files (set): The files in the current manifest
+			previous (set): The files in the manifest it replaced
+		"""
+
+		# Mark the files no longer used as of now, files are never rewritten
+		#	so without this their time would be when they were created
+		for sName in previous - files:
+			try:
+				os.utime(self._directory / sName)
+			except FileNotFoundError:
+				pass
+
+		# Remove any unused for longer than the retain time
+		fOld = time() - self._retain
+		for oPath in self._directory.rglob('*.json'):
+			sName = oPath.relative_to(self._directory).as_posix()
+			if sName == MANIFEST or sName in files:
+				continue
+			try:
+				if oPath.stat().st_mtime < fOld:
+					oPath.unlink()
+			except FileNotFoundError:
+				pass
+
+	def _run(self) -> None:
+		"""Run
+
+		Runs forever in a background thread, publishing after each write once
+		the writes have stopped for the delay
+		"""
+		while True:
+			self._event.wait()
+
+			# Wait for any other writes
+			while True:
+				self._event.clear()
+				sleep(self._delay)
+				if not self._event.is_set():
+					break
+
+			# Publish, then give back any connection used to do it
+			try:
+				self.publish()
+			except Exception as e:
+				print('publish failed: %s' % str(e), file = stderr)
+			finally:
+				pool.release()
+
+	def _start(self) -> None:
+		"""Start
+
+		Starts the publishing thread, if it's not already running in this
+		process
+		"""
+		if self._pid != os.getpid():
+			with self._lock:
+				if self._pid != os.getpid():
+					self._pid = os.getpid()
+					Thread(target = self._run, daemon = True).start()
+
+	def publish(self) -> dict:
+		"""Publish
+
+		Builds and writes every request, then the manifest if anything
+		changed. Returns the manifest
+
+		Returns:
+			dict
+		"""
+
+		# Build and write every request
+		dFiles = {}
+		for sNoun, fBuild in self._requests.items():
+			dFiles[sNoun] = self._file(sNoun, fBuild())
+		for sNoun, fBuild in self._keyed.items():
+			for sKey, mData in fBuild().items():
+				if _SAFE.match(sKey):
+					sKeyed = '%s/%s' % (sNoun, sKey)
+					dFiles[sKeyed] = self._file(sKeyed, mData)
+
+		# The version is the hash of the files, so the same data always has
+		#	the same version
+		sVersion = _hash(json.dumps(dFiles, sort_keys = True).encode('utf-8'))
+		dManifest = {
+			'version': sVersion,
+			'published': datetime.now(timezone.utc).isoformat(),
+			'files': dFiles
+		}
+
+		# Get the current manifest, if the version is already published,
+		#	there's nothing else to do
+		oManifest = self._directory / MANIFEST
+		dPrevious = {}
+		try:
+			with open(oManifest) as oF:
+				dPrevious = json.load(oF)
+			if dPrevious.get('version') == sVersion:
+				return dManifest
+		except (FileNotFoundError, ValueError):
+			pass
+
+		# Swap the manifest, then remove the files no longer needed
+		_write(oManifest, json.dumps(
+			dManifest, indent = '\t', sort_keys = True
+		).encode('utf-8'))
+		self._prune(
+			set(dFiles.values()),
+			set(dPrevious.get('files', {}).values())
+		)
+
+		# Return the manifest
+		return dManifest
+
+	def schedule(self, *args) -> None:
+		"""Schedule
+
+		Marks the data as changed so it's published shortly. Takes and
+		ignores any arguments so it can be used as a callback
+		"""
+		self._start()
+		self._event.set()
+
+def setup(requests: dict, keyed: dict, tiers: list) -> Publisher | None:
+	"""Setup
+
+	If publishing is enabled, creates the publisher, has it notified of every
+	write made to the tiers, and schedules the first publish
+
+	Arguments:
+		requests (dict): Functions returning the data of each request by noun
+		keyed (dict): Functions returning the data of each key by noun
+		tiers (Tiered[]): The tiers the data is built from
+
+	Returns:
+		Publisher | None
+	"""
+
+	global _publisher
+
+	# Get the config
+	dConf = config.primary.publish({
+		'delay': 0.25,
+		'directory': '%s/public' % config.brain.data('./.data'),
+		'enabled': False,
+		'retain': 3600
+	})
+
+	# If it's disabled
+	if not dConf['enabled']:
+		return None
+
+	# Create the publisher and follow the writes
+	_publisher = Publisher(
+		dConf['directory'],
+		requests,
+		keyed,
+		dConf['delay'],
+		dConf['retain']
+	)
+	for o in tiers:
+		o.on_write(_publisher.schedule)
+
+	# Publish what we have now
+	_publisher.schedule()
+
+	# Return the publisher
+	return _publisher
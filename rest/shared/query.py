@@ -0,0 +1,167 @@
+# coding=utf8
+""" Query
+
+Parses and validates the optional fields, filter, sort, cursor, and limit
+parameters accepted by the list requests
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from hashlib import blake2b
+import json
+
+# Constants
+MAX_LIMIT = 1000
+PARAMS = [ 'cursor', 'fields', 'filter', 'limit', 'sort' ]
+
+def cursor_decode(cursor: str) -> list:
+	"""Cursor Decode
+
+	Returns the values stored in a cursor
+
+	Arguments:
+		cursor (str): The cursor returned by a previous request
+
+	Raises:
+		ValueError
+
+	Returns:
+		list
+	"""
+	try:
+		lRet = json.loads(urlsafe_b64decode(cursor.encode('ascii')))
+	except Exception:
+		raise ValueError([ [ 'cursor', 'invalid' ] ])
+	if not isinstance(lRet, list) or len(lRet) != 3:
+		raise ValueError([ [ 'cursor', 'invalid' ] ])
+	return lRet
+
+def cursor_encode(sort: str, value: any, _id: str) -> str:
+	"""Cursor Encode
+
+	Generates the cursor that points after the given record
+
+	Arguments:
+		sort (str): The sort the cursor is valid for
+		value (any): The value of the sort field of the last record
+		_id (str): The ID of the last record
+
+	Returns:
+		str
+	"""
+	return urlsafe_b64encode(
+		json.dumps([ sort, value, _id ], default = str).encode('utf-8')
+	).decode('ascii')
+
+def digest(query: dict) -> str:
+	"""Digest
+
+	Returns a short hash of the query, used to make tags unique to it
+
+	Arguments:
+		query (dict): The parsed query
+
+	Returns:
+		str
+	"""
+	return blake2b(
+		json.dumps(query, sort_keys = True, default = str).encode('utf-8'),
+		digest_size = 8
+	).hexdigest()
+
+def parse(data: dict, fields: list) -> dict | None:
+	"""Parse
+
+	Validates the list parameters in the request data and returns them.
+	Returns None if none were sent
+
+	Arguments:
+		data (dict): The request data
+		fields (str[]): The fields of the records
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict | None
+	"""
+
+	# If no parameters were sent
+	if not any([ k in data for k in PARAMS ]):
+		return None
+
+	# Init the return and errors
+	dRet = {}
+	lErrors = []
+
+	# Fields
+	if 'fields' in data:
+		if not isinstance(data['fields'], list) or not data['fields'] or \
+			not all([ f in fields for f in data['fields'] ]):
+			lErrors.append([ 'fields', 'invalid' ])
+		else:
+			dRet['fields'] = list(data['fields'])
+
+	# Filter
+	if 'filter' in data:
+		if not isinstance(data['filter'], dict) or not data['filter'] or \
+			not all([ f in fields for f in data['filter'] ]):
+			lErrors.append([ 'filter', 'invalid' ])
+		else:
+			dRet['filter'] = dict(data['filter'])
+
+	# Sort, the field, optionally prefixed by - for descending
+	if 'sort' in data:
+		if not isinstance(data['sort'], str) or \
+			data['sort'].lstrip('-') not in fields:
+			lErrors.append([ 'sort', 'invalid' ])
+		else:
+			dRet['sort'] = data['sort']
+
+	# Limit
+	if 'limit' in data:
+		if not isinstance(data['limit'], int) or \
+			isinstance(data['limit'], bool) or \
+			not 1 <= data['limit'] <= MAX_LIMIT:
+			lErrors.append([ 'limit', 'invalid' ])
+		else:
+			dRet['limit'] = data['limit']
+
+	# Cursor
+	if 'cursor' in data:
+		if not isinstance(data['cursor'], str):
+			lErrors.append([ 'cursor', 'invalid' ])
+		else:
+			try:
+				dRet['cursor'] = cursor_decode(data['cursor'])
+			except ValueError as e:
+				lErrors.extend(e.args[0])
+
+	# If there's any errors
+	if lErrors:
+		raise ValueError(lErrors)
+
+	# Return the parsed query
+	return dRet
+
+def project(records: list, fields: list | None) -> list:
+	"""Project
+
+	Returns the records with only the requested fields
+
+	Arguments:
+		records (dict[]): The records
+		fields (str[] | None): The fields to keep, None for all
+
+	Returns:
+		dict[]
+	"""
+	if not fields:
+		return records
+	return [ { f: d.get(f) for f in fields } for d in records ]
@@ -0,0 +1,482 @@
+# coding=utf8
+""" Search
+
+In process inverted index over the text fields of the records, with prefix
+matching and BM25 ranking. It's built once from the tiers, then kept up to
+date record by record as the tiers change, in this process or any other
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from config import config
+
+# Python imports
+from bisect import bisect_left, insort
+from functools import partial
+from heapq import nlargest
+from math import log
+import re
+from threading import Lock, RLock
+import unicodedata
+
+# Project imports
+from shared import html
+
+# Constants
+K1 = 1.2
+B = 0.75
+MAX_LIMIT = 100
+PREFIX_WEIGHT = 0.5
+
+# Regexes
+_reToken = re.compile(r'[^\W_]+')
+
+# Module variables
+_index = None
+_lock = Lock()
+
+def _config() -> dict:
+	"""Config
+
+	Returns the search config
+
+	Returns:
+		dict
+	"""
+	return config.primary.search({
+		'build': False,
+		'max_expansions': 50
+	})
+
+def tokens(text: str) -> list:
+	"""Tokens
+
+	Splits text into lowercase words, without accents, so that "Montréal"
+	and "montreal" are the same token
+
+	Arguments:
+		text (str): The text to split
+
+	Returns:
+		str[]
+	"""
+	if not text:
+		return []
+	if not text.isascii():
+		text = ''.join([
+			c for c in unicodedata.normalize('NFKD', text) \
+			if not unicodedata.combining(c)
+		])
+	return _reToken.findall(text.lower())
+
+class Source(object):
+	"""Source
+
+	Describes one type of record in the index, where it comes from and which
+	of its fields are searched
+
+	Extends:
+		object
+	"""
+
+	def __init__(self,
+		name: str,
+		tier: any,
+		fields: dict,
+		title: str,
+		html_fields: list = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			name (str): The name of the type, returned with each result
+			tier (Tiered): The tier the records come from, None if they're
+				only added by hand
+			fields (dict): The weight of each field searched
+			title (str): The field returned with each result
+			html_fields (str[]): Optional, the fields that contain HTML
+
+		Returns:
+			Source
+		"""
+		self.name = name
+		self.tier = tier
+		self.fields = fields
+		self.title = title
+		self.html = set(html_fields or [])
+
+	def terms(self, record: dict) -> dict:
+		"""Terms
+
+		Returns the weighted frequency of each token in the record
+
+		Arguments:
+			record (dict): The record
+
+		Returns:
+			dict
+		"""
+		dTerms = {}
+		for sField, fWeight in self.fields.items():
+			sText = record.get(sField)
+			if not sText:
+				continue
+			if sField in self.html:
+				sText = html.text(sText)
+			for s in tokens(sText):
+				dTerms[s] = dTerms.get(s, 0) + fWeight
+		return dTerms
+
+class Index(object):
+	"""Index
+
+	Maps every token to the records it's in, along with a sorted list of the
+	tokens so that prefixes can be found with a binary search
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, sources: list, max_expansions: int = 50):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			sources (Source[]): The types of records indexed
+			max_expansions (int): The most tokens a prefix is expanded to
+
+		Returns:
+			Index
+		"""
+
+		# Store the arguments
+		self._sources = { o.name: o for o in sources }
+		self._max_expansions = max_expansions
+
+		# The terms and title of each document, by (type, _id)
+		self._docs = {}
+
+		# The documents each token is in, with the weighted frequency and
+		#	the length of the document, and the sorted list of the tokens
+		self._postings = {}
+		self._vocab = []
+
+		# The total length of every document, for the average
+		self._length = 0
+
+		# The changes waiting to be applied, by type, a set of IDs, or None
+		#	for everything
+		self._pending = {}
+		self._built = False
+		self._lock = RLock()
+
+		# Follow the changes to each tier
+		for o in sources:
+			if o.tier is not None:
+				o.tier.watch(partial(self._changed, o.name), ids = True)
+
+	def _add(self, key: tuple, terms: dict, title: str) -> None:
+		"""Add
+
+		Adds a document to the postings. The lock must already be held and
+		the document must not already be in the index
+
+		Arguments:
+			key (tuple): The type and ID of the document
+			terms (dict): The weighted frequency of each token
+			title (str): The title of the document
+		"""
+		iLength = sum(terms.values())
+		self._docs[key] = ( terms, title, iLength )
+		self._length += iLength
+		for sToken, fWeight in terms.items():
+			try:
+				self._postings[sToken][key] = ( fWeight, iLength )
+			except KeyError:
+				self._postings[sToken] = { key: ( fWeight, iLength ) }
+				insort(self._vocab, sToken)
+
+	def _apply(self) -> None:
+		"""Apply
+
+		Applies any changes waiting. The records are fetched without the lock
+		held so searches aren't held up by any I/O
+		"""
+
+		# Take the changes
+		with self._lock:
+			if not self._pending:
+				return
+			dPending = self._pending
+			self._pending = {}
+
+		# Go through each type
+		for sName, mIDs in dPending.items():
+			oSource = self._sources[sName]
+
+			# If everything changed, fetch every record
+			if mIDs is None:
+				lRecords = oSource.tier.all()
+				with self._lock:
+					for tKey in [ k for k in self._docs if k[0] == sName ]:
+						self._remove(tKey)
+					for d in lRecords:
+						self.upsert(sName, d)
+				continue
+
+			# Else fetch only those that changed
+			lChanged = [ ( s, oSource.tier.get(s) ) for s in mIDs ]
+			with self._lock:
+				for sID, dRecord in lChanged:
+					if dRecord:
+						self.upsert(sName, dRecord)
+					else:
+						self.remove(sName, sID)
+
+	def _changed(self, name: str, ids: list | None) -> None:
+		"""Changed
+
+		Called by the tiers when records change, notes the IDs so they can be
+		updated before the next search
+
+		Arguments:
+			name (str): The type of the records
+			ids (str[] | None): The IDs, or None if anything could have
+				changed
+		"""
+		with self._lock:
+			if not self._built:
+				return
+			if ids is None:
+				self._pending[name] = None
+			elif name not in self._pending:
+				self._pending[name] = set(ids)
+			elif self._pending[name] is not None:
+				self._pending[name].update(ids)
+
+	def _expand(self, term: str) -> list:
+		"""Expand
+
+		Returns the tokens matching a term, exactly or by prefix, with the
+		weight of the match. The lock must already be held
+
+		Arguments:
+			term (str): The term searched for
+
+		Returns:
+			list of tuple (str, float)
+		"""
+		lRet = []
+		i = bisect_left(self._vocab, term)
+		while i < len(self._vocab) and len(lRet) < self._max_expansions:
+			sToken = self._vocab[i]
+			if not sToken.startswith(term):
+				break
+			lRet.append(( sToken, sToken == term and 1.0 or PREFIX_WEIGHT ))
+			i += 1
+		return lRet
+
+	def _remove(self, key: tuple) -> None:
+		"""Remove
+
+		Removes a document from the postings. The lock must already be held
+
+		Arguments:
+			key (tuple): The type and ID of the document
+		"""
+		tDoc = self._docs.pop(key, None)
+		if tDoc is None:
+			return
+		self._length -= tDoc[2]
+		for sToken in tDoc[0]:
+			dPosting = self._postings[sToken]
+			del dPosting[key]
+			if not dPosting:
+				del self._postings[sToken]
+				del self._vocab[bisect_left(self._vocab, sToken)]
+
+	def build(self) -> None:
+		"""Build
+
+		Indexes every record of every tier, if it hasn't already been done
+		"""
+		with self._lock:
+			if self._built:
+				return
+			for oSource in self._sources.values():
+				if oSource.tier is not None:
+					for d in oSource.tier.all():
+						self.upsert(oSource.name, d)
+			self._built = True
+			self._pending = {}
+
+	def remove(self, name: str, _id: str) -> None:
+		"""Remove
+
+		Removes a record from the index
+
+		Arguments:
+			name (str): The type of the record
+			_id (str): The ID of the record
+		"""
+		with self._lock:
+			self._remove(( name, _id ))
+
+	def search(self,
+		query: str,
+		limit: int = 10,
+		offset: int = 0,
+		types: list = None
+	) -> dict:
+		"""Search
+
+		Returns the records containing every word of the query, each matched
+		exactly or as the start of a longer word, ordered by score
+
+		Arguments:
+			query (str): The words to search for
+			limit (int): The most results to return
+			offset (int): The number of results to skip
+			types (str[]): Optional, only return records of these types
+
+		Returns:
+			dict
+		"""
+
+		# Make sure the index is built and up to date
+		if not self._built:
+			self.build()
+		if self._pending:
+			self._apply()
+
+		# Split the query, ignoring duplicates
+		lTerms = list(dict.fromkeys(tokens(query)))
+		if not lTerms:
+			return { 'total': 0, 'results': [] }
+
+		with self._lock:
+
+			# Score each document for each term, keeping the best match
+			iDocs = len(self._docs)
+			fNorm = K1 * B / (iDocs and self._length / iDocs or 1.0)
+			fBase = K1 * (1 - B)
+			lScores = []
+			for sTerm in lTerms:
+				dScores = {}
+				for sToken, fMatch in self._expand(sTerm):
+					dPosting = self._postings[sToken]
+					fIDF = fMatch * (K1 + 1) * log(
+						1 + (iDocs - len(dPosting) + 0.5) / \
+						(len(dPosting) + 0.5)
+					)
+					for tKey, (fFreq, iLength) in dPosting.items():
+						fScore = fIDF * fFreq / \
+							(fFreq + fBase + fNorm * iLength)
+						if fScore > dScores.get(tKey, 0):
+							dScores[tKey] = fScore
+
+				# If nothing matched, nothing can match them all
+				if not dScores:
+					return { 'total': 0, 'results': [] }
+				lScores.append(dScores)
+
+			# Keep only the documents matching every term, starting with the
+			#	smallest set
+			lScores.sort(key = len)
+			dTotals = {}
+			for tKey, fScore in lScores[0].items():
+				if types and tKey[0] not in types:
+					continue
+				for dScores in lScores[1:]:
+					if tKey not in dScores:
+						break
+					fScore += dScores[tKey]
+				else:
+					dTotals[tKey] = fScore
+
+			# Get the page of the best
+			lBest = nlargest(
+				offset + limit,
+				dTotals.items(),
+				key = lambda t: ( t[1], t[0] )
+			)[offset:]
+
+			# Return the total and the page
+			return {
+				'total': len(dTotals),
+				'results': [ {
+					'type': tKey[0],
+					'_id': tKey[1],
+					'title': self._docs[tKey][1],
+					'score': round(fScore, 4)
+				} for tKey, fScore in lBest ]
+			}
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the number of documents, tokens, and changes waiting
+
+		Returns:
+			dict
+		"""
+		with self._lock:
+			return {
+				'documents': len(self._docs),
+				'tokens': len(self._vocab),
+				'pending': len(self._pending)
+			}
+
+	def upsert(self, name: str, record: dict) -> None:
+		"""Upsert
+
+		Adds a record to the index, replacing it if it's already there
+
+		Arguments:
+			name (str): The type of the record
+			record (dict): The record
+		"""
+		oSource = self._sources[name]
+		dTerms = oSource.terms(record)
+		tKey = ( name, record['_id'] )
+		with self._lock:
+			self._remove(tKey)
+			self._add(tKey, dTerms, record.get(oSource.title))
+
+def build() -> None:
+	"""Build
+
+	Builds the index, if there is one and it's configured to be built at
+	startup. Called before any worker is forked so they all share it. Off by
+	default, as it loads every record, the index is then built by the first
+	search
+	"""
+	if _index is not None and _config()['build']:
+		_index.build()
+
+def setup(sources: list) -> Index:
+	"""Setup
+
+	Creates the index for the process, or returns the existing one
+
+	Arguments:
+		sources (Source[]): The types of records indexed
+
+	Returns:
+		Index
+	"""
+
+	global _index
+
+	with _lock:
+		if _index is None:
+			_index = Index(sources, _config()['max_expansions'])
+	return _index
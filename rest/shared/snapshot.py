@@ -0,0 +1,310 @@
+# coding=utf8
+""" Snapshot
+
+Read only snapshot of every record, published by the master process into
+shared memory so that forked workers don't each have to fetch and warm their
+own copy. The master loads the records before forking, so workers start with
+them through copy-on-write, and only read the snapshots published after
+they were forked. Each snapshot is written once into a new segment, and a
+small header segment points to the current one, so swapping is a single
+update
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+import atexit
+from multiprocessing import shared_memory
+from os import getpid
+import pickle
+import struct
+from sys import stderr
+from threading import Event, Lock, Thread
+from time import sleep
+
+# Project imports
+from shared import pool
+
+# The header, sequence, generation, and size of the data
+HEADER = struct.Struct('<QQQ')
+
+# Module variables
+_current = None
+_header = None
+_lock = Lock()
+_master = None
+_prefix = None
+
+def _open() -> bool:
+	"""Open
+
+	Opens the header if it isn't already, returns False if it doesn't exist
+
+	Returns:
+		bool
+	"""
+
+	global _header
+
+	# If we haven't opened the header yet
+	if _header is None:
+		with _lock:
+			if _header is None:
+				try:
+					_header = shared_memory.SharedMemory('%s_head' % _prefix)
+				except FileNotFoundError:
+					return False
+
+	# Opened
+	return True
+
+def _read_header() -> tuple:
+	"""Read Header
+
+	Returns the generation and size of the current snapshot, retrying if the
+	master is in the middle of changing them
+
+	Returns:
+		tuple (int, int)
+	"""
+	while True:
+		iSeq, iGeneration, iSize = HEADER.unpack_from(_header.buf)
+		if iSeq % 2 == 0 and \
+			HEADER.unpack_from(_header.buf)[0] == iSeq:
+			return iGeneration, iSize
+
+		# Give the master time to finish
+		sleep(0.0001)
+
+def generation() -> int | None:
+	"""Generation
+
+	Returns the generation of the current snapshot, or None if there isn't
+	one. Reading it takes no lock, so it can be checked on every read
+
+	Returns:
+		int | None
+	"""
+
+	# If we're not a worker, or there's no header
+	if not reading() or not _open():
+		return None
+
+	# Return the generation
+	return _read_header()[0] or None
+
+def get(name: str) -> tuple | None:
+	"""Get
+
+	Returns the generation, version, and records of the named tier in the
+	current snapshot, or None if there isn't one. The records are only
+	unpickled once per generation, and they're shared and must not be
+	modified
+
+	Arguments:
+		name (str): The name of the tier
+
+	Returns:
+		tuple (int, int | None, list) | None
+	"""
+
+	global _current
+
+	# If we're not a worker, or there's no header
+	if not reading() or not _open():
+		return None
+
+	# If there's no snapshot
+	iGeneration, iSize = _read_header()
+	if not iGeneration:
+		return None
+
+	# If the generation has changed, load the new snapshot, only the first
+	#	thread to notice has to
+	tCurrent = _current
+	if tCurrent is None or tCurrent[0] != iGeneration:
+		with _lock:
+			if _current is None or _current[0] != iGeneration:
+				try:
+					oShm = shared_memory.SharedMemory(
+						'%s_%d' % (_prefix, iGeneration)
+					)
+				except FileNotFoundError:
+					return None
+				try:
+					_current = ( iGeneration, pickle.loads(oShm.buf[:iSize]) )
+				finally:
+					oShm.close()
+			tCurrent = _current
+
+	# If we have nothing
+	if name not in tCurrent[1]:
+		return None
+
+	# Return the tier
+	return ( tCurrent[0], ) + tCurrent[1][name]
+
+def reading() -> bool:
+	"""Reading
+
+	Returns True if the process is a worker reading snapshots published by
+	its master
+
+	Returns:
+		bool
+	"""
+	return _master is not None and _master != getpid()
+
+class Publisher(object):
+	"""Publisher
+
+	Runs in the master process, loads the records of each tier, publishes
+	them, and publishes them again whenever any of them change
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, tiers: list, delay: float = 0.05):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			tiers (Tiered[]): The tiers to publish
+			delay (float): Optional, the seconds to wait after a change, so
+				that writes close together are published once
+
+		Returns:
+			Publisher
+		"""
+
+		# Store the arguments
+		self._tiers = tiers
+		self._delay = delay
+
+		# The event set on any change
+		self._event = Event()
+
+		# The segments published, oldest first
+		self._generation = 0
+		self._segments = []
+
+	def _changed(self) -> None:
+		"""Changed
+
+		Watcher called by the tiers whenever anything changes
+		"""
+		self._event.set()
+
+	def _run(self) -> None:
+		"""Run
+
+		Runs forever in a background thread, publishing after every change
+		"""
+		while True:
+			self._event.wait()
+			sleep(self._delay)
+			self._event.clear()
+			try:
+				self.publish()
+			except Exception as e:
+				print('snapshot: %s' % str(e), file = stderr)
+
+			# Give back any connection used to get the records
+			finally:
+				pool.release()
+
+	def close(self) -> None:
+		"""Close
+
+		Removes every segment, called when the master exits
+		"""
+
+		# Workers inherit the exit handler, but the segments aren't theirs
+		if _master != getpid():
+			return
+
+		# Close and remove each segment
+		for oShm in self._segments + [ _header ]:
+			try:
+				oShm.close()
+				oShm.unlink()
+			except Exception:
+				pass
+
+	def publish(self) -> None:
+		"""Publish
+
+		Writes the current records of every tier into a new segment, then
+		points the header at it
+		"""
+
+		# Get the version of each tier before its records, so the version
+		#	can never be newer than the records
+		dData = {}
+		for o in self._tiers:
+			iVersion = o.version()
+			dData[o.name] = ( iVersion, o.all() )
+		bData = pickle.dumps(dData, pickle.HIGHEST_PROTOCOL)
+
+		# Write it into a new segment
+		self._generation += 1
+		oShm = shared_memory.SharedMemory(
+			'%s_%d' % (_prefix, self._generation),
+			create = True,
+			size = max(len(bData), 1)
+		)
+		oShm.buf[:len(bData)] = bData
+		self._segments.append(oShm)
+
+		# Point the header at it, the sequence is odd while it's changing
+		iSeq = HEADER.unpack_from(_header.buf)[0]
+		HEADER.pack_into(_header.buf, 0, iSeq + 1, 0, 0)
+		HEADER.pack_into(
+			_header.buf, 0, iSeq + 2, self._generation, len(bData)
+		)
+
+		# The tiers already have the records it was made from, and so will
+		#	any worker forked from now on
+		for o in self._tiers:
+			o.published(self._generation)
+
+		# Remove any segments older than the previous one. Workers that
+		#	already opened them keep their mapping until they close it
+		while len(self._segments) > 2:
+			oOld = self._segments.pop(0)
+			oOld.close()
+			oOld.unlink()
+
+	def start(self) -> None:
+		"""Start
+
+		Publishes the first snapshot and starts watching for changes. Must be
+		called in the master before the workers are forked
+		"""
+
+		global _header, _master, _prefix
+
+		# Mark this process as the master, and name the segments after it
+		_master = getpid()
+		_prefix = 'chrisnasr_%d' % _master
+
+		# Create the header
+		_header = shared_memory.SharedMemory(
+			'%s_head' % _prefix, create = True, size = HEADER.size
+		)
+		HEADER.pack_into(_header.buf, 0, 0, 0, 0)
+		atexit.register(self.close)
+
+		# Publish the first snapshot
+		self.publish()
+
+		# Publish again whenever anything changes
+		for o in self._tiers:
+			o.watch(self._changed)
+		Thread(target = self._run, daemon = True).start()
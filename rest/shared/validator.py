@@ -0,0 +1,320 @@
+# coding=utf8
+""" Validator
+
+Compiles define Trees into validation functions specialized for each of their
+fields. Everything the generic nodes work out on every call, the type, the
+regex, the limits, the options, and the level names used in the errors, is
+worked out once, leaving only the checks themselves. The failures generated
+are exactly the same as those of Tree.valid, in the same order
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from define import constants, Node, Tree
+import undefined
+
+# Python imports
+from datetime import date, datetime, time
+
+# The node types only checked against the type's regex
+_REGEX_TYPES = [ 'base64', 'date', 'datetime', 'time', 'uuid', 'uuid4' ]
+
+# The node types that are integers
+_INT_TYPES = [ 'int', 'timestamp', 'uint' ]
+
+def _limits(node: Node) -> callable:
+	"""Limits
+
+	Returns the check of the options, or of the minimum and maximum, the last
+	step of every type of node. Returns None if there's nothing to check
+
+	Arguments:
+		node (Node): The node
+
+	Returns:
+		callable | None
+	"""
+
+	# If there's options, that's all that is checked
+	lOptions = node.options()
+	if lOptions is not None:
+		def options(value: any) -> str | None:
+			if value not in lOptions:
+				return 'not in options'
+		return options
+
+	# Else, the minimum and maximum, only if they're set
+	dMinMax = node.minmax()
+	mMin = dMinMax['minimum']
+	mMax = dMinMax['maximum']
+	if not mMin and not mMax:
+		return None
+	def minmax(value: any) -> str | None:
+		if mMin and value < mMin:
+			return 'did not meet minimum'
+		if mMax and value > mMax:
+			return 'exceeds maximum'
+	return minmax
+
+def _integer(node: Node) -> callable:
+	"""Integer
+
+	Returns the check of an int, timestamp, or uint node
+
+	Arguments:
+		node (Node): The node
+
+	Returns:
+		callable
+	"""
+	bUnsigned = node.type() != 'int'
+	fLimits = _limits(node)
+	oInt = constants.regex['int']
+	def check(value: any) -> str | None:
+
+		# Ints are by far the most common, so check for them first
+		if type(value) is not int:
+			if type(value) == bool:
+				return 'is a bool'
+			if isinstance(value, int):
+				pass
+			elif isinstance(value, str) and oInt.match(value):
+				value = int(value, 0)
+			else:
+				return 'not an integer'
+
+		# Check the sign, then the limits
+		if bUnsigned and value < 0:
+			return 'signed'
+		if fLimits:
+			return fLimits(value)
+	return check
+
+def _pattern(node: Node) -> callable:
+	"""Pattern
+
+	Returns the check of a node whose type is defined by a regex, e.g. date
+	or uuid
+
+	Arguments:
+		node (Node): The node
+
+	Returns:
+		callable
+	"""
+	sType = node.type()
+	oRegex = constants.regex[sType]
+	fLimits = _limits(node)
+	def check(value: any) -> str | None:
+
+		# Convert any python dates or times into strings
+		if type(value) is not str:
+			if sType == 'date' and isinstance(value, (date, datetime)):
+				value = value.strftime('%Y-%m-%d')
+			elif sType == 'datetime' and isinstance(value, datetime):
+				value = value.strftime('%Y-%m-%d %H:%M:%S')
+			elif sType == 'datetime' and isinstance(value, date):
+				value = '%s 00:00:00' % value.strftime('%Y-%m-%d')
+			elif sType == 'time' and isinstance(value, (time, datetime)):
+				value = value.strftime('%H:%M:%S')
+			elif not isinstance(value, str):
+				return 'not a string'
+
+		# Check the format, then the limits
+		if not oRegex.match(value):
+			return 'invalid'
+		if fLimits:
+			return fLimits(value)
+	return check
+
+def _string(node: Node) -> callable:
+	"""String
+
+	Returns the check of a string node
+
+	Arguments:
+		node (Node): The node
+
+	Returns:
+		callable
+	"""
+	oRegex = node.regex()
+	dMinMax = node.minmax()
+	iMin = dMinMax['minimum']
+	iMax = dMinMax['maximum']
+	fLimits = _limits(node)
+
+	# If there's a minimum or maximum, they're checked by length, and nothing
+	#	else is checked after
+	if iMin or iMax:
+		def check(value: any) -> str | None:
+			if not isinstance(value, str):
+				return 'is not a string'
+			if oRegex and not oRegex.match(value):
+				return 'failed regex'
+			if iMin and len(value) < iMin:
+				return 'not long enough'
+			if iMax and len(value) > iMax:
+				return 'too long'
+		return check
+
+	# Else, check the regex and any options
+	def check(value: any) -> str | None:
+		if not isinstance(value, str):
+			return 'is not a string'
+		if oRegex and not oRegex.match(value):
+			return 'failed regex'
+		if fLimits:
+			return fLimits(value)
+	return check
+
+def _check(node: any) -> any:
+	"""Check
+
+	Returns the specialized check of a node, or None if the node must be
+	validated by its own valid method, e.g. nested parents, arrays, and the
+	rarer types
+
+	Arguments:
+		node (Base): The node
+
+	Returns:
+		callable | None
+	"""
+	if type(node) is not Node:
+		return None
+	sType = node.type()
+	if sType == 'string':
+		return _string(node)
+	if sType in _INT_TYPES:
+		return _integer(node)
+	if sType in _REGEX_TYPES:
+		return _pattern(node)
+	return None
+
+def build(tree: Tree) -> callable:
+	"""Build
+
+	Compiles the tree into a function taking the same arguments as
+	Tree.valid, the value and whether to ignore missing fields, and returning
+	the list of failures, empty if the value is valid
+
+	Arguments:
+		tree (Tree): The tree to compile
+
+	Returns:
+		callable
+	"""
+
+	# If the requirements couldn't be stored, leave the tree to deal with it
+	if tree.requires() is None:
+		def generic(value: dict, ignore_missing: bool = False) -> list:
+			type(tree).valid(tree, value, ignore_missing)
+			return tree.validation_failures
+		return generic
+
+	# Get the name used at the start of every error
+	sName = tree.to_dict()['__name__']
+
+	# Flatten the fields, the name, the error name, whether it's optional,
+	#	the specialized check, and the node for those without one
+	lFields = []
+	for sKey, oNode in tree.nodes.items():
+		fCheck = _check(oNode)
+		lFields.append((
+			sKey,
+			'%s.%s' % (sName, sKey),
+			oNode.optional(),
+			fCheck,
+			fCheck is None and oNode or None
+		))
+	dKnown = dict.fromkeys(tree.nodes)
+	dRequires = tree.requires()
+
+	# The function
+	def valid(value: dict, ignore_missing: bool = False) -> list:
+
+		# If it's not a dict, let the tree handle it, using the class's
+		#	method in case the instance's has been replaced
+		if not isinstance(value, dict):
+			type(tree).valid(tree, value, ignore_missing)
+			return tree.validation_failures
+
+		# Go through each field
+		lRet = []
+		iFound = 0
+		for sKey, sLevel, bOptional, fCheck, oNode in lFields:
+
+			# If it's missing
+			m = value.get(sKey, undefined)
+			if m is undefined:
+				if not bOptional and not ignore_missing:
+					lRet.append([ sLevel, 'missing' ])
+				continue
+			iFound += 1
+
+			# If the node has no check of its own, let it validate
+			if oNode is not None:
+				if not oNode.valid(m, ignore_missing, [ sName, sKey ]):
+					lRet.extend(oNode.validation_failures)
+					continue
+
+			# Else, check it, unless it's empty and allowed to be. If it's
+			#	empty and not allowed to be, it's missing, and still has to
+			#	pass the check
+			elif m is not None or not (bOptional or ignore_missing):
+				if m is None:
+					lRet.append([ sLevel, 'missing' ])
+				s = fCheck(m)
+				if s is not None:
+					lRet.append([ sLevel, s ])
+					continue
+
+			# If the field requires others
+			if sKey in dRequires:
+				for f in dRequires[sKey]:
+					if f not in value or value[f] in ('0000-00-00', '', None):
+						lRet.append([
+							sLevel,
+							'requires \'%s\' to also be set' % str(f)
+						])
+
+		# If there's fields that aren't in the tree
+		if iFound != len(value):
+			for k in value:
+				if k not in dKnown:
+					lRet.append([ '%s.%s' % (sName, k), 'unknown' ])
+
+		# Return the failures
+		return lRet
+
+	# Return the function
+	return valid
+
+def install(storage: Tree) -> None:
+	"""Install
+
+	Replaces the valid method of a Storage, or any other Tree, with the
+	compiled version, so that adding records, and validating Record
+	instances, use it
+
+	Arguments:
+		storage (Tree): The instance to replace the method of
+	"""
+
+	# Compile the tree
+	fValid = build(storage)
+
+	# Create the replacement, which stores the failures where the tree
+	#	would have
+	def valid(value: dict, ignore_missing: bool = False) -> bool:
+		storage._validation_failures = fValid(value, ignore_missing)
+		return not storage._validation_failures
+
+	# Replace it
+	storage.valid = valid
@@ -0,0 +1,306 @@
+# coding=utf8
+""" View
+
+Sorted view of every record in a Storage, maintained incrementally as
+records are added, changed, and removed
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from bisect import bisect_left
+from functools import total_ordering
+from threading import Lock
+
+@total_ordering
+class _Desc(object):
+	"""Descending
+
+	Wraps a sort key so that it compares in the opposite order
+
+	Extends:
+		object
+	"""
+
+	__slots__ = ( 'value', )
+
+	def __init__(self, value: any):
+		self.value = value
+
+	def __eq__(self, other: '_Desc') -> bool:
+		return self.value == other.value
+
+	def __lt__(self, other: '_Desc') -> bool:
+		return other.value < self.value
+
+def key_function(field: str, reverse: bool = False) -> callable:
+	"""Key Function
+
+	Returns a function that generates sort keys for records using any field,
+	including ones that can be null. Nulls are sorted after every other
+	value, and the ID is included so that the order is stable
+
+	Arguments:
+		field (str): The field to sort by
+		reverse (bool): Optional, set to sort in descending order
+
+	Returns:
+		callable
+	"""
+	def key(record: dict) -> any:
+		m = record.get(field)
+		t = (m is None, m, record['_id'])
+		return reverse and _Desc(t) or t
+	return key
+
+class Sorted(object):
+	"""Sorted
+
+	Holds a list of records in order of a single field. The list is never
+	modified once it's been returned, each change creates a new snapshot of
+	the records, keys, and IDs which replaces the old one in a single
+	assignment, so readers can use it without copying or locking
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, field: str, reverse: bool = False):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			field (str): The field to sort the records by
+			reverse (bool): Optional, set to sort in descending order
+
+		Returns:
+			Sorted
+		"""
+
+		# Store the arguments
+		self._field = field
+		self._reverse = reverse
+
+		# The snapshot of the records, their sort keys, and the records by ID
+		self._state = None
+
+		# The lock used by writers
+		self._lock = Lock()
+
+	def key(self, record: dict) -> any:
+		"""Key
+
+		Returns the sort key of the record, the ID is included so that every
+		key is unique and the order is stable
+
+		Arguments:
+			record (dict): The record to generate the key for
+
+		Returns:
+			any
+		"""
+		t = (record[self._field], record['_id'])
+		return self._reverse and _Desc(t) or t
+
+	@property
+	def field(self) -> str:
+		"""Field
+
+		Returns the field the records are sorted by
+
+		Returns:
+			str
+		"""
+		return self._field
+
+	@property
+	def keys(self) -> list:
+		"""Keys
+
+		Returns the sort keys of the current list of records, in the same
+		order. The list must be treated as read only
+
+		Returns:
+			list
+		"""
+		tState = self._state
+		return tState[1] if tState else None
+
+	@property
+	def loaded(self) -> bool:
+		"""Loaded
+
+		Returns True if the view contains the records
+
+		Returns:
+			bool
+		"""
+		return self._state is not None
+
+	@property
+	def reverse(self) -> bool:
+		"""Reverse
+
+		Returns True if the records are in descending order
+
+		Returns:
+			bool
+		"""
+		return self._reverse
+
+	@property
+	def snapshot(self) -> tuple | None:
+		"""Snapshot
+
+		Returns the records and their keys together, so that they are
+		guaranteed to match. Both lists must be treated as read only
+
+		Returns:
+			tuple (list, list) | None
+		"""
+		tState = self._state
+		return tState and tState[:2] or None
+
+	@property
+	def records(self) -> list:
+		"""Records
+
+		Returns the current, ordered, list of records. The list must be
+		treated as read only
+
+		Returns:
+			list
+		"""
+		tState = self._state
+		return tState[0] if tState else None
+
+	def clear(self) -> None:
+		"""Clear
+
+		Empties the view so that it will be loaded again
+		"""
+		with self._lock:
+			self._state = None
+
+	def get(self, _id: str) -> dict | None:
+		"""Get
+
+		Returns a single record by ID
+
+		Arguments:
+			_id (str): The ID of the record
+
+		Returns:
+			dict | None
+		"""
+		tState = self._state
+		return tState and tState[2].get(_id) or None
+
+	def load(self, records: list) -> list:
+		"""Load
+
+		Sorts and stores the full list of records, and returns them in order
+
+		Arguments:
+			records (dict[]): Every record in the Storage
+
+		Returns:
+			list
+		"""
+
+		# Sort the records along with their keys
+		lPairs = sorted(
+			[ (self.key(d), d) for d in records ],
+			key = lambda t: t[0]
+		)
+
+		# Store them
+		lRecords = [ t[1] for t in lPairs ]
+		with self._lock:
+			self._state = (
+				lRecords,
+				[ t[0] for t in lPairs ],
+				{ d['_id']: d for d in lRecords }
+			)
+
+		# Return the sorted records
+		return lRecords
+
+	def remove(self, _id: str) -> bool:
+		"""Remove
+
+		Removes a record from the view, returns True if it was found
+
+		Arguments:
+			_id (str): The ID of the record
+
+		Returns:
+			bool
+		"""
+		with self._lock:
+			return self._remove(_id)
+
+	def _remove(self, _id: str) -> bool:
+		"""Remove (internal)
+
+		Removes a record from the view, the lock must already be held
+
+		Arguments:
+			_id (str): The ID of the record
+
+		Returns:
+			bool
+		"""
+
+		# If we aren't loaded, or don't have the record
+		if self._state is None or _id not in self._state[2]:
+			return False
+
+		# Find the position of the record
+		lRecords, lKeys, dIDs = self._state
+		i = bisect_left(lKeys, self.key(dIDs[_id]))
+
+		# Replace the snapshot with one without it
+		self._state = (
+			lRecords[:i] + lRecords[i+1:],
+			lKeys[:i] + lKeys[i+1:],
+			{ k:v for k,v in dIDs.items() if k != _id }
+		)
+
+		# Return OK
+		return True
+
+	def upsert(self, record: dict) -> None:
+		"""Upsert
+
+		Adds the record to the view, or replaces the existing one
+
+		Arguments:
+			record (dict): The new or updated record
+		"""
+
+		with self._lock:
+
+			# If we aren't loaded, there's nothing to update
+			if self._state is None:
+				return
+
+			# Remove any existing version of the record
+			self._remove(record['_id'])
+
+			# Find where the record goes
+			lRecords, lKeys, dIDs = self._state
+			mKey = self.key(record)
+			i = bisect_left(lKeys, mKey)
+
+			# Replace the snapshot with one with it
+			self._state = (
+				lRecords[:i] + [ record ] + lRecords[i:],
+				lKeys[:i] + [ mKey ] + lKeys[i:],
+				{ **dIDs, record['_id']: record }
+			)
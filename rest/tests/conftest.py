@@ -0,0 +1,101 @@
+# coding=utf8
+""" Conftest
+
+Fixtures shared by the tests. Nothing here needs a MySQL or Redis server,
+redis is replaced by the in-process stand-in used by the benchmarks
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+import undefined
+
+# Pip imports
+import pytest
+
+# Project imports
+from bench import standins
+from shared import channel
+
+class FakeStorage(object):
+	"""Fake Storage
+
+	Holds records in a dict and answers the reads the tiers make, counting
+	each one. A function can be set to be called in the middle of the next
+	read, after the record is copied but before it's returned, as if a write
+	happened while it was being fetched
+
+	Extends:
+		object
+	"""
+
+	def __init__(self, records: list):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			records (dict[]): The records
+
+		Returns:
+			FakeStorage
+		"""
+		self.records = { d['_id']: d for d in records }
+		self.reads = 0
+		self.during = None
+
+	def get(self,
+		_id: str = None,
+		index: str = undefined,
+		raw: bool = False
+	) -> dict | list | None:
+		"""Get
+
+		Returns a copy of one record, by ID or by the field of the index, or
+		of every record if no ID is passed
+		"""
+		self.reads += 1
+
+		# Copy what was asked for
+		if _id is None:
+			mRet = [ dict(d) for d in self.records.values() ]
+		elif index is undefined:
+			mRet = _id in self.records and dict(self.records[_id]) or None
+		else:
+			sField = index.replace('ui_', '')
+			mRet = None
+			for d in self.records.values():
+				if d.get(sField) == _id:
+					mRet = dict(d)
+
+		# If something has to happen while the read is in flight
+		if self.during:
+			f, self.during = self.during, None
+			f()
+
+		# Return the copy
+		return mRet
+
+	def keys(self) -> list:
+		"""Keys
+
+		Returns the names of the fields
+		"""
+		return list(next(iter(self.records.values()), {}))
+
+@pytest.fixture
+def redis(monkeypatch) -> standins.Redis:
+	"""Redis
+
+	Replaces the records redis with the in-process stand-in. Subscribing is
+	skipped, the listener would flush the tiers at any time while a test is
+	running
+	"""
+	oRedis = standins.Redis()
+	monkeypatch.setattr(channel, '_redis', oRedis)
+	monkeypatch.setattr(channel, 'subscribe', lambda callback: None)
+	return oRedis
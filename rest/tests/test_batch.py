@@ -0,0 +1,302 @@
+# coding=utf8
+""" Batch Tests
+
+Checks that the bulk writes are all or nothing, anything that stops one
+record from being written rolls back every other one
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from record.exceptions import RecordDuplicate
+
+# Python imports
+from types import SimpleNamespace
+
+# Pip imports
+import pymysql
+import pytest
+
+# Project imports
+from shared import batch
+
+class _Cursor(object):
+	"""Cursor
+
+	Runs each statement against the connection
+	"""
+
+	def __init__(self, connection: '_Connection'):
+		self._connection = connection
+		self.closed = False
+
+	def close(self) -> None:
+		self.closed = True
+
+	def execute(self, sql: str) -> int:
+		return self._connection.execute(sql)
+
+	def fetchall(self) -> list:
+		return self._connection.rows
+
+class _Connection(object):
+	"""Connection
+
+	Keeps the statements of the transaction, and what ended it. Statements
+	return the number of rows set for them, 1 by default, or raise the
+	exception set for the start of them
+	"""
+
+	def __init__(self):
+		self.affected = {}
+		self.fail = {}
+		self.rows = []
+		self.statements = []
+		self.ended = None
+
+	def begin(self) -> None:
+		self.statements = []
+		self.ended = None
+
+	def commit(self) -> None:
+		self.ended = 'commit'
+
+	def cursor(self, *args) -> _Cursor:
+		return _Cursor(self)
+
+	def escape_string(self, value: str) -> str:
+		return value.replace('\'', '\\\'')
+
+	def execute(self, sql: str) -> int:
+		self.statements.append(sql)
+		for sStart, oError in self.fail.items():
+			if sql.startswith(sStart):
+				raise oError
+		return self.affected.get(sql, 1)
+
+	def rollback(self) -> None:
+		self.ended = 'rollback'
+
+class _Table(object):
+	"""Table
+
+	Generates the statements the way record_mysql's table would, just
+	simpler, so they can be matched
+	"""
+
+	def __init__(self):
+		self._struct = SimpleNamespace(
+			db = 'db', name = 'table', key = '_id', host = 'test',
+			revisions = False
+		)
+		self._columns = { '_id': None, '_updated': None, 'name': None }
+
+	def _delete(self, where: dict) -> str:
+		return 'DELETE %s' % ','.join(where['_id'])
+
+	def _select(self, fields: list, where: dict) -> str:
+		return 'SELECT %s' % ','.join(where['_id'])
+
+	def _update(self, values: dict, where: dict) -> str:
+		return 'UPDATE %s SET %s' % (where['_id'], ', '.join([
+			'%s = %s' % (k, v) for k, v in values.items()
+		]))
+
+class _Cache(object):
+	"""Cache
+
+	Keeps the records stored in it
+	"""
+
+	def __init__(self):
+		self.records = {}
+
+	def add_missing(self, ids: list) -> None:
+		for s in ids:
+			self.records[s] = None
+
+	def set(self, _id: str, record: dict) -> None:
+		self.records[_id] = record
+
+@pytest.fixture
+def connection(monkeypatch) -> _Connection:
+	"""Connection
+
+	Replaces the connection record_mysql would use with a fake one
+	"""
+	oConnection = _Connection()
+	monkeypatch.setattr(batch.server, '_connection', lambda host: oConnection)
+	return oConnection
+
+@pytest.fixture
+def storage(monkeypatch) -> SimpleNamespace:
+	"""Storage
+
+	A Storage with only the parts the batch writes use, and a cache. Values
+	are escaped by simply quoting them
+	"""
+	monkeypatch.setattr(batch, 'escape', lambda column, value, host: \
+		'\'%s\'' % value
+	)
+	return SimpleNamespace(
+		_parent = SimpleNamespace(_table = _Table()),
+		_cache = _Cache()
+	)
+
+def _rows(*ids: str, updated: int = 1) -> list:
+	"""Rows
+
+	Returns the rows the lock of the records returns
+
+	Arguments:
+		*ids (str): The IDs of the records
+		updated (int): Optional, the _updated of each
+
+	Returns:
+		dict[]
+	"""
+	return [ {
+		'_id': s, '_updated': updated, '_now': '2026-10-17 00:00:00'
+	} for s in ids ]
+
+def _updates(*ids: str) -> list:
+	"""Updates
+
+	Returns an update of the name of each ID
+
+	Arguments:
+		*ids (str): The IDs of the records
+
+	Returns:
+		list
+	"""
+	return [ (
+		{ '_id': s, '_updated': 1, 'name': 'old' },
+		{ '_id': s, '_updated': 1, 'name': 'old' },
+		{ 'name': 'new' }
+	) for s in ids ]
+
+def test_add(connection, storage):
+	"""Add
+
+	Every record is added in one statement, any field not set gets its
+	default, and the transaction is committed
+	"""
+	batch.add(storage, [
+		{ '_id': 'a', 'name': 'one' }, { '_id': 'b', '_updated': 1 }
+	], {})
+	assert connection.statements == [
+		'INSERT INTO `db`.`table` (`_id`, `_updated`, `name`) VALUES ' \
+			'(\'a\', DEFAULT, \'one\'), (\'b\', \'1\', DEFAULT)'
+	]
+	assert connection.ended == 'commit'
+
+def test_add_duplicate(connection, storage):
+	"""Add Duplicate
+
+	If any record hits a unique index, none of them are added
+	"""
+	connection.fail['INSERT'] = pymysql.err.IntegrityError(
+		1062, 'Duplicate entry \'one\' for key \'ui_name\''
+	)
+	with pytest.raises(RecordDuplicate) as oInfo:
+		batch.add(storage, [ { '_id': 'a', 'name': 'one' } ], {})
+	assert oInfo.value.args == ( 'one', 'ui_name' )
+	assert connection.ended == 'rollback'
+
+def test_save(connection, storage):
+	"""Save
+
+	The records are locked, checked, and updated in one transaction, which
+	is committed, and the cache is given the new records without fetching
+	them again
+	"""
+	connection.rows = _rows('a', 'b')
+	assert batch.save(storage, _updates('a', 'b'), {}) == []
+	assert connection.statements == [
+		'SELECT `_id`, `_updated`, CURRENT_TIMESTAMP() AS `_now` ' \
+			'FROM `db`.`table` WHERE `_id` IN (\'a\', \'b\') FOR UPDATE',
+		'UPDATE a SET name = new, _updated = \'2026-10-17 00:00:00\'',
+		'UPDATE b SET name = new, _updated = \'2026-10-17 00:00:00\''
+	]
+	assert connection.ended == 'commit'
+	assert storage._cache.records['a'] == {
+		'_id': 'a', '_updated': 1792195200, 'name': 'new'
+	}
+
+def test_save_unchanged(connection, storage):
+	"""Save Unchanged
+
+	An update that changes no rows, because the values are the same once
+	stored, is not a conflict
+	"""
+	connection.rows = _rows('a')
+	connection.affected[
+		'UPDATE a SET name = new, _updated = \'2026-10-17 00:00:00\''
+	] = 0
+	assert batch.save(storage, _updates('a'), {}) == []
+	assert connection.ended == 'commit'
+
+def test_save_conflict(connection, storage):
+	"""Save Conflict
+
+	If any record was changed by someone else, or removed, everything is
+	rolled back, and those records are returned
+	"""
+	connection.rows = _rows('a') + _rows('b', updated = 2)
+	assert batch.save(storage, _updates('a', 'b', 'c'), {}) == [ 'b', 'c' ]
+	assert len(connection.statements) == 1
+	assert connection.ended == 'rollback'
+	assert storage._cache.records == {}
+
+def test_save_duplicate(connection, storage):
+	"""Save Duplicate
+
+	If any update hits a unique index, everything is rolled back, and the
+	same exception record_mysql raises is raised
+	"""
+	connection.rows = _rows('a', 'b', 'c')
+	connection.fail['UPDATE c'] = pymysql.err.IntegrityError(
+		1062, 'Duplicate entry \'new\' for key \'ui_name\''
+	)
+	with pytest.raises(RecordDuplicate) as oInfo:
+		batch.save(storage, _updates('a', 'b', 'c'), {})
+	assert oInfo.value.args == ( 'new', 'ui_name' )
+	assert connection.ended == 'rollback'
+
+def test_save_error(connection, storage):
+	"""Save Error
+
+	Any other failure rolls everything back and is raised as is
+	"""
+	connection.rows = _rows('a', 'b', 'c')
+	connection.fail['UPDATE b'] = pymysql.err.OperationalError(2013, 'Lost')
+	with pytest.raises(pymysql.err.OperationalError):
+		batch.save(storage, _updates('a', 'b', 'c'), {})
+	assert len(connection.statements) == 3
+	assert connection.ended == 'rollback'
+
+def test_remove(connection, storage):
+	"""Remove
+
+	The records are locked, then deleted, and the transaction is committed
+	"""
+	connection.rows = [ { '_id': 'a' }, { '_id': 'b' } ]
+	assert batch.remove(storage, [ 'a', 'b' ], {}) == []
+	assert connection.statements == [ 'SELECT a,b FOR UPDATE', 'DELETE a,b' ]
+	assert connection.ended == 'commit'
+
+def test_remove_missing(connection, storage):
+	"""Remove Missing
+
+	If any record doesn't exist, nothing is deleted, and the missing IDs
+	are returned
+	"""
+	connection.rows = [ { '_id': 'a' } ]
+	assert batch.remove(storage, [ 'a', 'b' ], {}) == [ 'b' ]
+	assert connection.statements == [ 'SELECT a,b FOR UPDATE' ]
+	assert connection.ended == 'rollback'
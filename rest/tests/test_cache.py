@@ -0,0 +1,142 @@
+# coding=utf8
+""" Cache Tests
+
+Checks that a record fetched while it was being changed is never kept by the
+tier, so the next read fetches the new version
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Project imports
+from shared import cache
+from shared.cache import Tiered
+from tests.conftest import FakeStorage
+
+def _tier(name: str, records: list) -> tuple:
+	"""Tier
+
+	Returns a new tier, and the fake Storage behind it
+
+	Arguments:
+		name (str): The name of the tier, unique to the test
+		records (dict[]): The records in the Storage
+
+	Returns:
+		tuple (Tiered, FakeStorage)
+	"""
+	oStorage = FakeStorage(records)
+	return Tiered(name, oStorage, '_id'), oStorage
+
+def test_cached(redis):
+	"""Cached
+
+	A record read with no change in between is only fetched once
+	"""
+	oTier, oStorage = _tier('test_cached', [ { '_id': 'a', 'v': 1 } ])
+	assert oTier.get('a') == { '_id': 'a', 'v': 1 }
+	assert oTier.get('a') == { '_id': 'a', 'v': 1 }
+	assert oStorage.reads == 1
+
+def test_invalidate_during_load(redis):
+	"""Invalidate During Load
+
+	A record invalidated while it's being fetched is returned to the reader
+	that fetched it, but not kept, so the next read gets the new version
+	"""
+	oTier, oStorage = _tier('test_invalidate', [ { '_id': 'a', 'v': 1 } ])
+
+	# Change the record in the middle of the first read
+	def change():
+		oStorage.records['a'] = { '_id': 'a', 'v': 2 }
+		oTier.invalidate([ 'a' ])
+	oStorage.during = change
+
+	assert oTier.get('a') == { '_id': 'a', 'v': 1 }
+	assert oTier.get('a') == { '_id': 'a', 'v': 2 }
+	assert oStorage.reads == 2
+
+def test_invalidate_during_missing(redis):
+	"""Invalidate During Missing
+
+	A record created while it's being found missing is not remembered as
+	missing
+	"""
+	oTier, oStorage = _tier('test_missing', [ { '_id': 'a', 'v': 1 } ])
+
+	# Create the record in the middle of the first read
+	def create():
+		oStorage.records['b'] = { '_id': 'b', 'v': 1 }
+		oTier.invalidate([ 'b' ])
+	oStorage.during = create
+
+	assert oTier.get('b') is None
+	assert oTier.get('b') == { '_id': 'b', 'v': 1 }
+
+def test_missing_cached(redis):
+	"""Missing Cached
+
+	A record found missing with no change in between is only fetched once
+	"""
+	oTier, oStorage = _tier('test_missing_cached', [ { '_id': 'a', 'v': 1 } ])
+	assert oTier.get('b') is None
+	assert oTier.get('b') is None
+	assert oStorage.reads == 1
+
+def test_flush_during_load(redis):
+	"""Flush During Load
+
+	A record fetched while the whole tier is flushed is not kept
+	"""
+	oTier, oStorage = _tier('test_flush', [ { '_id': 'a', 'v': 1 } ])
+
+	# Change the record, and lose track of what changed
+	def change():
+		oStorage.records['a'] = { '_id': 'a', 'v': 2 }
+		oTier.flush()
+	oStorage.during = change
+
+	assert oTier.get('a') == { '_id': 'a', 'v': 1 }
+	assert oTier.get('a') == { '_id': 'a', 'v': 2 }
+
+def test_invalidate_updates_view(redis):
+	"""Invalidate Updates View
+
+	Once the list of every record is loaded, an invalidated record is
+	fetched again and replaces the old one in the list
+	"""
+	oTier, oStorage = _tier('test_view', [
+		{ '_id': 'a', 'v': 1 }, { '_id': 'b', 'v': 1 }
+	])
+	assert [ d['v'] for d in oTier.all() ] == [ 1, 1 ]
+	oStorage.records['b'] = { '_id': 'b', 'v': 2 }
+	del oStorage.records['a']
+	oTier.invalidate([ 'a', 'b' ])
+	assert oTier.all() == [ { '_id': 'b', 'v': 2 } ]
+
+def test_on_storage(monkeypatch):
+	"""On Storage
+
+	Storages are only given to the callbacks once they're created, and
+	creating the callback creates none of them
+	"""
+	monkeypatch.setattr(cache, '_storages', [])
+
+	# One tier already has its Storage, the other creates it when needed
+	oStorage = FakeStorage([])
+	Tiered('test_on_storage_made', oStorage, '_id')
+	oLazy = Tiered('test_on_storage_lazy', lambda: FakeStorage([]), '_id')
+
+	# Only the existing one is given right away
+	lGiven = []
+	cache.on_storage(lambda name, storage: lGiven.append(( name, storage )))
+	assert ( 'test_on_storage_made', oStorage ) in lGiven
+	assert oLazy._storage is None
+	assert 'test_on_storage_lazy' not in [ t[0] for t in lGiven ]
+
+	# The other is given once it's created, before it's used
+	oCreated = oLazy.storage
+	assert lGiven[-1] == ( 'test_on_storage_lazy', oCreated )
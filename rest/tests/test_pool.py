@@ -0,0 +1,81 @@
+# coding=utf8
+""" Pool Tests
+
+Checks that the pooled connections are set up exactly as record_mysql sets up
+its own, so records read the same whichever one they came through
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from record_mysql import server
+
+# Pip imports
+import pymysql
+from pymysql.constants import FIELD_TYPE
+
+# Project imports
+from shared import pool
+
+class _Cursor(object):
+	"""Cursor
+
+	Accepts and ignores any statement
+	"""
+	def __enter__(self):
+		return self
+	def __exit__(self, *args):
+		return False
+	def execute(self, *args):
+		return 0
+
+class _Connection(object):
+	"""Connection
+
+	Stands in for a pymysql connection, starting with pymysql's own decoders
+	"""
+
+	def __init__(self, **kwargs):
+		self.decoders = pymysql.converters.decoders.copy()
+		self.autocommitting = None
+
+	def autocommit(self, value: bool) -> None:
+		self.autocommitting = value
+
+	def cursor(self, *args) -> _Cursor:
+		return _Cursor()
+
+	def query(self, *args) -> int:
+		return 0
+
+def test_converters(monkeypatch):
+	"""Converters
+
+	The pool and record_mysql convert every field type the same way, and
+	neither autocommits
+	"""
+
+	# Connect without a server
+	monkeypatch.setattr(pymysql, 'connect', _Connection)
+
+	# Get record_mysql's own connection
+	server.add_host({ 'host': 'localhost' }, 'test_converters')
+	oServer = server._connection('test_converters')
+
+	# Get one from the pool
+	oPool = pool.Pool({ 'host': 'localhost' })._connect()[0]
+
+	# They must be identical
+	assert oPool.decoders == oServer.decoders
+	assert oPool.autocommitting is False
+	assert oServer.autocommitting is False
+
+	# And the types that matter must actually have been changed
+	assert oPool.decoders[FIELD_TYPE.TIMESTAMP] is \
+		server._converter_timestamp
+	for i in [ FIELD_TYPE.DATE, FIELD_TYPE.TIME, FIELD_TYPE.DATETIME ]:
+		assert oPool.decoders[i] is str
@@ -0,0 +1,87 @@
+# coding=utf8
+""" Publish Tests
+
+Checks that files are kept for the retain time after they leave the
+manifest, however old they are, and removed after it
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+import json
+import os
+from time import time
+
+# Project imports
+from shared.publish import MANIFEST, Publisher
+
+def _age(path: str, seconds: int) -> None:
+	"""Age
+
+	Sets the modified time of a file to the given number of seconds ago
+
+	Arguments:
+		path (str): The path of the file
+		seconds (int): The age
+	"""
+	fTime = time() - seconds
+	os.utime(path, ( fTime, fTime ))
+
+def test_retained(tmp_path):
+	"""Retained
+
+	A file created long ago is still kept for the retain time once it's
+	replaced, and removed once it's been unused for longer
+	"""
+
+	# Publish a first version, and make its file old
+	dData = { 'x': 1 }
+	oPublisher = Publisher(tmp_path, { 'a': lambda: dData['x'] }, retain = 60)
+	sFirst = oPublisher.publish()['files']['a']
+	_age(tmp_path / sFirst, 3600)
+
+	# Replace it, it has only just stopped being used, so it stays
+	dData['x'] = 2
+	sSecond = oPublisher.publish()['files']['a']
+	assert sSecond != sFirst
+	assert (tmp_path / sFirst).exists()
+
+	# Once it's been unused for longer than the retain time, it goes
+	_age(tmp_path / sFirst, 3600)
+	dData['x'] = 3
+	sThird = oPublisher.publish()['files']['a']
+	assert not (tmp_path / sFirst).exists()
+	assert (tmp_path / sSecond).exists()
+	assert (tmp_path / sThird).exists()
+
+def test_current_kept(tmp_path):
+	"""Current Kept
+
+	Files in the manifest are never removed, however old they are
+	"""
+
+	# Publish, and make everything old
+	oPublisher = Publisher(
+		tmp_path,
+		{ 'a': lambda: 1 },
+		{ 'static': lambda: { 'about': 'A', 'home': 'H' } },
+		retain = 60
+	)
+	dFiles = oPublisher.publish()['files']
+	for sName in dFiles.values():
+		_age(tmp_path / sName, 3600)
+
+	# Publish something else, everything in the manifest is still there
+	oPublisher._requests['b'] = lambda: 2
+	dFiles = oPublisher.publish()['files']
+	assert set(dFiles) == { 'a', 'b', 'static/about', 'static/home' }
+	for sName in dFiles.values():
+		assert (tmp_path / sName).exists()
+
+	# And the manifest points at them
+	with open(tmp_path / MANIFEST) as oF:
+		assert json.load(oF)['files'] == dFiles
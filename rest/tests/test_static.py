@@ -0,0 +1,237 @@
+# coding=utf8
+""" Static Tests
+
+Checks that static content is only ever served sanitized, whether it was
+compiled by the pool, compiled on read, or served as a page
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Python imports
+from concurrent.futures import Future
+import gzip
+
+# Pip imports
+import pytest
+
+# Project imports
+from nodes import static as node
+from records import static
+from shared import cache, channel, compiler, html
+from tests.conftest import FakeStorage
+
+# Content with everything that must be removed
+UNSAFE = '<p onclick="steal()">Hi <b>there</b></p>' \
+	'<script>alert(1)</script>' \
+	'<a href="javascript:alert(1)">link</a>' \
+	'<img src="data:text/html,x" onerror="steal()">' \
+	'<style>p { display: none }</style>' \
+	'<iframe src="https://example.com"></iframe>' \
+	'<form action="https://example.com"><input name="x"></form>'
+
+# The parts that must not survive
+_DANGEROUS = [
+	'onclick', 'onerror', 'script', 'alert', 'javascript:', 'data:',
+	'style', 'iframe', 'form', 'steal'
+]
+
+def _safe(content: str) -> None:
+	"""Safe
+
+	Fails if any dangerous part is in the content
+
+	Arguments:
+		content (str): The HTML
+	"""
+	for s in _DANGEROUS:
+		assert s not in content, s
+
+@pytest.fixture
+def page(redis, monkeypatch) -> FakeStorage:
+	"""Page
+
+	Puts a single unsafe static page, keyed 'about', behind the static tier,
+	and clears the tier after the test
+	"""
+	oStorage = FakeStorage([ {
+		'_id': 'a0000000-0000-4000-8000-000000000000',
+		'_created': 1,
+		'_updated': 1,
+		'key': 'about',
+		'content': UNSAFE
+	} ])
+	monkeypatch.setattr(static.Cache, '_storage', oStorage)
+	yield oStorage
+	static.Cache.flush()
+
+def test_compile():
+	"""Compile
+
+	Compiling removes the unsafe parts and keeps the rest, and the
+	compressed versions are of the sanitized content
+	"""
+	dCompiled = html.compile(UNSAFE)
+	sHTML = dCompiled['html'].decode('utf-8')
+	_safe(sHTML)
+	assert '<p>Hi <b>there</b></p>' in sHTML
+	assert '<a>link</a>' in sHTML
+	assert gzip.decompress(dCompiled['gzip']) == dCompiled['html']
+	assert dCompiled['source'] == html.digest(UNSAFE)
+
+def test_extend(redis):
+	"""Extend
+
+	A record with no compiled version is compiled on read, and the source is
+	never returned
+	"""
+	dRecord = { '_id': 'x', 'content': UNSAFE }
+	dExtended = compiler.extend(dRecord)
+	_safe(dExtended['content'])
+	assert dExtended['content'] == \
+		html.compile(UNSAFE)['html'].decode('utf-8')
+
+	# It was stored for every other process
+	assert compiler.artifact('x')['source'] == html.digest(UNSAFE)
+
+def test_extend_stale(redis):
+	"""Extend Stale
+
+	A compiled version of older content is never used for newer content
+	"""
+	compiler._store('y', html.compile('<p>old</p>'))
+	dExtended = compiler.extend({ '_id': 'y', 'content': UNSAFE })
+	_safe(dExtended['content'])
+	assert 'old' not in dExtended['content']
+	assert 'Hi' in dExtended['content']
+
+def test_extend_marked(redis):
+	"""Extend Marked
+
+	While another process is compiling the current content, the previous
+	compiled version is used rather than compiling it again
+	"""
+	compiler._store('m', html.compile('<p>old</p>'))
+	redis.set('%s:pending' % compiler._key('m'), html.digest(UNSAFE))
+	dExtended = compiler.extend({ '_id': 'm', 'content': UNSAFE })
+	assert dExtended['content'] == '<p>old</p>'
+
+	# Once the mark is gone, say because it failed, it's compiled here
+	compiler.remove('m', True)
+	dExtended = compiler.extend({ '_id': 'm', 'content': UNSAFE })
+	_safe(dExtended['content'])
+	assert 'Hi' in dExtended['content']
+
+def test_extend_pending(redis, monkeypatch):
+	"""Extend Pending
+
+	If this process is compiling the current content, the result is waited
+	for rather than compiling it again
+	"""
+	monkeypatch.setattr(html, 'compile', None)
+	oFuture = Future()
+	oFuture.set_result({ 'html': b'<p>pending</p>', 'source': '' })
+	monkeypatch.setitem(
+		compiler._pending, ( 'p', html.digest(UNSAFE) ), oFuture
+	)
+	dExtended = compiler.extend({ '_id': 'p', 'content': UNSAFE })
+	assert dExtended['content'] == '<p>pending</p>'
+
+def test_submit(redis, monkeypatch):
+	"""Submit
+
+	The same content is only compiled once at a time, but new content is
+	always compiled, and every process is told what's being compiled
+	"""
+
+	# Keep the compilations instead of starting them
+	lSubmitted = []
+	class Executor(object):
+		def submit(self, function, content):
+			lSubmitted.append(content)
+			return Future()
+	monkeypatch.setattr(compiler, '_executor', Executor)
+	monkeypatch.setattr(compiler, '_pending', {})
+
+	# Submit the same content twice, then new content
+	compiler.submit('s', '<p>one</p>')
+	compiler.submit('s', '<p>one</p>')
+	assert lSubmitted == [ '<p>one</p>' ]
+	compiler.submit('s', '<p>two</p>')
+	assert lSubmitted == [ '<p>one</p>', '<p>two</p>' ]
+	assert compiler._marked('s') == html.digest('<p>two</p>')
+
+def test_stored(page):
+	"""Stored
+
+	A finished compilation replaces the page every process has, without
+	changing the version of the records
+	"""
+
+	# Serve it once, so it's stored locally
+	sID = 'a0000000-0000-4000-8000-000000000000'
+	node.page('about', '')
+	iVersion = channel.counter('static')
+
+	# Finish a compilation of it
+	oFuture = Future()
+	oFuture.set_result({
+		**html.compile('<p>compiled</p>'), 'source': html.digest(UNSAFE)
+	})
+	compiler._stored(( sID, html.digest(UNSAFE) ), oFuture)
+
+	# The page is the new compiled version, and the version is the same
+	assert node.page('about', '') == ( None, b'<p>compiled</p>' )
+	assert channel.counter('static') == iVersion
+
+def test_page(page):
+	"""Page
+
+	The page is served sanitized, in the encoding asked for
+	"""
+
+	# As is
+	tPage = node.page('about', '')
+	assert tPage[0] is None
+	_safe(tPage[1].decode('utf-8'))
+
+	# Compressed, the compressed version is of the sanitized content
+	tPage = node.page('about', 'gzip, deflate')
+	assert tPage[0] == 'gzip'
+	_safe(gzip.decompress(tPage[1]).decode('utf-8'))
+
+	# Missing pages are not found
+	assert node.page('missing', '') is None
+
+def test_page_changed(page):
+	"""Page Changed
+
+	Once the content changes, the page is the new content, sanitized, never
+	the older compiled version
+	"""
+
+	# Serve it once, so the compiled version is stored
+	node.page('about', 'gzip')
+
+	# Change it
+	dRecord = page.records['a0000000-0000-4000-8000-000000000000']
+	dRecord['content'] = '<p>New</p><script>alert(2)</script>'
+	static.Cache.invalidate([ dRecord['_id'] ])
+
+	# The page is the new content, in every encoding
+	for sEncoding in [ '', 'gzip' ]:
+		tPage = node.page('about', sEncoding)
+		bHTML = tPage[0] and gzip.decompress(tPage[1]) or tPage[1]
+		assert bHTML == b'<p>New</p>'
+
+def test_page_refused(page):
+	"""Page Refused
+
+	An encoding the client refuses is never sent, however the header
+	mentions it
+	"""
+	assert node.page('about', 'gzip;q=0')[0] is None
+	assert node.page('about', 'deflate, gzip;q=0.5')[0] == 'gzip'
@@ -0,0 +1,132 @@
+# coding=utf8
+""" Validator Tests
+
+Checks that the compiled validators fail exactly the same records, with
+exactly the same failures, in the same order, as Tree.valid
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__maintainer__	= "Chris Nasr"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-16"
+
+# Ouroboros imports
+from define import Tree
+import jsonb
+
+# Python imports
+from pathlib import Path
+from random import Random
+
+# Pip imports
+import pytest
+
+# Project imports
+from bench.validation import records
+from shared import validator
+
+# Constants
+DEFINITIONS = '%s/definitions' % Path(__file__).parent.parent.resolve()
+NAMES = [ 'experience', 'skill', 'skill_category', 'static' ]
+
+# Values that break a field in every way the nodes check for
+_BROKEN = [
+	None, True, False, -1, 0, 1.5, '', 'x', 'x' * 3000, '2026-13-45',
+	'00000000-0000-0000-0000-000000000000', [], {}, b'bytes'
+]
+
+def _values(name: str) -> list:
+	"""Values
+
+	Returns valid records of the definition, and each one broken a
+	different way, along with values that aren't records at all
+
+	Arguments:
+		name (str): The name of the definition
+
+	Returns:
+		list
+	"""
+
+	# Start with the generated records
+	oRand = Random(name)
+	lRet = records(oRand, name, 50)
+
+	# Break every field of the first one, one at a time, then remove it
+	dRecord = lRet[0]
+	for sField in list(dRecord):
+		for m in _BROKEN:
+			lRet.append({ **dRecord, sField: m })
+		lRet.append({ k: v for k, v in dRecord.items() if k != sField })
+
+	# Add unknown fields, and nothing at all
+	lRet.append({ **dRecord, 'unknown': 1, 'other': None })
+	lRet.append({})
+
+	# Add values that aren't records
+	lRet.extend([ None, [], 'record', 1 ])
+
+	# Return the values
+	return lRet
+
+def _outcome(function: callable) -> any:
+	"""Outcome
+
+	Returns what the function returns, or the type and message of the
+	exception it raises, as both validators must raise the same ones
+
+	Arguments:
+		function (callable): Called with no arguments
+
+	Returns:
+		any
+	"""
+	try:
+		return function()
+	except Exception as e:
+		return ( type(e), str(e) )
+
+@pytest.mark.parametrize('name', NAMES)
+@pytest.mark.parametrize('ignore_missing', [ False, True ])
+def test_parity(name: str, ignore_missing: bool):
+	"""Parity
+
+	Every value gets the same failures from the compiled validator as it
+	does from the tree
+	"""
+
+	# Load the tree and compile it
+	oTree = Tree(jsonb.load('%s/%s.json' % (DEFINITIONS, name)))
+	fCompiled = validator.build(oTree)
+
+	# Compare them on every value
+	for m in _values(name):
+		mValid = _outcome(lambda: Tree.valid(oTree, m, ignore_missing))
+		mFailures = _outcome(lambda: fCompiled(m, ignore_missing))
+		if isinstance(mValid, tuple):
+			assert mFailures == mValid, m
+		else:
+			assert mFailures == oTree.validation_failures, m
+			assert (not mFailures) == mValid, m
+
+@pytest.mark.parametrize('name', NAMES)
+def test_install(name: str):
+	"""Install
+
+	An installed validator stores its failures where the tree would have
+	"""
+
+	# Load two trees, and install the compiled validator in one
+	dDefinition = jsonb.load('%s/%s.json' % (DEFINITIONS, name))
+	oTree = Tree(dDefinition)
+	oInstalled = Tree(dDefinition)
+	validator.install(oInstalled)
+
+	# Compare them on every value
+	for m in _values(name):
+		mValid = _outcome(lambda: oTree.valid(m))
+		assert _outcome(lambda: oInstalled.valid(m)) == mValid, m
+		if not isinstance(mValid, tuple):
+			assert oInstalled.validation_failures == \
+				oTree.validation_failures, m
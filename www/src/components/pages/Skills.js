@@ -10,7 +10,7 @@
 
 // Ouroboros modules
 import body from '@ouroboros/body';
-import { empty, omap, sortByKey } from '@ouroboros/tools';
+import { empty } from '@ouroboros/tools';
 
 // NPM modules
 import React, { useEffect, useState } from 'react';
@@ -43,22 +43,8 @@ export default function Skills(props) {
 
 	// Load / skills effect
 	useEffect(() => {
-		body.read('primary', '__list', [ 'skills', 'skill/categories' ]).then(
-			data => {
-				data[1][1].data.sort(sortByKey('_order'))
-				const oResults = data[1][1].data.reduce((o, l) =>
-					Object.assign(o, {
-						[l._id]: { 'name': l.name, 'skills': [] }
-					}), {});
-				data[0][1].data.forEach(o => {
-					oResults[o.category].skills.push(o);
-				});
-				for(const _id in oResults) {
-					oResults[_id].skills.sort(sortByKey('_order'));
-				}
-
-				resultsSet(oResults);
-			},
+		body.read('primary', 'skills/grouped').then(
+			resultsSet,
 			Message.error
 		);
 	}, []);
@@ -73,16 +59,16 @@ export default function Skills(props) {
 				<Typography>Loading...</Typography>
 			) || (empty(results) &&
 				<Typography>No Skills found.</Typography>
-			) || omap(results, v =>
-				<Box className="category">
+			) || results.map(v =>
+				<Box key={v._id} className="category">
 					<Box className="header">{v.name}</Box>
 					<Grid container spacing={1}>
 						{v.skills.map(o =>
-							<>
+							<React.Fragment key={o._id}>
 								<Grid item className="name" xs={4}>{o.name}</Grid>
 								<Grid item className="level" xs={4}><Level value={o.level} /></Grid>
 								<Grid item className="years" xs={4}>{o.years === 1 ? '1 year' : `${o.years} years`}</Grid>
-							</>
+							</React.Fragment>
 						)}
 					</Grid>
 				</Box>